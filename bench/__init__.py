@@ -0,0 +1 @@
+# FlatScraper benchmarks and local stand-in servers
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Browser startup benchmark: for each launch profile measures cold launch (process start to a
+ready context + tab), first navigation, and steady-state memory of the whole browser process
+tree after a few page loads against the local fake WG-Gesucht.
+Usage: python bench/browser_launch.py [--profiles default minimal shell] [--runs 3] [--pages 5] [--latency-ms 30]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.sync_api import sync_playwright
+from rich.console import Console
+from rich.table import Table
+
+from bench.fake_wggesucht import REAL_HOST, FakeSiteConfig, FakeWgGesucht, route_to_fake
+from launch import LAUNCH_PROFILES, context_options, launch_browser
+from sessions import LOCALE
+
+console = Console()
+
+
+def _children() -> dict[int, list[int]]:
+    tree: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f"/proc/{entry}/stat").read_text()
+        except OSError:
+            continue
+        # Field 4 (ppid) follows the parenthesised command name, which may contain spaces
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        tree.setdefault(ppid, []).append(int(entry))
+    return tree
+
+
+def _memory_kb(pid: int) -> tuple[int, int]:
+    """(RSS, PSS) of one process in kB; PSS splits shared pages between the processes using them."""
+    rss = pss = 0
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1])
+            elif line.startswith("Pss:"):
+                pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def tree_memory_mb(exclude: set[int]) -> tuple[float, float] | None:
+    """Summed RSS and PSS (MB) of all processes below this one except `exclude`; None off Linux."""
+    if not Path("/proc/self/smaps_rollup").exists():
+        return None
+    tree = _children()
+    stack, rss, pss = list(tree.get(os.getpid(), [])), 0, 0
+    while stack:
+        pid = stack.pop()
+        stack.extend(tree.get(pid, []))
+        if pid in exclude:
+            continue
+        r, p = _memory_kb(pid)
+        rss, pss = rss + r, pss + p
+    return rss / 1024, pss / 1024
+
+
+def _descendants() -> set[int]:
+    tree = _children()
+    stack, found = list(tree.get(os.getpid(), [])), set()
+    while stack:
+        pid = stack.pop()
+        found.add(pid)
+        stack.extend(tree.get(pid, []))
+    return found
+
+
+def measure(p, profile, site: FakeWgGesucht, pages: int, driver: set[int]) -> dict:
+    t0 = time.perf_counter()
+    browser = launch_browser(p, profile)
+    context = browser.new_context(**context_options(profile), locale=LOCALE)
+    route_to_fake(context, site.base_url)
+    page = context.new_page()
+    launched = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    page.goto(f"{REAL_HOST}/wg-zimmer-in-Muenchen.90.0.1.0.html", wait_until="domcontentloaded")
+    first_nav = time.perf_counter() - t0
+
+    for i in range(pages):
+        page.goto(f"{REAL_HOST}/wg-zimmer-in-Muenchen.90.0.1.{i + 1}.html", wait_until="domcontentloaded")
+        page.goto(f"{REAL_HOST}/wg-zimmer-in-Muenchen.{10000000 + i}.html", wait_until="domcontentloaded")
+    time.sleep(1.0)
+    memory = tree_memory_mb(exclude=driver)
+    browser.close()
+    return {"launch": launched, "first_nav": first_nav, "memory": memory}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark browser launch profiles")
+    parser.add_argument("--profiles", nargs="+", choices=list(LAUNCH_PROFILES), default=["default", "minimal", "shell"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=5, help="search + detail page pairs before sampling memory")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    table = Table(title=f"Browser-Start ({args.runs} Läufe je Profil, Median)")
+    for col in ("Profil", "Kaltstart (s)", "1. Navigation (s)", "RSS (MB)", "PSS (MB)"):
+        table.add_column(col, justify="right" if col != "Profil" else "left")
+
+    config = FakeSiteConfig(latency_ms=args.latency_ms, latency_jitter_ms=0, failure_rate=0.0)
+    with FakeWgGesucht(config) as site, sync_playwright() as p:
+        driver = _descendants()  # Playwright's node driver, not part of the browser's footprint
+        for name in args.profiles:
+            profile = LAUNCH_PROFILES[name]
+            try:
+                runs = [measure(p, profile, site, args.pages, driver) for _ in range(args.runs)]
+            except Exception as e:
+                table.add_row(name, f"[red]{str(e).splitlines()[0][:60]}[/red]", "", "", "")
+                continue
+            memory = [r["memory"] for r in runs if r["memory"]]
+            table.add_row(
+                name,
+                f"{statistics.median(r['launch'] for r in runs):.2f}",
+                f"{statistics.median(r['first_nav'] for r in runs):.2f}",
+                f"{statistics.median(m[0] for m in memory):.0f}" if memory else "–",
+                f"{statistics.median(m[1] for m in memory):.0f}" if memory else "–",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI/Groq-compatible chat completions stand-in for benchmarking the LLM layer.
+Serves POST .../chat/completions (Groq: /openai/v1/..., OpenAI: /v1/...) with configurable
+latency distributions, a tokens-per-minute budget, 429 responses with Groq-style retry hints
+("Please try again in 1.23s" + retry-after header) and SSE streaming.
+
+Usage: python bench/fake_groq.py [--port 8766] [--latency-ms 400] [--dist lognormal] [--tpm 6000]
+Point the client at it with GROQ_BASE_URL=http://127.0.0.1:8766
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_REPLY = (
+    "Hallo {name},\n\n"
+    "eure Anzeige hat mich direkt angesprochen – besonders der Balkon klingt toll. "
+    "Ich bin 28, arbeite als Software Engineer und ziehe gerade nach München. "
+    "Alle Unterlagen findet ihr in meinem Google Drive Ordner. "
+    "Ich würde mich sehr über eine Besichtigung freuen!"
+)
+
+
+@dataclass
+class FakeLLMConfig:
+    """Latency model and rate limits of the stand-in."""
+
+    latency_ms: float = 400.0
+    distribution: str = "lognormal"  # fixed | normal | lognormal
+    sigma: float = 0.4
+    tokens_per_s: float = 0.0  # extra generation time per completion token (0 = off)
+    tpm: int = 0  # tokens per minute budget (0 = unlimited)
+    rpm: int = 0  # requests per minute budget (0 = unlimited)
+    error_rate: float = 0.0  # random 500s
+    seed: int = 7
+
+
+@dataclass
+class FakeLLMStats:
+    requests: int = 0
+    completions: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    tokens: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeGroq:
+    """Threaded chat-completions server. Use as a context manager or call start()/stop()."""
+
+    def __init__(self, config: FakeLLMConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeLLMConfig()
+        self.stats = FakeLLMStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._window: deque[tuple[float, int]] = deque()  # (timestamp, tokens) in the last 60s
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGroq":
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGroq":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _latency(self, completion_tokens: int) -> float:
+        cfg = self.config
+        with self._lock:
+            if cfg.distribution == "fixed":
+                ms = cfg.latency_ms
+            elif cfg.distribution == "normal":
+                ms = self._rng.gauss(cfg.latency_ms, cfg.latency_ms * cfg.sigma)
+            else:
+                ms = self._rng.lognormvariate(math.log(max(cfg.latency_ms, 1.0)), cfg.sigma)
+        seconds = max(ms, 0.0) / 1000
+        if cfg.tokens_per_s:
+            seconds += completion_tokens / cfg.tokens_per_s
+        return seconds
+
+    def _admit(self, tokens: int) -> float | None:
+        """Reserve tokens in the 60s window. Returns None if admitted, else seconds to wait."""
+        cfg = self.config
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0][0] >= 60:
+                self._window.popleft()
+            over_rpm = cfg.rpm and len(self._window) >= cfg.rpm
+            used = sum(t for _, t in self._window)
+            over_tpm = cfg.tpm and used + tokens > cfg.tpm
+            if not over_rpm and not over_tpm:
+                self._window.append((now, tokens))
+                return None
+            # Wait until enough of the window has expired
+            freed = 0
+            for i, (ts, t) in enumerate(self._window):
+                freed += t
+                tpm_ok = not cfg.tpm or used - freed + tokens <= cfg.tpm
+                rpm_ok = not cfg.rpm or len(self._window) - (i + 1) < cfg.rpm
+                if tpm_ok and rpm_ok:
+                    return max(0.01, 60 - (now - ts))
+            return 60.0
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    return self._json(404, {"error": {"message": "not found"}})
+                started = time.monotonic()
+                with site._lock:
+                    site.stats.requests += 1
+
+                prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+                reply = _REPLY.format(name=site._rng.choice(["Lisa", "Marco", "liebe WG"]))
+                prompt_tokens = _estimate_tokens(prompt)
+                completion_tokens = _estimate_tokens(reply)
+                wait = site._admit(prompt_tokens + completion_tokens)
+                if wait is not None:
+                    with site._lock:
+                        site.stats.rate_limited += 1
+                    return self._json(
+                        429,
+                        {"error": {
+                            "message": f"Rate limit reached for model `{body.get('model')}` on tokens per minute (TPM). "
+                                       f"Please try again in {wait:.3f}s.",
+                            "type": "tokens",
+                            "code": "rate_limit_exceeded",
+                        }},
+                        headers={"retry-after": str(math.ceil(wait))},
+                    )
+                if site.config.error_rate and site._rng.random() < site.config.error_rate:
+                    with site._lock:
+                        site.stats.errors += 1
+                    return self._json(500, {"error": {"message": "internal error"}})
+
+                time.sleep(site._latency(completion_tokens))
+                with site._lock:
+                    site.stats.completions += 1
+                    site.stats.tokens += prompt_tokens + completion_tokens
+                    site.stats.latencies.append(time.monotonic() - started)
+
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+                created = int(time.time())
+                model = body.get("model", "fake")
+                if body.get("stream"):
+                    return self._stream(completion_id, created, model, reply)
+                self._json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                })
+
+            def _stream(self, completion_id: str, created: int, model: str, reply: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                words = reply.split(" ")
+                for i, word in enumerate(words):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"content": word + (" " if i < len(words) - 1 else "")},
+                            "finish_reason": None,
+                        }],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Groq/OpenAI-compatible stand-in")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--dist", choices=["fixed", "normal", "lognormal"], default="lognormal")
+    parser.add_argument("--sigma", type=float, default=0.4)
+    parser.add_argument("--tokens-per-s", type=float, default=0.0)
+    parser.add_argument("--tpm", type=int, default=0)
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    config = FakeLLMConfig(
+        latency_ms=args.latency_ms,
+        distribution=args.dist,
+        sigma=args.sigma,
+        tokens_per_s=args.tokens_per_s,
+        tpm=args.tpm,
+        rpm=args.rpm,
+        error_rate=args.error_rate,
+    )
+    server = FakeGroq(config, port=args.port).start()
+    print(f"Fake Groq running at {server.base_url} (GROQ_BASE_URL={server.base_url})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Local synthetic WG-Gesucht stand-in for load and scale testing.
+Generates search pages (organic + partner cards, ages, providers, contacted ribbons),
+detail pages (WG-Details / Adresse blocks), the login modal and the nachricht-senden form
+(CSRF-checked), with configurable latency and failure injection.
+
+Usage: python bench/fake_wggesucht.py [--port 8765] [--cards 40] [--latency-ms 50] [--failure-rate 0.02]
+Browsers are pointed at it with route_to_fake(context, site.base_url), so the platform code
+keeps using https://www.wg-gesucht.de/ URLs unchanged.
+"""
+
+import argparse
+import html
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+REAL_HOST = "https://www.wg-gesucht.de"
+
+INBOX_PAGE_SIZE = 20
+_DETAIL_RE = re.compile(r"\.(\d{5,})\.html$")
+_DISTRICTS = ["Maxvorstadt", "Schwabing", "Haidhausen", "Sendling", "Giesing", "Neuhausen", "Bogenhausen"]
+_NAMES = ["Lisa", "Jonas", "Marco", "Anna", "Felix", "Sarah", "Tom", "Mia"]
+_FEATURES = ["Balkon", "Altbau", "Dielenboden", "Spülmaschine", "Garten", "Fahrradkeller", "Badewanne"]
+
+# jQuery/modal shim so the platform's $('#…').modal(...) calls behave like on the real site
+_SHIM = """
+<script>
+window.$ = function (sel) {
+  const el = document.querySelector(sel);
+  return { modal: function (a) { if (el) el.style.display = (a === 'hide') ? 'none' : 'block'; } };
+};
+function fireLoginOrRegisterModalRequest(kind) { $('#login_modal').modal('show'); }
+</script>
+"""
+
+# Like a real CMP: shown until the consent cookie exists, accepting sets it
+_COOKIE_BANNER = """
+<div id="cmpbox" class="cmp_banner" style="position:fixed;bottom:0;left:0;right:0;background:#eee;padding:10px">
+  Wir verwenden Cookies. <button onclick="document.cookie='__cmpconsent=1; path=/; max-age=31536000'; document.getElementById('cmpbox').remove()">Alle akzeptieren</button>
+</div>
+<script>if (document.cookie.includes('__cmpconsent=')) document.getElementById('cmpbox').remove();</script>
+"""
+
+
+@dataclass
+class FakeSiteConfig:
+    """Shape of the generated site and injected faults."""
+
+    cards: int = 20
+    partner_cards: int = 5
+    max_age_minutes: int = 120
+    contacted_ratio: float = 0.1
+    wohnung_ratio: float = 0.3
+    providers: list[str] = field(default_factory=lambda: ["Roomwise", "HousingAnywhere"])
+    provider_ratio: float = 0.1
+    churn: int = 0
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 42
+
+
+@dataclass
+class FakeSiteStats:
+    requests: int = 0
+    failures: int = 0
+    search_pages: int = 0
+    detail_pages: int = 0
+    logins: int = 0
+    messages: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _page(title: str, body: str, logged_in: bool) -> str:
+    account = (
+        '<a href="/logout">Abmelden</a>' if logged_in
+        else '<a href="#" onclick="fireLoginOrRegisterModalRequest(\'sign_in\'); return false;">Mein Konto</a>'
+    )
+    return (
+        f"<!DOCTYPE html><html lang='de'><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+        f"{_SHIM}</head><body><nav><a href='/impressum.html'>Impressum</a> {account}</nav>"
+        f"{body}<footer><p>WG-Gesucht+</p></footer></body></html>"
+    )
+
+
+class FakeWgGesucht:
+    """Threaded HTTP stand-in. Use as a context manager or call start()/stop()."""
+
+    def __init__(self, config: FakeSiteConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeSiteConfig()
+        self.stats = FakeSiteStats()
+        self.logged_in = False
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._search_requests: dict[str, int] = {}
+        self.csrf_token = f"{self._rng.getrandbits(160):040x}"
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeWgGesucht":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeWgGesucht":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- Content generation ---
+
+    def ad(self, ad_id: int) -> dict:
+        """Deterministic ad for ad_id (same id -> same ad on search and detail page)."""
+        cfg = self.config
+        rng = random.Random(ad_id * 7919 + cfg.seed)
+        is_wg = rng.random() >= cfg.wohnung_ratio
+        district = rng.choice(_DISTRICTS)
+        size = rng.randint(10, 30) if is_wg else rng.randint(25, 80)
+        price = rng.randint(20, 38) * size
+        provider = rng.choice(cfg.providers) if cfg.providers and rng.random() < cfg.provider_ratio else ""
+        publisher = provider or rng.choice(_NAMES)
+        slug = f"wg-zimmer-in-Muenchen-{district}" if is_wg else f"wohnungen-in-Muenchen-{district}"
+        features = rng.sample(_FEATURES, 2)
+        return {
+            "ad_id": ad_id,
+            "is_wg": is_wg,
+            "title": f"{'Zimmer' if is_wg else 'Wohnung'} in {district} mit {features[0]}",
+            "path": f"/{slug}.{ad_id}.html",
+            "price": price,
+            "size": size,
+            "age_minutes": rng.randint(0, cfg.max_age_minutes),
+            "contacted": rng.random() < cfg.contacted_ratio,
+            "provider": provider,
+            "publisher": publisher,
+            "district": district,
+            "features": features,
+        }
+
+    @staticmethod
+    def _age_text(minutes: int) -> str:
+        if minutes < 60:
+            return f"{minutes} Minuten"
+        hours = minutes // 60
+        return "1 Stunde" if hours == 1 else f"{hours} Stunden"
+
+    def _card(self, ad: dict) -> str:
+        ribbon = '<div class="ribbon-contacted">kontaktiert</div>' if ad["contacted"] else ""
+        return (
+            f'<div class="wgg_card offer_list_item" data-id="{ad["ad_id"]}" style="height:120px">{ribbon}'
+            f'<h3><a href="{ad["path"]}">{html.escape(ad["title"])}</a></h3>'
+            f'<div class="middle"><b>{ad["price"]} €</b> | <b>{ad["size"]} m²</b></div>'
+            f'<div><span>{html.escape(ad["publisher"])}</span> <span>Online: {self._age_text(ad["age_minutes"])}</span></div>'
+            f"</div>"
+        )
+
+    def search_page(self, path: str) -> str:
+        cfg = self.config
+        with self._lock:
+            n = self._search_requests.get(path, 0)
+            self._search_requests[path] = n + 1
+            self.stats.search_pages += 1
+        base = 1_000_000 + (zlib.crc32(path.encode()) % 1000) * 100_000
+        start = base + n * cfg.churn
+        # Newest first, like a search sorted by Aktualität
+        ads = sorted((self.ad(start + i) for i in range(cfg.cards)), key=lambda a: a["age_minutes"])
+        partners = [self.ad(base + 90_000 + i) for i in range(cfg.partner_cards)]
+        body = "<h1>WG-Zimmer in München</h1><div id='main_column'>"
+        body += "".join(self._card(ad) for ad in ads)
+        if partners:
+            body += "<h2>Weitere Angebote von verifizierten Anbietern</h2>"
+            body += "".join(self._card(ad) for ad in partners)
+        body += "</div>" + _COOKIE_BANNER
+        return _page("Suche", body, self.logged_in)
+
+    def detail_page(self, ad_id: int) -> str:
+        with self._lock:
+            self.stats.detail_pages += 1
+        ad = self.ad(ad_id)
+        wg_details = (
+            '<h2 class="section_panel_title">WG-Details</h2><p>3er WG, 2 Frauen und 1 Mann</p>'
+            if ad["is_wg"] else '<h2 class="section_panel_title">Objektangaben</h2><p>Altbau</p>'
+        )
+        body = (
+            f"<h1>{html.escape(ad['title'])}</h1>"
+            f"<div><p>Zimmergröße: {ad['size']} m²</p><p>Gesamtmiete: {ad['price']} €</p>"
+            f"<p>frei ab: 01.{(ad_id % 12) + 1:02d}.2026</p></div>"
+            f"<h3>Adresse</h3><p>{ad['district']}str. {ad_id % 90 + 1}, 80{ad_id % 900 + 100} München</p>"
+            f"{wg_details}"
+            f"<div class='user_profile_info'><div class='vertical-align-center-column ml20'>"
+            f"<p class='mb0'>{html.escape(ad['publisher'])}</p></div></div>"
+            f"<div id='ad_description_text'><p>Das Zimmer ist hell und ruhig, mit {ad['features'][0]} "
+            f"und {ad['features'][1]}. Wir sind {ad['publisher']} und suchen jemanden Nettes.</p></div>"
+        )
+        with self._lock:
+            contacted = any(sent_id == str(ad_id) for sent_id, _ in self.stats.messages)
+        if contacted:
+            body += "<a href='/nachrichten.html' class='btn'>Unterhaltung ansehen</a>"
+        return _page(ad["title"], body, self.logged_in)
+
+    def contact_from_phone(self, ad_id: int) -> None:
+        """Message an ad outside the scraper (app, other device): shows up in the inbox only."""
+        with self._lock:
+            self.stats.messages.append((str(ad_id), ""))
+
+    def inbox_page(self, number: int) -> str:
+        """Conversation list, newest first, INBOX_PAGE_SIZE per page (?page=N)."""
+        with self._lock:
+            messages = list(reversed(self.stats.messages))
+        start = (number - 1) * INBOX_PAGE_SIZE
+        body = "<h1>Nachrichten</h1><div id='conversation_list'>"
+        for offset, (ad_id, _) in enumerate(messages[start:start + INBOX_PAGE_SIZE]):
+            ad = self.ad(int(ad_id))
+            conversation_id = 5_000_000 + len(messages) - start - offset
+            body += (
+                f'<div class="conversation_list_item" data-conversation-id="{conversation_id}">'
+                f'<a href="/nachricht.html?nachrichten-id={conversation_id}">'
+                f'<span class="conversation_partner_name">{html.escape(ad["publisher"])}</span>'
+                f'<span>{html.escape(ad["title"])}</span></a>'
+                f'<a class="conversation_ad_link" href="{ad["path"]}">Anzeige</a></div>'
+            )
+        body += "</div>"
+        return _page("Nachrichten", body, self.logged_in)
+
+    def message_page(self, sent: bool) -> str:
+        if sent:
+            return _page("Nachricht", "<p class='alert-success'>Nachricht erfolgreich gesendet.</p>", self.logged_in)
+        body = (
+            "<form method='post'>"
+            f"<input type='hidden' name='csrf_token' value='{self.csrf_token}'>"
+            "<textarea name='message' id='message_input' rows='10' cols='60'></textarea>"
+            "<button type='submit' class='conversation_send_button'>Senden</button></form>"
+            "<div id='sec_advice' style='position:fixed;top:0;left:0;right:0;bottom:0;background:rgba(0,0,0,.5)'>"
+            "<div class='modal-footer'><button onclick=\"$('#sec_advice').modal('hide')\">Verstanden</button></div></div>"
+        )
+        return _page("Nachricht senden", body, self.logged_in)
+
+    def home_page(self) -> str:
+        body = (
+            "<h1>WG-Gesucht</h1>" + _COOKIE_BANNER +
+            "<div id='login_modal' style='display:none'><form method='post' action='/ajax/sessions.php'>"
+            "<input id='login_email_username' name='login_email_username'>"
+            "<input type='password' id='login_password' name='login_password'>"
+            "<input type='checkbox' id='auto_login' name='auto_login'>"
+            "<button id='login_submit' type='submit'>Login</button></form></div>"
+        )
+        return _page("WG-Gesucht", body, self.logged_in)
+
+    # --- HTTP handling ---
+
+    def _inject_faults(self) -> bool:
+        """Sleep for the configured latency; True if this request should fail."""
+        cfg = self.config
+        with self._lock:
+            self.stats.requests += 1
+            delay = max(0.0, self._rng.gauss(cfg.latency_ms, cfg.latency_jitter_ms)) / 1000
+            fail = self._rng.random() < cfg.failure_rate
+            if fail:
+                self.stats.failures += 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: str) -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                if site._inject_faults():
+                    return self._send(503, "<h1>503 Service Unavailable</h1>")
+                path = self.path.split("?", 1)[0]
+                if path == "/":
+                    return self._send(200, site.home_page())
+                if path == "/logout":
+                    site.logged_in = False
+                    return self._send(200, site.home_page())
+                if path.startswith("/nachricht-senden/"):
+                    return self._send(200, site.message_page(sent=False))
+                if path == "/nachrichten.html":
+                    if not site.logged_in:
+                        return self._send(200, site.home_page())
+                    page = parse_qs(urlsplit(self.path).query).get("page", ["1"])[0]
+                    return self._send(200, site.inbox_page(int(page) if page.isdigit() else 1))
+                m = _DETAIL_RE.search(path)
+                if m:
+                    return self._send(200, site.detail_page(int(m.group(1))))
+                if path.endswith(".html") and "-in-" in path:
+                    return self._send(200, site.search_page(path))
+                return self._send(404, "<h1>404</h1>")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                if site._inject_faults():
+                    return self._send(503, "<h1>503 Service Unavailable</h1>")
+                path = self.path.split("?", 1)[0]
+                if path == "/ajax/sessions.php":
+                    with site._lock:
+                        site.stats.logins += 1
+                    site.logged_in = bool(form.get("login_email_username"))
+                    return self._send(200, site.home_page())
+                if path.startswith("/nachricht-senden/"):
+                    if form.get("csrf_token", [""])[0] != site.csrf_token or not site.logged_in:
+                        return self._send(403, "<h1>403 Forbidden</h1>")
+                    m = _DETAIL_RE.search(path)
+                    with site._lock:
+                        site.stats.messages.append((m.group(1) if m else "", form.get("message", [""])[0]))
+                    return self._send(200, site.message_page(sent=True))
+                return self._send(404, "<h1>404</h1>")
+
+        return Handler
+
+
+def route_to_fake(context, base_url: str) -> None:
+    """Serve every www.wg-gesucht.de request of a Playwright context from the fake site."""
+
+    def handler(route) -> None:
+        url = route.request.url
+        local = base_url + url.split("wg-gesucht.de", 1)[1]
+        try:
+            response = route.fetch(url=local, max_redirects=0)
+        except Exception:
+            route.abort()
+            return
+        route.fulfill(response=response)
+
+    context.route(re.compile(r"^https://www\.wg-gesucht\.de/"), handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local WG-Gesucht stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--partner-cards", type=int, default=5)
+    parser.add_argument("--max-age", type=int, default=120, help="max. card age in minutes")
+    parser.add_argument("--churn", type=int, default=0, help="new ads per repeated search request")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    config = FakeSiteConfig(
+        cards=args.cards,
+        partner_cards=args.partner_cards,
+        max_age_minutes=args.max_age,
+        churn=args.churn,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+    )
+    site = FakeWgGesucht(config, port=args.port).start()
+    print(f"Fake WG-Gesucht running at {site.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
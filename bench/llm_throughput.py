@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+LLM layer benchmark: runs generate_anschreiben against local fake Groq endpoints and
+reports messages/minute, tail latency and retries for each retry strategy. With
+--extra-provider-ms further fake providers (each with its own TPM budget) are routed over.
+Usage: python bench/llm_throughput.py [--messages 30] [--concurrency 1] [--tpm 6000] [--latency-ms 400]
+       [--extra-provider-ms 1500] [--strategy hint exponential hint-jitter]
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from bench.fake_groq import FakeGroq, FakeLLMConfig
+
+console = Console()
+
+STRATEGIES = {
+    # Current behaviour in groq_client: honour the hint, 5s otherwise
+    "hint": lambda hint, attempt: hint or 5.0,
+    "exponential": lambda hint, attempt: min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0),
+    "hint-jitter": lambda hint, attempt: (hint or 0.5 * 2 ** attempt) * random.uniform(1.0, 1.25),
+}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_strategy(name: str, args: argparse.Namespace) -> list[str]:
+    configs = [
+        FakeLLMConfig(latency_ms=latency, distribution=args.dist, tpm=args.tpm, rpm=args.rpm, error_rate=args.error_rate)
+        for latency in [args.latency_ms, *args.extra_provider_ms]
+    ]
+    servers = [FakeGroq(config) for config in configs]
+    with ExitStack() as stack:
+        for server in servers:
+            stack.enter_context(server)
+        import groq_client
+        from llm import Router
+        from models import LLMProvider, ListingData
+
+        router = Router.from_config([
+            LLMProvider(name=f"fake-{i}", base_url=server.base_url + "/openai/v1", model="bench", api_key="bench")
+            for i, server in enumerate(servers)
+        ])
+        data = ListingData(
+            title="Helles Zimmer mit Balkon", address="Musterstr. 1", publisher_name="Lisa",
+            full_description="Das Zimmer ist hell und ruhig. " * 20,
+        )
+        retries = 0
+        latencies: list[float] = []
+        failures = 0
+
+        def on_retry(wait: float, attempt: int) -> None:
+            nonlocal retries
+            retries += 1
+
+        def one(_: int) -> None:
+            nonlocal failures
+            t0 = time.perf_counter()
+            try:
+                groq_client.generate_anschreiben(data, on_retry=on_retry, backoff=STRATEGIES[name], router=router)
+                latencies.append(time.perf_counter() - t0)
+            except Exception:
+                failures += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(one, range(args.messages)))
+        elapsed = time.perf_counter() - started
+        rate_limited = sum(server.stats.rate_limited for server in servers)
+        share = "/".join(str(row["successes"]) for row in router.health())
+
+    return [
+        name,
+        f"{len(latencies) / (elapsed / 60):.1f}",
+        f"{_percentile(latencies, 50):.2f}",
+        f"{_percentile(latencies, 90):.2f}",
+        f"{_percentile(latencies, 99):.2f}",
+        str(retries),
+        str(rate_limited),
+        str(failures),
+        share,
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM layer against a fake Groq endpoint")
+    parser.add_argument("--messages", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--dist", choices=["fixed", "normal", "lognormal"], default="lognormal")
+    parser.add_argument("--tpm", type=int, default=6000)
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--extra-provider-ms", type=float, nargs="*", default=[],
+        help="start further fake providers with these mean latencies (router picks the fastest available)",
+    )
+    parser.add_argument("--strategy", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    args = parser.parse_args()
+
+    table = Table(title=f"LLM-Durchsatz ({args.messages} Nachrichten, TPM {args.tpm or '∞'})")
+    for col in ("Strategie", "Nachr./Min.", "p50 (s)", "p90 (s)", "p99 (s)", "Retries", "429", "Fehler", "Anteil je Anbieter"):
+        table.add_column(col, justify="right" if col != "Strategie" else "left")
+    for name in args.strategy:
+        table.add_row(*run_strategy(name, args))
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
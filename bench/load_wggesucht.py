@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: drives WgGesuchtPlatform (login, search, details, send) against the local
+fake WG-Gesucht and reports listings/minute plus per-stage wall time.
+Usage: python bench/load_wggesucht.py [--searches 5] [--cards 40] [--latency-ms 50] [--failure-rate 0.02] [--no-send]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.sync_api import sync_playwright
+from rich.console import Console
+from rich.table import Table
+
+from bench.fake_wggesucht import REAL_HOST, FakeSiteConfig, FakeWgGesucht, route_to_fake
+from platforms.wggesucht.platform import WgGesuchtPlatform
+from sessions import LOCALE, VIEWPORT
+from timing import StageTimer
+
+console = Console()
+
+
+def run_load(args: argparse.Namespace) -> None:
+    config = FakeSiteConfig(
+        cards=args.cards,
+        partner_cards=args.partner_cards,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        contacted_ratio=0.0,
+    )
+    search_urls = [f"{REAL_HOST}/wg-zimmer-in-Muenchen.90.0.1.{i}.html" for i in range(args.searches)]
+    platform = WgGesuchtPlatform()
+    timer = StageTimer()
+    processed = failed = 0
+
+    with FakeWgGesucht(config) as site, sync_playwright() as p:
+        browser = p.chromium.launch(headless=not args.visible)
+        context = browser.new_context(viewport=VIEWPORT, locale=LOCALE)
+        route_to_fake(context, site.base_url)
+        platform.prepare_context(context)
+        page = context.new_page()
+
+        with timer.stage("login"):
+            platform.login(page, email="bench@example.com", password="bench")
+        with timer.stage("search"):
+            listings = platform.run_search(page, include_all=True, search_urls=search_urls)
+        console.print(f"{len(listings)} Anzeigen gefunden auf {args.searches} Suchseiten")
+
+        for listing in listings[: args.limit or None]:
+            try:
+                with timer.stage("extract"):
+                    details = platform.extract_details(page, listing.url)
+                if not details:
+                    failed += 1
+                    continue
+                if not args.no_send:
+                    with timer.stage("send"):
+                        if platform.send_message(page, listing.url, f"Hallo {details.publisher_name},\n\nBenchmark.") is not True:
+                            failed += 1
+                            continue
+                processed += 1
+            except Exception:
+                failed += 1
+        browser.close()
+        stats = site.stats
+
+    elapsed_min = timer.elapsed / 60
+    table = Table(title=f"Last-Test: {processed / elapsed_min:.1f} Anzeigen/Min. ({timer.elapsed:.1f}s)")
+    for col in ("Phase", "Anzahl", "Summe (s)", "Ø (s)", "Max (s)"):
+        table.add_column(col, justify="right" if col != "Phase" else "left")
+    for name, count, total, mean, worst in timer.summary():
+        table.add_row(name, str(count), f"{total:.2f}", f"{mean:.2f}", f"{worst:.2f}")
+    console.print(table)
+    console.print(
+        f"Verarbeitet: {processed}, fehlgeschlagen: {failed} | Server: {stats.requests} Requests, "
+        f"{stats.failures} injizierte Fehler, {len(stats.messages)} Nachrichten"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load benchmark against the fake WG-Gesucht")
+    parser.add_argument("--searches", type=int, default=3, help="number of search URLs")
+    parser.add_argument("--cards", type=int, default=20, help="organic cards per search page")
+    parser.add_argument("--partner-cards", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=0, help="max. listings to process (0 = all)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--no-send", action="store_true")
+    parser.add_argument("--visible", action="store_true")
+    run_load(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
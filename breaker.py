@@ -0,0 +1,183 @@
+"""
+Per-host navigation guard: timeouts derived from observed page latency (p99 x factor) and a
+circuit breaker that opens after consecutive failures, so a degraded site costs a few short
+timeouts instead of the whole cycle. While open, navigation fails fast; after a cooldown a
+single trial is let through (half-open) and the cooldown doubles on every failed trial.
+"""
+
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+from timing import current_deadline, percentile
+
+TIMEOUT_FACTOR = 3.0
+MIN_SAMPLES = 10
+MIN_TIMEOUT_MS = 5000
+WINDOW = 100
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 30.0
+MAX_COOLDOWN_SECONDS = 900.0
+# A half-open trial without a recorded outcome after this long is given up and the next caller tries
+TRIAL_SECONDS = 60.0
+
+
+class CircuitOpenError(RuntimeError):
+    """Navigation refused because the host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} antwortet nicht zuverlässig, nächster Versuch in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """closed -> open after FAILURE_THRESHOLD consecutive failures -> half_open after the cooldown."""
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = COOLDOWN_SECONDS,
+        max_cooldown: float = MAX_COOLDOWN_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.trial_at: float | None = None  # start of the half-open trial in flight
+        self.trips = 0
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial is allowed (0 if a request may go out now)."""
+        if self.state == "open":
+            return max(0.0, self.opened_at + self.cooldown - self.clock())
+        if self.state == "half_open" and self.trial_at is not None:
+            return max(0.0, self.trial_at + TRIAL_SECONDS - self.clock())
+        return 0.0
+
+    def allow(self, claim: bool = True) -> bool:
+        """
+        True if a request may go out. An expired open circuit turns half-open and admits one
+        trial request (claim=False only asks without taking it); everything else is refused
+        until the trial's recorded outcome closes the circuit or reopens it with a longer cooldown.
+        """
+        if self.state == "open" and self.retry_in() == 0:
+            self.state = "half_open"
+            self.trial_at = None
+        if self.state != "half_open":
+            return self.state == "closed"
+        if self.retry_in() > 0:
+            return False
+        if claim:
+            self.trial_at = self.clock()
+        return True
+
+    def release(self) -> None:
+        """The trial ended without saying anything about the host: let the next caller try."""
+        self.trial_at = None
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.trial_at = None
+
+    def record_failure(self) -> None:
+        if self.state == "half_open":
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+            return
+        self.failures += 1
+        if self.state == "closed" and self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = self.clock()
+        self.trial_at = None
+        self.trips += 1
+
+
+class HostGuard:
+    """Latency samples per navigation kind (search, detail, message, ...) plus one breaker per host."""
+
+    def __init__(self, host: str, factor: float = TIMEOUT_FACTOR, breaker: CircuitBreaker | None = None):
+        self.host = host
+        self.factor = factor
+        self.breaker = breaker or CircuitBreaker()
+        self.samples: dict[str, deque] = defaultdict(lambda: deque(maxlen=WINDOW))
+
+    def timeout_ms(self, kind: str, default_ms: int) -> int:
+        """p99 x factor of recent successful navigations, between MIN_TIMEOUT_MS and default_ms."""
+        samples = self.samples[kind]
+        if len(samples) < MIN_SAMPLES:
+            return default_ms
+        adaptive = percentile(list(samples), 99) * self.factor * 1000
+        return int(min(default_ms, max(MIN_TIMEOUT_MS, adaptive)))
+
+    def observe(self, kind: str, seconds: float) -> None:
+        self.samples[kind].append(seconds)
+
+    def check(self, claim: bool = True) -> None:
+        """
+        Raise CircuitOpenError unless a request may go out now. While half-open this takes the
+        single trial; claim=False leaves it to the request that follows.
+        """
+        if not self.breaker.allow(claim):
+            raise CircuitOpenError(self.host, self.breaker.retry_in())
+
+    def navigate(self, page, url: str, kind: str, default_ms: int, wait_until: str = "domcontentloaded"):
+        """
+        page.goto with an adaptive timeout, cut to the current cycle deadline (DeadlineExceeded
+        once it has passed); timeouts, network errors and 5xx count as failures.
+        """
+        timeout, clamped = self._navigation_timeout(kind, default_ms)
+        t0 = time.perf_counter()
+        try:
+            response = page.goto(url, wait_until=wait_until, timeout=timeout)
+        except Exception:
+            if clamped:
+                self.breaker.release()
+            else:
+                self.breaker.record_failure()
+            raise
+        self._record(kind, response, time.perf_counter() - t0)
+        return response
+
+    def _navigation_timeout(self, kind: str, default_ms: int) -> tuple[int, bool]:
+        """
+        Timeout for the next navigation and whether the cycle deadline shortened it
+        (a load cut off by the deadline says nothing about the host's health).
+        """
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check(f"Laden von {self.host}")
+        self.check()
+        timeout = self.timeout_ms(kind, default_ms)
+        if deadline is None:
+            return timeout, False
+        clamped = int(deadline.clamp(timeout / 1000) * 1000)
+        return max(clamped, 1), clamped < timeout
+
+    def _record(self, kind: str, response, seconds: float) -> None:
+        if response is not None and response.status >= 500:
+            self.breaker.record_failure()
+            return
+        self.observe(kind, seconds)
+        self.breaker.record_success()
+
+
+_GUARDS: dict[str, HostGuard] = {}
+
+
+def guard_for(url: str) -> HostGuard:
+    """The process-wide guard for url's host."""
+    host = urlsplit(url).netloc or url
+    if host not in _GUARDS:
+        _GUARDS[host] = HostGuard(host)
+    return _GUARDS[host]
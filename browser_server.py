@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Warm browser server: one long-running Chromium holding a logged-in context for a profile.
+CLI runs attach to it over the local CDP endpoint instead of launching a browser and logging
+in, so ad-hoc runs and cron triggers start working almost immediately.
+Usage:
+  flatscraper browser start [--profile NAME] [--browser-profile minimal]
+  flatscraper browser status
+  flatscraper browser stop
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from config import PROJECT_ROOT, STATE_DIR, get_profiles
+from launch import LaunchProfile, context_options, launch_browser, launch_options, resolve_launch_profile
+from models import BrowserServerInfo
+
+console = Console()
+
+SERVER_INFO_PATH = STATE_DIR / "browser-server.json"
+SERVER_LOG_PATH = STATE_DIR / "browser-server.log"
+USER_DATA_DIR = STATE_DIR / "browser-server"
+START_TIMEOUT_SECONDS = 90.0
+SESSION_REFRESH_SECONDS = 30 * 60
+
+
+def read_info(path: Path = SERVER_INFO_PATH) -> BrowserServerInfo | None:
+    try:
+        return BrowserServerInfo.model_validate_json(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def browser_version(endpoint: str, timeout: float = 1.0) -> dict | None:
+    """CDP /json/version of the endpoint, None if nothing answers there."""
+    try:
+        with urllib.request.urlopen(endpoint.rstrip("/") + "/json/version", timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except (OSError, ValueError):
+        return None
+
+
+def running(path: Path = SERVER_INFO_PATH) -> BrowserServerInfo | None:
+    """Info of a live server (process alive and endpoint answering), else None."""
+    info = read_info(path)
+    if info and _pid_alive(info.pid) and browser_version(info.endpoint):
+        return info
+    return None
+
+
+def attach(playwright, path: Path = SERVER_INFO_PATH):
+    """(browser, info) connected to the running server, or (None, None) if there is none."""
+    info = running(path)
+    if not info:
+        return None, None
+    try:
+        return playwright.chromium.connect_over_cdp(info.endpoint), info
+    except Exception:
+        return None, None
+
+
+def attach_or_launch(playwright, launch_profile: LaunchProfile, headless: bool = True, use_server: bool = True):
+    """
+    (browser, info): the warm server's browser if one is running (and use_server), else a
+    freshly launched one with info None. Closing an attached browser only disconnects.
+    """
+    if use_server:
+        browser, info = attach(playwright)
+        if browser:
+            return browser, info
+    return launch_browser(playwright, launch_profile, headless=headless), None
+
+
+def server_context(browser, info: BrowserServerInfo | None, profile_name: str):
+    """The server's logged-in context if it belongs to profile_name, else None."""
+    if info and info.profile == profile_name and browser.contexts:
+        return browser.contexts[0]
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _restore_cookies(context, storage_state: str) -> None:
+    """Cookies of the profile's saved session, so the persistent context starts logged in."""
+    try:
+        cookies = json.loads(Path(storage_state).read_text(encoding="utf-8")).get("cookies", [])
+        if cookies:
+            context.add_cookies(cookies)
+    except Exception:
+        pass
+
+
+def serve(port: int, profile_name: str | None, launch_profile_name: str | None, path: Path = SERVER_INFO_PATH) -> None:
+    """
+    Foreground server process (started detached by `start`): persistent context with remote
+    debugging on 127.0.0.1:port, logged in for the profile; refreshes the session every
+    30 minutes and exits on SIGTERM.
+    """
+    from playwright.sync_api import sync_playwright
+
+    from platforms import PLATFORMS
+    from sessions import LOCALE
+
+    profiles = get_profiles()
+    profile = next((p for p in profiles if p.name == profile_name), None) if profile_name else profiles[0]
+    if profile is None:
+        raise SystemExit(f"Profil nicht gefunden: {profile_name}")
+    launch_profile = resolve_launch_profile(launch_profile_name)
+    platform = PLATFORMS["wggesucht"]
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    options = launch_options(launch_profile, headless=True)
+    options["args"] = [*options.get("args", []), f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+    with sync_playwright() as p:
+        context = p.chromium.launch_persistent_context(
+            str(USER_DATA_DIR / profile.name), **options, **context_options(launch_profile), locale=LOCALE
+        )
+        try:
+            _restore_cookies(context, profile.storage_state)
+            platform.prepare_context(context)
+            page = context.pages[0] if context.pages else context.new_page()
+            platform.login(page, email=profile.email, password=profile.password)
+            context.storage_state(path=profile.storage_state)
+            path.write_text(BrowserServerInfo(
+                pid=os.getpid(),
+                endpoint=f"http://127.0.0.1:{port}",
+                profile=profile.name,
+                launch_profile=launch_profile.name,
+                started_at=datetime.now(),
+            ).model_dump_json(indent=2), encoding="utf-8")
+            print(f"Browser-Server bereit auf Port {port} (Profil {profile.name})", flush=True)
+            refreshed = time.monotonic()
+            while not stop.is_set():
+                page.wait_for_timeout(1000)  # keeps Playwright's connection serviced
+                if time.monotonic() - refreshed > SESSION_REFRESH_SECONDS:
+                    try:
+                        platform.login(page, email=profile.email, password=profile.password)
+                        context.storage_state(path=profile.storage_state)
+                    except Exception as e:
+                        print(f"Session-Auffrischung fehlgeschlagen: {e}", flush=True)
+                    refreshed = time.monotonic()
+        finally:
+            info = read_info(path)
+            if info and info.pid == os.getpid():
+                path.unlink(missing_ok=True)
+            context.close()
+
+
+def start(profile_name: str | None, launch_profile_name: str | None) -> None:
+    info = running()
+    if info:
+        console.print(f"[yellow]Browser-Server läuft bereits ({info.endpoint}, Profil {info.profile})[/yellow]")
+        return
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    port = _free_port()
+    cmd = [sys.executable, str(Path(__file__).resolve()), "serve", "--port", str(port)]
+    if profile_name:
+        cmd += ["--profile", profile_name]
+    if launch_profile_name:
+        cmd += ["--browser-profile", launch_profile_name]
+    with SERVER_LOG_PATH.open("w", encoding="utf-8") as log:
+        proc = subprocess.Popen(
+            cmd, cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    with console.status("[dim]Starte Browser und melde an...[/dim]", spinner="dots"):
+        while time.monotonic() < deadline:
+            info = running()
+            if info and info.pid == proc.pid:
+                console.print(f"[green]Browser-Server läuft: {info.endpoint} (Profil {info.profile}, PID {info.pid})[/green]")
+                return
+            if proc.poll() is not None:
+                break
+            time.sleep(0.5)
+    if proc.poll() is None:
+        proc.terminate()
+    tail = SERVER_LOG_PATH.read_text(encoding="utf-8", errors="replace").strip().splitlines()[-5:]
+    console.print("[red]Browser-Server konnte nicht gestartet werden[/red]")
+    for line in tail:
+        console.print(f"  [dim]{line}[/dim]")
+
+
+def stop(path: Path = SERVER_INFO_PATH) -> None:
+    info = read_info(path)
+    if not info or not _pid_alive(info.pid):
+        path.unlink(missing_ok=True)
+        console.print("[dim]Kein Browser-Server aktiv[/dim]")
+        return
+    os.kill(info.pid, signal.SIGTERM)
+    for _ in range(40):
+        if not _pid_alive(info.pid):
+            break
+        time.sleep(0.25)
+    else:
+        os.kill(info.pid, signal.SIGKILL)
+    path.unlink(missing_ok=True)
+    console.print(f"[green]Browser-Server beendet (PID {info.pid})[/green]")
+
+
+def status(path: Path = SERVER_INFO_PATH) -> None:
+    info = read_info(path)
+    version = browser_version(info.endpoint) if info and _pid_alive(info.pid) else None
+    if not version:
+        console.print("[dim]Kein Browser-Server aktiv – Läufe starten einen eigenen Browser[/dim]")
+        return
+    uptime = datetime.now() - info.started_at
+    table = Table(show_header=False, title="Browser-Server")
+    table.add_row("Endpoint", info.endpoint)
+    table.add_row("PID", str(info.pid))
+    table.add_row("Profil", info.profile)
+    table.add_row("Browser-Profil", info.launch_profile)
+    table.add_row("Browser", version.get("Browser", "?"))
+    table.add_row("Läuft seit", f"{info.started_at:%Y-%m-%d %H:%M} ({int(uptime.total_seconds() // 60)} min)")
+    console.print(table)
+
+
+def run_browser_server(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="flatscraper browser", description="Warmen Browser-Server verwalten")
+    parser.add_argument("action", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--profile", help="Profil, dessen Anmeldung der Server hält (Standard: erstes Profil)")
+    parser.add_argument("--browser-profile", help="Start-Profil des Browsers (Standard: BROWSER_PROFILE)")
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.action == "serve":
+        serve(args.port or _free_port(), args.profile, args.browser_profile)
+    elif args.action == "start":
+        start(args.profile, args.browser_profile)
+    elif args.action == "stop":
+        stop()
+    else:
+        status()
+
+
+if __name__ == "__main__":
+    run_browser_server(sys.argv[1:])
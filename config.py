@@ -1,15 +1,23 @@
 """Shared configuration for FlatScraper. Type-safe loading from env and user_profile.json."""
 
 import json
+import os
 from pathlib import Path
 
+from dotenv import dotenv_values
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from models import UserProfile
+from models import LLMProvider, ScraperProfile, UserProfile
 
 PROJECT_ROOT = Path(__file__).parent
 PROFILE_PATH = PROJECT_ROOT / "user_profile.json"
+PROFILES_PATH = PROJECT_ROOT / "profiles.json"
+PROVIDERS_PATH = PROJECT_ROOT / "llm_providers.json"
+STATE_DIR = PROJECT_ROOT / ".flatscraper"
+DB_PATH = STATE_DIR / "flatscraper.db"
+
+_SYSTEM_PROMPT_PREFIX = "Du bist ein charmanter, professioneller Assistent, der dabei hilft, ein WG-Zimmer ODER eine Wohnung zu finden. Deine Aufgabe ist es, basierend auf einer Wohnungsanzeige ein kurzes, sympathisches und persönliches Anschreiben auf Deutsch zu verfassen. Das Anschreiben passt sich dem Anzeigentyp an (WG-Zimmer vs. Wohnung)."
 
 # Default persona block when no profile exists (placeholder – run "flatscraper setup" to configure)
 _DEFAULT_PERSONA_BLOCK = """DEINE PERSONA:
@@ -36,8 +44,19 @@ class AppSettings(BaseSettings):
     password: str = Field(default="", validation_alias="FLATSCRAPER_PASSWORD")
     groq_api_key: str = Field(default="", validation_alias="GROQ_API_KEY")
     groq_model: str = Field(default="llama-3.1-8b-instant", validation_alias="GROQ_MODEL")
+    groq_base_url: str = Field(default="", validation_alias="GROQ_BASE_URL")
     google_drive_link: str = Field(default="", validation_alias="GOOGLE_DRIVE_LINK")
     run_interval_minutes: int = Field(default=30, validation_alias="RUN_INTERVAL_MINUTES")
+    near_duplicates: str = Field(default="skip", validation_alias="NEAR_DUPLICATES")
+    rank_min_score: float = Field(default=0.0, validation_alias="RANK_MIN_SCORE")
+    watch_interval_seconds: int = Field(default=20, validation_alias="WATCH_INTERVAL_SECONDS")
+    cycle_budget_seconds: float = Field(default=0.0, validation_alias="CYCLE_BUDGET_SECONDS")
+    inbox_sync_minutes: float = Field(default=10.0, validation_alias="INBOX_SYNC_MINUTES")
+    inbox_skip_landlords: bool = Field(default=False, validation_alias="INBOX_SKIP_LANDLORDS")
+    message_generator: str = Field(default="llm", validation_alias="MESSAGE_GENERATOR")
+    browser_profile: str = Field(default="default", validation_alias="BROWSER_PROFILE")
+    browser_viewport: str = Field(default="", validation_alias="BROWSER_VIEWPORT")
+    browser_device_scale: float = Field(default=0.0, validation_alias="BROWSER_DEVICE_SCALE")
     auto_run_enabled: bool = Field(
         default=False,
         validation_alias="AUTO_RUN_ENABLED",
@@ -61,6 +80,11 @@ def _load_user_profile() -> UserProfile | None:
     return None
 
 
+def _resolve_path(value: str) -> Path:
+    path = Path(value).expanduser()
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
 # --- Public API ---
 
 def get_settings() -> AppSettings:
@@ -88,6 +112,88 @@ def get_persona_block() -> str:
     return _DEFAULT_PERSONA_BLOCK
 
 
+def load_user_profile_from(path: Path) -> UserProfile | None:
+    """Load a user_profile.json from an explicit path (used for multi-profile runs)."""
+    if not path.exists():
+        return None
+    try:
+        return UserProfile.model_validate(json.loads(path.read_text(encoding="utf-8")))
+    except Exception:
+        return None
+
+
+def get_profiles() -> list[ScraperProfile]:
+    """
+    Profiles from profiles.json (list of ScraperProfile entries).
+    Without profiles.json, returns one "default" profile built from .env and user_profile.json.
+    Relative paths are resolved against the project root; storage_state defaults to STATE_DIR.
+    Raises ValueError if profiles.json exists but can't be read, rather than silently running
+    the .env account instead.
+    """
+    profiles: list[ScraperProfile] = []
+    if PROFILES_PATH.exists():
+        try:
+            raw = json.loads(PROFILES_PATH.read_text(encoding="utf-8"))
+            profiles = [ScraperProfile.model_validate(entry) for entry in raw]
+        except Exception as e:
+            raise ValueError(f"{PROFILES_PATH.name} ist ungültig: {e}") from e
+    if not profiles:
+        profiles = [ScraperProfile(
+            name="default",
+            email=EMAIL,
+            password=PASSWORD,
+            user_profile=str(PROFILE_PATH),
+            search_urls=get_search_urls(),
+        )]
+
+    resolved = []
+    for profile in profiles:
+        user_profile = _resolve_path(profile.user_profile) if profile.user_profile else PROFILE_PATH
+        storage_state = (
+            _resolve_path(profile.storage_state) if profile.storage_state
+            else STATE_DIR / f"{profile.name}.storage.json"
+        )
+        resolved.append(profile.model_copy(update={
+            "email": profile.email or EMAIL,
+            "password": profile.password or PASSWORD,
+            "user_profile": str(user_profile),
+            "storage_state": str(storage_state),
+        }))
+    return resolved
+
+
+def get_llm_providers() -> list[LLMProvider]:
+    """
+    LLM backends from llm_providers.json (list of LLMProvider entries, keys resolved from
+    api_key_env). Without the file: Groq from GROQ_API_KEY / GROQ_MODEL / GROQ_BASE_URL.
+    """
+    providers: list[LLMProvider] = []
+    if PROVIDERS_PATH.exists():
+        try:
+            raw = json.loads(PROVIDERS_PATH.read_text(encoding="utf-8"))
+            providers = [LLMProvider.model_validate(entry) for entry in raw]
+        except Exception:
+            providers = []
+    if not providers and GROQ_API_KEY:
+        providers = [LLMProvider(
+            name="groq",
+            base_url=(GROQ_BASE_URL or "https://api.groq.com").rstrip("/") + "/openai/v1",
+            model=GROQ_MODEL,
+            api_key=GROQ_API_KEY,
+        )]
+    env_file = dotenv_values(PROJECT_ROOT / ".env") if any(p.api_key_env for p in providers) else {}
+    return [
+        p.model_copy(update={"api_key": os.environ.get(p.api_key_env) or env_file.get(p.api_key_env) or ""})
+        if p.api_key_env and not p.api_key else p
+        for p in providers
+    ]
+
+
+def build_system_prompt(persona_block: str) -> str:
+    """System prompt for Anschreiben generation with the given persona block."""
+    return _SYSTEM_PROMPT_PREFIX + "\n\n" + persona_block
+
+
 # Backward-compatible module-level exports (loaded at import)
 _settings_instance = AppSettings()
 
@@ -95,8 +201,19 @@ EMAIL = _settings_instance.email
 PASSWORD = _settings_instance.password
 GROQ_API_KEY = _settings_instance.groq_api_key
 GROQ_MODEL = _settings_instance.groq_model
+GROQ_BASE_URL = _settings_instance.groq_base_url
 GOOGLE_DRIVE_LINK = _settings_instance.google_drive_link
 RUN_INTERVAL_MINUTES = _settings_instance.run_interval_minutes
+WATCH_INTERVAL_SECONDS = _settings_instance.watch_interval_seconds
+CYCLE_BUDGET_SECONDS = _settings_instance.cycle_budget_seconds
+INBOX_SYNC_MINUTES = _settings_instance.inbox_sync_minutes
+INBOX_SKIP_LANDLORDS = _settings_instance.inbox_skip_landlords
+MESSAGE_GENERATOR = _settings_instance.message_generator
+BROWSER_PROFILE = _settings_instance.browser_profile
+BROWSER_VIEWPORT = _settings_instance.browser_viewport
+BROWSER_DEVICE_SCALE = _settings_instance.browser_device_scale
+NEAR_DUPLICATES = _settings_instance.near_duplicates
+RANK_MIN_SCORE = _settings_instance.rank_min_score
 AUTO_RUN_ENABLED = _settings_instance.auto_run_enabled
 
 # Parse AUTO_RUN_ENABLED - pydantic-settings should handle "true"/"false" for bool
@@ -106,9 +223,7 @@ AUTO_RUN_ENABLED = _settings_instance.auto_run_enabled
 _persona_block = get_persona_block()
 _persona_name = get_persona_name()
 
-LLM_SYSTEM_PROMPT = f"""Du bist ein charmanter, professioneller Assistent, der dabei hilft, ein WG-Zimmer ODER eine Wohnung zu finden. Deine Aufgabe ist es, basierend auf einer Wohnungsanzeige ein kurzes, sympathisches und persönliches Anschreiben auf Deutsch zu verfassen. Das Anschreiben passt sich dem Anzeigentyp an (WG-Zimmer vs. Wohnung).
-
-{_persona_block}"""
+LLM_SYSTEM_PROMPT = build_system_prompt(_persona_block)
 
 # ---------------------------------------------------------------------------
 # AD-TYPE INSTRUCTIONS
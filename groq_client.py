@@ -1,27 +1,29 @@
 #!/usr/bin/env python3
 """
-Groq API client for generating WG Anschreiben (application messages).
-Uses Llama models via Groq.
+LLM client for generating WG Anschreiben (application messages).
+Uses Llama models via Groq by default; other OpenAI-compatible providers via llm.py.
 """
 
 import re
-import time
 from typing import Callable
 
 from config import (
     GOOGLE_DRIVE_LINK,
-    GROQ_API_KEY,
-    GROQ_MODEL,
     LLM_AD_TYPE_INSTRUCTIONS_WG,
     LLM_AD_TYPE_INSTRUCTIONS_WOHNUNG,
     LLM_MESSAGE_PROMPT_TEMPLATE,
     LLM_SYSTEM_PROMPT,
+    build_system_prompt,
     get_persona_name,
 )
-from models import ListingData
+from llm import Router, get_router, parse_retry_after
+from models import ListingData, UserProfile
+from timing import Deadline
 
+MAX_COMPLETION_TOKENS = 2048
 
-def _build_message_prompt(data: ListingData) -> str:
+
+def _build_message_prompt(data: ListingData, persona_name: str | None = None) -> str:
     ad_type = data.ad_type
     ad_type_label = "WG-Zimmer" if ad_type == "wg" else "Wohnung"
     ad_type_instructions = (
@@ -36,7 +38,7 @@ def _build_message_prompt(data: ListingData) -> str:
         google_drive_link=data.google_drive or GOOGLE_DRIVE_LINK,
         ad_type_label=ad_type_label,
         ad_type_instructions=ad_type_instructions,
-        persona_name=get_persona_name(),
+        persona_name=persona_name or get_persona_name(),
     )
 
 
@@ -81,58 +83,56 @@ def _extract_message_only(raw: str) -> str:
 
 
 def _parse_retry_after(error: Exception) -> float | None:
-    """Parse 'try again in X.XXs' from Groq rate limit error. Returns seconds or None."""
-    msg = str(error)
-    m = re.search(r"try again in ([\d.]+)\s*s", msg, re.I)
-    if m:
-        try:
-            return float(m.group(1))
-        except ValueError:
-            pass
-    return None
+    """Parse 'try again in X.XXs' from a rate limit error. Returns seconds or None."""
+    return parse_retry_after(str(error))
+
+
+def _default_backoff(retry_after: float | None, attempt: int) -> float:
+    """Current strategy: wait as long as the provider asks, 5s if it doesn't say."""
+    return retry_after or 5.0
 
 
 def generate_anschreiben(
     listing_data: ListingData,
     *,
     on_retry: Callable[[float, int], None] | None = None,
+    persona: UserProfile | None = None,
+    backoff: Callable[[float | None, int], float] = _default_backoff,
+    max_retries: int = 4,
+    deadline: Deadline | None = None,
+    router: Router | None = None,
 ) -> str:
     """
-    Call Groq API to generate WG Anschreiben.
-    Retries on rate limit (429) with backoff. on_retry(wait_seconds, attempt) is called before each wait.
+    Generate a WG Anschreiben via the configured LLM providers (llm.get_router(): Groq from
+    GROQ_API_KEY, or the backends in llm_providers.json, fastest available first).
+    When every provider is rate limited, waits with backoff; on_retry(wait_seconds, attempt)
+    is called before each wait.
+    persona overrides the default user_profile.json (multi-profile runs).
+    backoff(retry_after_hint, attempt) -> seconds lets benchmarks compare retry strategies.
+    deadline bounds the request timeout and the rate-limit waits (DeadlineExceeded instead of
+    waiting past it).
     """
-    if not GROQ_API_KEY:
+    router = router or get_router()
+    if not router.providers:
         raise RuntimeError(
-            "GROQ_API_KEY not set. Set GROQ_API_KEY in your .env file or environment"
+            "GROQ_API_KEY not set. Set GROQ_API_KEY in your .env file or environment "
+            "(or configure providers in llm_providers.json)"
         )
 
-    import groq
-    from groq import Groq
-
-    client = Groq(api_key=GROQ_API_KEY)
-    user_content = _build_message_prompt(listing_data)
-    max_retries = 4
-
-    for attempt in range(max_retries):
-        try:
-            completion = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": LLM_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_content},
-                ],
-                temperature=0.8,
-                max_completion_tokens=2048,
-                top_p=1,
-            )
-            content = completion.choices[0].message.content
-            if not content:
-                raise RuntimeError("Groq API returned empty response")
-            return _extract_message_only(content.strip())
-        except groq.RateLimitError as e:
-            if attempt == max_retries - 1:
-                raise
-            wait_time = _parse_retry_after(e) or 5.0
-            if on_retry:
-                on_retry(wait_time, attempt + 1)
-            time.sleep(wait_time)
+    system_prompt = build_system_prompt(persona.persona_block) if persona else LLM_SYSTEM_PROMPT
+    user_content = _build_message_prompt(listing_data, persona.persona_name if persona else None)
+    content = router.complete(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ],
+        tokens_needed=(len(system_prompt) + len(user_content)) // 4 + MAX_COMPLETION_TOKENS,
+        deadline=deadline,
+        on_retry=on_retry,
+        backoff=backoff,
+        max_rounds=max_retries,
+        temperature=0.8,
+        max_tokens=MAX_COMPLETION_TOKENS,
+        top_p=1,
+    )
+    return _extract_message_only(content.strip())
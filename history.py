@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Listing history CLI – query and export every listing FlatScraper has seen.
+Usage:
+  flatscraper history [--max-price 700] [--min-size 15] [--max-ppm 35] [--type wg] [--since 2026-10-01]
+  flatscraper history export listings.parquet   (.parquet/.feather need pyarrow; .csv always works)
+  flatscraper history freshness [--by hour] [--since 2026-10-01]   (age of listings at contact)
+"""
+
+import argparse
+import csv
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from store import HISTORY_COLUMNS, FreshnessStore, HistoryStore
+
+console = Console()
+
+
+def export_history(store: HistoryStore, path: Path) -> int:
+    """Write all history rows to path (format from suffix). Returns the row count."""
+    rows = store.rows().fetchall()
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(HISTORY_COLUMNS)
+            writer.writerows(rows)
+        return len(rows)
+    if suffix not in (".parquet", ".feather", ".arrow"):
+        raise ValueError(f"Unsupported export format: {suffix} (use .parquet, .feather or .csv)")
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError(
+            "pyarrow not installed. Install with: pip install 'flatscraper[history]'"
+        ) from None
+
+    columns = list(zip(*rows)) if rows else [()] * len(HISTORY_COLUMNS)
+    data = dict(zip(HISTORY_COLUMNS, (list(col) for col in columns)))
+    data["first_seen"] = [datetime.fromtimestamp(ts) for ts in data["first_seen"]]
+    data["last_seen"] = [datetime.fromtimestamp(ts) for ts in data["last_seen"]]
+    data["available_from"] = [date.fromisoformat(d) if d else None for d in data["available_from"]]
+    schema = pa.schema([
+        (name, pa.float64() if name in ("price_eur", "size_m2", "price_per_m2") else pa.string())
+        for name in HISTORY_COLUMNS
+        if name not in ("available_from", "first_seen", "last_seen")
+    ] + [
+        ("available_from", pa.date32()),
+        ("first_seen", pa.timestamp("s")),
+        ("last_seen", pa.timestamp("s")),
+    ])
+    table = pa.table({name: data[name] for name in schema.names}, schema=schema)
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, str(path))
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, str(path))
+    return len(rows)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="flatscraper history", description="Anzeigen-Historie abfragen")
+    parser.add_argument("--min-price", type=float)
+    parser.add_argument("--max-price", type=float)
+    parser.add_argument("--min-size", type=float)
+    parser.add_argument("--max-size", type=float)
+    parser.add_argument("--max-ppm", type=float, help="max. Preis pro m²")
+    parser.add_argument("--type", choices=["wg", "wohnung"])
+    parser.add_argument("--since", type=date.fromisoformat, help="zuerst gesehen ab (YYYY-MM-DD)")
+    parser.add_argument("--available-before", type=date.fromisoformat, help="frei ab spätestens (YYYY-MM-DD)")
+    parser.add_argument("--sort", default="first_seen", choices=HISTORY_COLUMNS)
+    parser.add_argument("--limit", type=int, default=50)
+    return parser
+
+
+def _fmt_minutes(value: float | None) -> str:
+    if value is None:
+        return "–"
+    return f"{value:.0f} min" if value < 120 else f"{value / 60:.1f} h"
+
+
+def run_freshness(argv: list[str]) -> None:
+    """Age-at-contact report: how long after publication listings were messaged."""
+    parser = argparse.ArgumentParser(prog="flatscraper history freshness", description="Reaktionszeit-Bericht")
+    parser.add_argument("--by", choices=["url", "hour"], default="url", help="gruppieren nach Such-URL oder Stunde")
+    parser.add_argument("--since", type=date.fromisoformat, help="entdeckt ab (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    store = FreshnessStore()
+    try:
+        rows = store.report(
+            by="hour" if args.by == "hour" else "search_url",
+            since=datetime.combine(args.since, datetime.min.time()) if args.since else None,
+        )
+    finally:
+        store.close()
+
+    table = Table(title="Reaktionszeit (Alter der Anzeige bei Kontakt)")
+    for col in ("Such-URL" if args.by == "url" else "Stunde", "Gefunden", "Gesendet",
+                "Entdeckt p50", "Kontakt p50", "Kontakt p90"):
+        table.add_column(col, justify="left" if col in ("Such-URL", "Stunde") else "right")
+    for key, found, sent, lag50, age50, age90 in rows:
+        label = key if args.by == "hour" else (key[:60] + "…" if len(key) > 60 else key or "–")
+        table.add_row(label, str(found), str(sent), _fmt_minutes(lag50), _fmt_minutes(age50), _fmt_minutes(age90))
+    console.print(table)
+
+
+def run_history(argv: list[str]) -> None:
+    """Entry point for 'flatscraper history'."""
+    if argv and argv[0] == "freshness":
+        run_freshness(argv[1:])
+        return
+    store = HistoryStore()
+    try:
+        if argv and argv[0] == "export":
+            if len(argv) < 2:
+                console.print("[red]Zieldatei fehlt: flatscraper history export listings.parquet[/red]")
+                return
+            path = Path(argv[1])
+            count = export_history(store, path)
+            console.print(f"[green]{count} Anzeigen exportiert nach {path}[/green]")
+            return
+
+        args = _build_parser().parse_args(argv)
+        started = time.perf_counter()
+        records = store.query(
+            min_price=args.min_price,
+            max_price=args.max_price,
+            min_size=args.min_size,
+            max_size=args.max_size,
+            max_price_per_m2=args.max_ppm,
+            ad_type=args.type,
+            since=datetime.combine(args.since, datetime.min.time()) if args.since else None,
+            available_before=args.available_before,
+            order_by=args.sort,
+            limit=args.limit,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        store.close()
+
+    table = Table(title=f"{len(records)} Anzeigen ({elapsed_ms:.1f} ms)")
+    for col in ("ID", "Typ", "Preis", "m²", "€/m²", "Frei ab", "Gesehen", "Titel"):
+        table.add_column(col)
+    for r in records:
+        table.add_row(
+            r.ad_id,
+            r.ad_type,
+            f"{r.price_eur:.0f} €" if r.price_eur is not None else "–",
+            f"{r.size_m2:g}" if r.size_m2 is not None else "–",
+            f"{r.price_per_m2:.1f}" if r.price_per_m2 is not None else "–",
+            r.available_from.strftime("%d.%m.%Y") if r.available_from else "–",
+            r.first_seen.strftime("%d.%m. %H:%M"),
+            r.title[:50],
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    run_history(sys.argv[1:])
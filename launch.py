@@ -0,0 +1,117 @@
+"""
+Browser launch profiles: which Chromium build, command-line switches, viewport and device
+scale a run uses. `default` is Playwright's stock launch; the lean profiles switch off what a
+headless scraper never needs (GPU, extensions, background networking, component updates, ...)
+to cut startup time and memory on small machines.
+"""
+
+from dataclasses import dataclass, replace
+
+from config import BROWSER_DEVICE_SCALE, BROWSER_PROFILE, BROWSER_VIEWPORT
+
+# Features a scraper never uses; each one otherwise costs startup work or background traffic
+_LEAN_ARGS = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AcceptCHFrame,InterestFeedContentSuggestions",
+    "--metrics-recording-only",
+    "--no-default-browser-check",
+    "--no-first-run",
+    "--no-pings",
+    "--mute-audio",
+    "--hide-scrollbars",
+    # /dev/shm is often only 64 MB in containers and on small VPS
+    "--disable-dev-shm-usage",
+    # Background tabs (detail/message roles) keep running at full speed
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+)
+
+
+@dataclass(frozen=True)
+class LaunchProfile:
+    name: str
+    args: tuple[str, ...] = ()
+    channel: str | None = None  # None: Playwright's chromium-headless-shell when headless
+    viewport: tuple[int, int] = (1280, 900)
+    device_scale_factor: float = 1.0
+    description: str = ""
+
+
+LAUNCH_PROFILES: dict[str, LaunchProfile] = {
+    p.name: p
+    for p in (
+        LaunchProfile("default", description="Playwright-Standard (bisheriges Verhalten)"),
+        LaunchProfile("minimal", args=_LEAN_ARGS, description="Headless-Shell ohne GPU, Erweiterungen, Hintergrunddienste"),
+        LaunchProfile(
+            "shell",
+            args=_LEAN_ARGS + ("--blink-settings=imagesEnabled=false", "--renderer-process-limit=2"),
+            viewport=(1024, 768),
+            description="wie minimal, ohne Bilder, max. 2 Renderer, kleinerer Viewport",
+        ),
+        LaunchProfile(
+            "new-headless",
+            args=_LEAN_ARGS,
+            channel="chromium",
+            description="volles Chromium im neuen Headless-Modus (näher am echten Browser)",
+        ),
+    )
+}
+
+
+def parse_viewport(value: str) -> tuple[int, int]:
+    """'1280x900' -> (1280, 900); ValueError for anything else."""
+    width, sep, height = value.lower().partition("x")
+    if not sep or not width.strip().isdigit() or not height.strip().isdigit():
+        raise ValueError(f"Ungültiger Viewport: {value!r} (erwartet BREITExHÖHE, z.B. 1280x900)")
+    return int(width), int(height)
+
+
+def resolve_launch_profile(
+    name: str | None = None, viewport: str | None = None, device_scale: float | None = None
+) -> LaunchProfile:
+    """
+    Launch profile by name (BROWSER_PROFILE if None), with viewport / device scale overridden
+    by the arguments or BROWSER_VIEWPORT / BROWSER_DEVICE_SCALE. KeyError for unknown names.
+    """
+    name = name or BROWSER_PROFILE
+    if name not in LAUNCH_PROFILES:
+        raise KeyError(f"Unbekanntes Browser-Profil: {name} (verfügbar: {', '.join(LAUNCH_PROFILES)})")
+    profile = LAUNCH_PROFILES[name]
+    viewport = viewport or BROWSER_VIEWPORT
+    if viewport:
+        profile = replace(profile, viewport=parse_viewport(viewport))
+    device_scale = device_scale or BROWSER_DEVICE_SCALE
+    if device_scale:
+        profile = replace(profile, device_scale_factor=device_scale)
+    return profile
+
+
+def launch_options(profile: LaunchProfile, headless: bool = True) -> dict:
+    """Keyword arguments for playwright's chromium.launch()."""
+    options: dict = {"headless": headless}
+    if profile.args:
+        options["args"] = list(profile.args)
+    if profile.channel:
+        options["channel"] = profile.channel
+    return options
+
+
+def context_options(profile: LaunchProfile) -> dict:
+    """Viewport and device scale for browser.new_context()."""
+    width, height = profile.viewport
+    return {"viewport": {"width": width, "height": height}, "device_scale_factor": profile.device_scale_factor}
+
+
+def launch_browser(playwright, profile: LaunchProfile, headless: bool = True):
+    """Start Chromium with the profile's build and switches."""
+    return playwright.chromium.launch(**launch_options(profile, headless))
@@ -0,0 +1,279 @@
+"""
+LLM provider layer: any number of OpenAI-compatible chat completion backends (Groq, OpenAI,
+a local inference server, ...) behind one router. Each request goes to the available backend
+with the best observed latency; a rate-limited backend is skipped until its quota resets and
+a failing one is parked for a cooldown, so throughput isn't tied to one vendor's limits.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+
+from models import LLMProvider
+from timing import Deadline, DeadlineExceeded, percentile
+
+LATENCY_ALPHA = 0.3  # EWMA weight of the newest latency sample
+FAILURE_COOLDOWN_SECONDS = 30.0
+DEFAULT_RATE_LIMIT_WAIT = 5.0
+REQUEST_TIMEOUT_SECONDS = 60.0
+
+
+class ProviderError(RuntimeError):
+    """A backend failed the request (network, 5xx, bad response)."""
+
+
+class RateLimited(ProviderError):
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Seconds from '7.66s', '2m59.56s', '1h2m', '120ms' or a bare number; None if unparseable."""
+    if not value:
+        return None
+    value = value.strip().lower()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r"([\d.]+)(ms|h|m|s)", value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(n) * scale[u] for n, u in parts)
+
+
+def parse_retry_after(message: str, headers: dict | None = None) -> float | None:
+    """Wait hint of a 429: 'try again in X.XXs' in the message, else the retry-after header."""
+    m = re.search(r"try again in ([\dhms.]+?)\.?(?:\s|$)", message, re.I)
+    hint = parse_duration(m.group(1)) if m else None
+    if hint is None and headers:
+        hint = parse_duration(headers.get("retry-after"))
+    return hint
+
+
+@dataclass
+class ProviderStats:
+    """Health of one backend as observed by this process."""
+
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    consecutive_failures: int = 0
+    ewma_latency: float | None = None
+    latencies: deque = field(default_factory=lambda: deque(maxlen=100))
+    unavailable_until: float = 0.0
+    tokens_remaining: int | None = None
+    tokens_reset_at: float = 0.0
+    last_error: str = ""
+
+    def available(self, now: float, tokens_needed: int = 0) -> bool:
+        if now < self.unavailable_until:
+            return False
+        if self.tokens_remaining is not None and now < self.tokens_reset_at:
+            return self.tokens_remaining >= tokens_needed
+        return True
+
+    def expected_latency(self) -> float:
+        # Untried backends go first so every backend gets measured
+        return self.ewma_latency if self.ewma_latency is not None else 0.0
+
+
+class OpenAICompatible:
+    """POST {base_url}/chat/completions with bearer auth."""
+
+    def __init__(self, config: LLMProvider, client: httpx.Client | None = None):
+        self.config = config
+        self.client = client or httpx.Client()
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def complete(self, messages: list[dict], timeout: float, **params) -> tuple[str, httpx.Headers]:
+        headers = {"Authorization": f"Bearer {self.config.api_key}"} if self.config.api_key else {}
+        try:
+            resp = self.client.post(
+                self.config.base_url.rstrip("/") + "/chat/completions",
+                json={"model": self.config.model, "messages": messages, **params},
+                headers=headers,
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            raise ProviderError(f"{self.name}: {e.__class__.__name__}: {e}") from e
+        if resp.status_code == 429:
+            message = _error_message(resp)
+            raise RateLimited(f"{self.name}: {message}", parse_retry_after(message, dict(resp.headers)))
+        if resp.status_code >= 400:
+            raise ProviderError(f"{self.name}: HTTP {resp.status_code}: {_error_message(resp)}")
+        try:
+            content = resp.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"{self.name}: unexpected response") from e
+        if not content:
+            raise ProviderError(f"{self.name}: empty response")
+        return content, resp.headers
+
+
+def _error_message(resp: httpx.Response) -> str:
+    try:
+        return str(resp.json()["error"]["message"])
+    except Exception:
+        return resp.text[:200]
+
+
+class Router:
+    """Latency-aware routing over several backends with per-backend health stats."""
+
+    def __init__(self, providers: list, clock: Callable[[], float] = time.monotonic):
+        self.providers = list(providers)
+        self.clock = clock
+        self.stats: dict[str, ProviderStats] = {p.name: ProviderStats() for p in self.providers}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, configs: list[LLMProvider]) -> "Router":
+        client = httpx.Client()
+        return cls([OpenAICompatible(c, client) for c in configs])
+
+    def label(self) -> str:
+        if len(self.providers) == 1:
+            return getattr(getattr(self.providers[0], "config", None), "model", self.providers[0].name)
+        return ", ".join(p.name for p in self.providers)
+
+    def _candidates(self, tokens_needed: int) -> list:
+        now = self.clock()
+        with self._lock:
+            ready = [p for p in self.providers if self.stats[p.name].available(now, tokens_needed)]
+            return sorted(ready, key=lambda p: self.stats[p.name].expected_latency())
+
+    def _next_ready_in(self) -> float:
+        now = self.clock()
+        with self._lock:
+            return max(0.0, min(
+                max(s.unavailable_until, s.tokens_reset_at if s.tokens_remaining is not None else 0.0) - now
+                for s in self.stats.values()
+            ))
+
+    def complete(
+        self,
+        messages: list[dict],
+        *,
+        tokens_needed: int = 0,
+        deadline: Deadline | None = None,
+        on_retry: Callable[[float, int], None] | None = None,
+        backoff: Callable[[float | None, int], float] | None = None,
+        max_rounds: int = 4,
+        **params,
+    ) -> str:
+        """
+        Try the available backends fastest first. When none is available, wait for the first
+        one to recover (backoff(hint, attempt) overrides the wait; on_retry is told) and
+        retry, up to max_rounds rounds.
+        """
+        if not self.providers:
+            raise RuntimeError("Kein LLM-Anbieter konfiguriert (GROQ_API_KEY oder llm_providers.json)")
+        last_error: Exception | None = None
+        for attempt in range(max_rounds):
+            for provider in self._candidates(tokens_needed):
+                if deadline:
+                    deadline.check("KI-Generierung")
+                timeout = deadline.clamp(REQUEST_TIMEOUT_SECONDS) if deadline else REQUEST_TIMEOUT_SECONDS
+                t0 = self.clock()
+                try:
+                    content, headers = provider.complete(messages, timeout=timeout, **params)
+                except RateLimited as e:
+                    self._record_rate_limit(provider.name, e)
+                    last_error = e
+                    continue
+                except ProviderError as e:
+                    self._record_failure(provider.name, e)
+                    last_error = e
+                    continue
+                self._record_success(provider.name, self.clock() - t0, headers)
+                return content
+            if attempt == max_rounds - 1:
+                break
+            hint = self._next_ready_in()
+            wait = backoff(hint or None, attempt + 1) if backoff else max(hint, 0.5)
+            if deadline and deadline.clamp(wait) < wait:
+                raise DeadlineExceeded(f"Alle KI-Anbieter ausgelastet – {wait:.0f}s Wartezeit passt nicht mehr ins Zeitbudget")
+            if on_retry:
+                on_retry(wait, attempt + 1)
+            time.sleep(wait)
+        raise last_error or RuntimeError("Kein LLM-Anbieter verfügbar")
+
+    def _record_success(self, name: str, seconds: float, headers) -> None:
+        with self._lock:
+            s = self.stats[name]
+            s.requests += 1
+            s.successes += 1
+            s.consecutive_failures = 0
+            s.latencies.append(seconds)
+            s.ewma_latency = seconds if s.ewma_latency is None else (
+                LATENCY_ALPHA * seconds + (1 - LATENCY_ALPHA) * s.ewma_latency
+            )
+            remaining = headers.get("x-ratelimit-remaining-tokens") if headers else None
+            reset = parse_duration(headers.get("x-ratelimit-reset-tokens")) if headers else None
+            if remaining is not None and remaining.isdigit() and reset is not None:
+                s.tokens_remaining = int(remaining)
+                s.tokens_reset_at = self.clock() + reset
+
+    def _record_rate_limit(self, name: str, error: RateLimited) -> None:
+        with self._lock:
+            s = self.stats[name]
+            s.requests += 1
+            s.rate_limited += 1
+            s.last_error = str(error)
+            s.unavailable_until = self.clock() + (error.retry_after or DEFAULT_RATE_LIMIT_WAIT)
+
+    def _record_failure(self, name: str, error: Exception) -> None:
+        with self._lock:
+            s = self.stats[name]
+            s.requests += 1
+            s.failures += 1
+            s.consecutive_failures += 1
+            s.last_error = str(error)
+            if s.consecutive_failures >= 2:
+                s.unavailable_until = self.clock() + FAILURE_COOLDOWN_SECONDS
+
+    def health(self) -> list[dict]:
+        """One row per backend: counts, latency p50/p90 (s), state and last error."""
+        now = self.clock()
+        rows = []
+        with self._lock:
+            for p in self.providers:
+                s = self.stats[p.name]
+                latencies = list(s.latencies)
+                rows.append({
+                    "name": p.name,
+                    "requests": s.requests,
+                    "successes": s.successes,
+                    "rate_limited": s.rate_limited,
+                    "failures": s.failures,
+                    "p50": percentile(latencies, 50),
+                    "p90": percentile(latencies, 90),
+                    "available": s.available(now),
+                    "last_error": s.last_error,
+                })
+        return rows
+
+
+_router: Router | None = None
+
+
+def get_router() -> Router:
+    """Process-wide router over the configured providers (stats accumulate across cycles)."""
+    global _router
+    if _router is None:
+        from config import get_llm_providers
+
+        _router = Router.from_config(get_llm_providers())
+    return _router
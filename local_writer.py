@@ -0,0 +1,119 @@
+"""
+Local Anschreiben generator: fills persona-aware templates from ListingData in milliseconds,
+without an LLM call. Follows the same rules as LLM_MESSAGE_PROMPT_TEMPLATE (greeting by
+publisher or a name from the description, WG vs. Wohnung tone, an icebreaker from a concrete
+detail of the ad, short self-introduction, Drive link).
+"""
+
+import re
+
+from config import GOOGLE_DRIVE_LINK, PROFILE_PATH, get_persona_name, load_user_profile_from
+from models import ListingData, Persona, UserProfile
+
+_COMPANY_RE = re.compile(
+    r"gmbh|\bag\b|\bkg\b|gbr|immobilien|verwaltung|makler|wohnen|living|apartments?|team|service|\d",
+    re.I,
+)
+_NAME_INTRO_RE = re.compile(
+    r"\b(?i:wir sind|ich bin|ich heiße|ich heisse|mein name ist|hier (?:ist|schreibt|schreiben))\s+"
+    r"([A-ZÄÖÜ][a-zäöüß]{1,15})\b"
+)
+# Capitalized words after "Wir sind"/"Ich bin" that are not names
+_NOT_NAMES = {
+    "Studenten", "Student", "Studentin", "Studierende", "Berufstätige", "Berufstätiger", "Azubi",
+    "Azubis", "Mitbewohner", "Mitbewohnerin", "Doktorand", "Doktorandin", "Vermieter", "Vermieterin",
+    "Eigentümer", "Eigentümerin", "Mieter", "Mieterin", "Nichtraucher", "Familie", "Paar", "Leute",
+    "Frau", "Herr", "Ingenieur", "Ingenieurin", "Lehrer", "Lehrerin", "Ärztin", "Arzt", "Anfang",
+    "Ende", "Mitte", "Gerne", "Auch", "Alle", "Beide",
+}
+
+# (keywords, sentence) in priority order; sentences are neutral so they fit du/ihr and Sie
+_DETAILS = [
+    (("dachterrasse",), "Die Dachterrasse hat es mir direkt angetan."),
+    (("balkon",), "Der Balkon hat es mir direkt angetan."),
+    (("garten",), "Der Garten klingt wunderbar – ich bin gern draußen."),
+    (("terrasse",), "Die Terrasse hat es mir direkt angetan."),
+    (("altbau",), "Altbau mit hohen Decken mag ich sehr, das hat einfach Charme."),
+    (("gemeinsam kochen", "zusammen kochen"), "Gemeinsam kochen klingt genau nach dem WG-Leben, das ich mir wünsche."),
+    (("wg-abend", "spieleabend", "gemeinsame abende"), "Gemeinsame WG-Abende klingen genau nach dem, was ich suche."),
+    (("einbauküche", "neue küche"), "Die Küche klingt super – ich koche sehr gerne."),
+    (("u-bahn", "s-bahn", "tram", "anbindung"), "Die gute Anbindung ist für mich ideal."),
+    (("zentral",), "Die zentrale Lage ist für mich ideal."),
+    (("ruhig",), "Eine ruhige Wohnlage ist mir wichtig, das passt sehr gut."),
+    (("hell",), "Helle Räume sind mir wichtig – das klingt genau richtig."),
+]
+
+
+def _first_name(name: str) -> str:
+    return name.split()[0].strip(",.") if name.split() else ""
+
+
+def greeting(data: ListingData) -> str:
+    """Greeting rules of the prompt: publisher name, else a name from the description, else generic."""
+    wohnung = data.ad_type != "wg"
+    publisher = " ".join(data.publisher_name.split())
+    if publisher and not _COMPANY_RE.search(publisher):
+        title, _, rest = publisher.partition(" ")
+        if title in ("Frau", "Herr") and rest:
+            if wohnung:
+                return f"Sehr geehrte Frau {rest}," if title == "Frau" else f"Sehr geehrter Herr {rest},"
+            return f"Hallo {publisher},"
+        return f"Hallo {_first_name(publisher)},"
+    for match in _NAME_INTRO_RE.finditer(data.full_description):
+        if match.group(1) not in _NOT_NAMES:
+            return f"Hallo {match.group(1)},"
+    return "Hallo," if wohnung else "Hallo liebe WG,"
+
+
+def icebreaker(data: ListingData, persona: Persona) -> str:
+    """One sentence picking up a concrete detail: shared hobby (WG), then ad features, then the title."""
+    text = f"{data.title} {data.full_description}".lower()
+    wg = data.ad_type == "wg"
+    for hobby in re.split(r"[,;/]| und ", persona.hobbies) if wg else []:
+        hobby = hobby.strip()
+        if len(hobby) >= 4 and hobby.lower() in text:
+            return f"Dass {hobby} bei euch eine Rolle spielt, freut mich besonders – das mache ich selbst sehr gerne."
+    for keywords, sentence in _DETAILS:
+        if not wg and "WG" in sentence:
+            continue
+        if any(re.search(rf"\b{re.escape(k)}", text) for k in keywords):
+            return sentence
+    return f"Die Anzeige „{data.title.strip()}“ hat mich direkt angesprochen."
+
+
+def _introduction(persona: Persona, wg: bool) -> list[str]:
+    about = persona.first_name
+    if persona.age:
+        about += f", {persona.age}"
+    if persona.job:
+        about += f", {persona.job}"
+    if persona.from_city:
+        about += f" aus {persona.from_city}"
+    lines = [f"Kurz zu mir: Ich bin {about}."]
+    if wg and persona.hobbies:
+        lines.append(f"Zu meinen Hobbys gehören {persona.hobbies}.")
+    if persona.move_in:
+        lines.append(f"Wunsch-Einzug: {persona.move_in}.")
+    return lines
+
+
+def _resolve_persona(profile: UserProfile | None) -> Persona:
+    profile = profile or load_user_profile_from(PROFILE_PATH)
+    if profile:
+        return profile.persona
+    return Persona(first_name=get_persona_name())
+
+
+def generate_local(data: ListingData, persona: UserProfile | None = None) -> str:
+    """Anschreiben from templates (no network, deterministic for the same input)."""
+    p = _resolve_persona(persona)
+    wg = data.ad_type == "wg"
+    link = data.google_drive or GOOGLE_DRIVE_LINK
+    body = [icebreaker(data, p), *_introduction(p, wg)]
+    if wg:
+        closing = f"Alle Unterlagen findet ihr hier: {link}" if link else "Meine Unterlagen schicke ich euch gerne."
+        closing += "\n\nIch würde mich sehr freuen, euch bei einer Besichtigung kennenzulernen!"
+    else:
+        closing = f"Alle Unterlagen finden Sie hier: {link}" if link else "Meine Unterlagen sende ich Ihnen gerne zu."
+        closing += "\n\nÜber eine Einladung zur Besichtigung würde ich mich sehr freuen."
+    return f"{greeting(data)}\n\n{' '.join(body)}\n\n{closing}"
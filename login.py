@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Standalone login test. Opens WG-Gesucht and logs in.
+With a running browser server (flatscraper browser start) the server's context is checked
+instead of opening a new browser window.
 Usage: python login.py [--platform wggesucht]
 """
 
@@ -10,17 +12,27 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from playwright.sync_api import sync_playwright
-from platforms.wggesucht import login_wggesucht
+
+from browser_server import attach
+from launch import context_options, launch_browser, resolve_launch_profile
+from platforms.wggesucht import login_wggesucht, prepare_context
 from platforms.wggesucht.config import BASE_URL
 
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 900},
-            locale="de-DE",
-        )
+        browser, server = attach(p)
+        if browser and browser.contexts:
+            print(f"Using browser server {server.endpoint} (profile {server.profile})...")
+            page = browser.contexts[0].new_page()
+            login_wggesucht(page)
+            page.close()
+            browser.close()
+            return
+        profile = resolve_launch_profile()
+        browser = launch_browser(p, profile, headless=False)
+        context = browser.new_context(**context_options(profile), locale="de-DE")
+        prepare_context(context)
         page = context.new_page()
         print("Navigating to WG-Gesucht.de...")
         page.goto(BASE_URL, wait_until="domcontentloaded")
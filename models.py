@@ -2,6 +2,8 @@
 Pydantic models for type-safe configuration and data structures.
 """
 
+from datetime import date, datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -18,6 +20,8 @@ class Listing(BaseModel):
     size: str
     age_minutes: int | None
     raw_age_text: str
+    search_url: str = ""
+    card_text: str = ""
 
 
 class ListingDetails(BaseModel):
@@ -35,6 +39,47 @@ class ListingDetails(BaseModel):
     ad_type: str = "wg"
 
 
+class ListingRecord(BaseModel):
+    """Typed listing history row (price/size/date parsed from the free-form strings)."""
+
+    ad_id: str
+    profile: str = ""
+    title: str = ""
+    url: str = ""
+    search_url: str = ""
+    ad_type: str = "wg"
+    address: str = ""
+    price_eur: float | None = None
+    size_m2: float | None = None
+    price_per_m2: float | None = None
+    available_from: date | None = None
+    first_seen: datetime
+    last_seen: datetime
+
+
+class OutboxEntry(BaseModel):
+    """Generated Anschreiben waiting in the durable outbox."""
+
+    profile: str
+    ad_id: str
+    listing_url: str
+    message: str
+    status: str = "pending"  # pending | sending | sent | failed | unknown | dead
+    attempts: int = 0
+    next_attempt_at: datetime | None = None
+    last_error: str = ""
+    created_at: datetime
+    updated_at: datetime
+
+
+class Conversation(BaseModel):
+    """One conversation from the account's inbox (platform-agnostic)."""
+
+    conversation_id: str
+    ad_id: str = ""
+    landlord: str = ""
+
+
 class ListingData(BaseModel):
     """Input for LLM Anschreiben generation."""
 
@@ -64,6 +109,19 @@ class Persona(BaseModel):
     documents: str = "Alle Unterlagen im Google Drive Link"
 
 
+class FilterRules(BaseModel):
+    """Card-level pre-filter rules (evaluated before any detail page is opened)."""
+
+    include_keywords: list[str] = Field(default_factory=list)
+    exclude_keywords: list[str] = Field(default_factory=list)
+    exclude_providers: list[str] = Field(default_factory=list)
+    min_price: float | None = None
+    max_price: float | None = None
+    min_size: float | None = None
+    max_size: float | None = None
+    max_price_per_m2: float | None = None
+
+
 class UserProfile(BaseModel):
     """Full user profile (user_profile.json)."""
 
@@ -71,6 +129,38 @@ class UserProfile(BaseModel):
     persona: Persona
     persona_name: str = "Nutzer"
     search_urls: list[str] = Field(default_factory=list)
+    filters: FilterRules = Field(default_factory=FilterRules)
+
+
+class ScraperProfile(BaseModel):
+    """One account + persona to search for (entry in profiles.json)."""
+
+    name: str
+    email: str = ""
+    password: str = ""
+    user_profile: str = ""
+    search_urls: list[str] = Field(default_factory=list)
+    storage_state: str = ""
+
+
+class LLMProvider(BaseModel):
+    """One OpenAI-compatible chat completions backend (entry in llm_providers.json)."""
+
+    name: str
+    base_url: str  # up to and including the API version, e.g. https://api.groq.com/openai/v1
+    model: str
+    api_key: str = ""
+    api_key_env: str = ""  # read the key from this environment variable instead
+
+
+class BrowserServerInfo(BaseModel):
+    """Running warm browser server (.flatscraper/browser-server.json)."""
+
+    pid: int
+    endpoint: str  # CDP endpoint, e.g. http://127.0.0.1:9333
+    profile: str  # scraper profile whose logged-in context the server holds
+    launch_profile: str = "default"
+    started_at: datetime
 
 
 # --- Setup wizard models ---
@@ -0,0 +1,65 @@
+"""
+Near-duplicate detection for listings: MinHash signatures over shingled detail content,
+banded for LSH so a lookup only compares against ads sharing at least one band bucket.
+"""
+
+import random
+import re
+import zlib
+
+from models import ListingDetails
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: candidates from roughly 50% Jaccard similarity upwards
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(4242)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def shingles(details: ListingDetails, k: int = 3) -> set[int]:
+    """
+    Hashed word k-grams of the description, plus whole-field features for address,
+    publisher and rent (identical landlord data pulls reposts together).
+    """
+    words = _words(details.full_description)
+    grams = {" ".join(words[i:i + k]) for i in range(max(len(words) - k + 1, 1))} if words else set()
+    grams.update(
+        f"{field}:{' '.join(_words(value))}"
+        for field, value in (
+            ("addr", details.address),
+            ("pub", details.publisher_name),
+            ("rent", details.rent),
+        )
+        if value.strip()
+    )
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+
+def minhash(features: set[int]) -> list[int]:
+    """NUM_PERM-slot MinHash signature (universal hashing, 32-bit slots)."""
+    if not features:
+        return [_MAX_HASH] * NUM_PERM
+    return [min(((a * f + b) % _PRIME) & _MAX_HASH for f in features) for a, b in _PERMUTATIONS]
+
+
+def band_keys(signature: list[int]) -> list[str]:
+    """One bucket key per LSH band."""
+    return [
+        format(zlib.crc32(",".join(map(str, signature[b * ROWS:(b + 1) * ROWS])).encode()), "08x")
+        for b in range(BANDS)
+    ]
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
@@ -0,0 +1,59 @@
+"""
+Normalize free-form listing strings ("650 €", "18,5 m²", "01.05.2026") into typed values.
+"""
+
+import re
+from datetime import date
+
+_EURO_RE = re.compile(r"(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d+))?\s*(?:€|EUR|Euro)", re.I)
+_NUMBER_RE = re.compile(r"(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d+))?")
+_AREA_RE = re.compile(r"(\d+)(?:[,.](\d+))?\s*m(?:²|2|\b)", re.I)
+_DATE_RE = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b")
+
+
+def _to_float(integer: str, fraction: str | None) -> float:
+    return float(integer.replace(".", "") + ("." + fraction if fraction else ""))
+
+
+def parse_euro(text: str) -> float | None:
+    """'1.200 €' -> 1200.0, '650,50 €' -> 650.5. Falls back to the first number if no € sign."""
+    if not text:
+        return None
+    m = _EURO_RE.search(text) or _NUMBER_RE.search(text)
+    if not m:
+        return None
+    return _to_float(m.group(1), m.group(2))
+
+
+def parse_area(text: str) -> float | None:
+    """'18 m²' -> 18.0, '18,5 m²' -> 18.5."""
+    if not text:
+        return None
+    m = _AREA_RE.search(text)
+    if not m:
+        return None
+    return float(m.group(1) + ("." + m.group(2) if m.group(2) else ""))
+
+
+def parse_date(text: str) -> date | None:
+    """'01.05.2026' or 'frei ab: 1.5.2026' -> date(2026, 5, 1). None for 'sofort' etc."""
+    if not text:
+        return None
+    m = _DATE_RE.search(text)
+    if not m:
+        return None
+    try:
+        return date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+    except ValueError:
+        return None
+
+
+def price_per_m2(price_eur: float | None, size_m2: float | None) -> float | None:
+    if price_eur is None or not size_m2:
+        return None
+    return round(price_eur / size_m2, 2)
+
+
+def ad_type_from_url(url: str) -> str:
+    """WG-Gesucht detail URLs start with wg-zimmer-in-... for rooms; everything else is a flat."""
+    return "wg" if "wg-zimmer" in url.lower() else "wohnung"
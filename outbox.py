@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Outbox sender – delivers generated Anschreiben from the durable outbox.
+Usage:
+  flatscraper outbox                       (list entries)
+  flatscraper outbox --status failed       (filter by status)
+  flatscraper outbox send [--profile NAME] [--interval 10] [--visible]
+  flatscraper outbox requeue PROFILE AD_ID (release an 'unknown'/'dead' entry for sending)
+"""
+
+import argparse
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from breaker import CircuitOpenError, guard_for
+from models import OutboxEntry
+from platforms.base import SEND_UNCONFIRMED
+from sessions import ProfileSession
+from store import StateStore
+from timing import Deadline, StageTimer
+
+console = Console()
+
+
+def deliver(
+    platform,
+    session: ProfileSession,
+    state: StateStore,
+    entry: OutboxEntry,
+    timer: StageTimer | None = None,
+) -> str:
+    """
+    Send one outbox entry. Returns the resulting status: "sent", "failed", "dead",
+    "unknown" if the send broke off midway (it may have gone out), or "skipped" if another
+    sender took it or the ad was already contacted. Raises CircuitOpenError while the site's
+    circuit is open (entry untouched, or scheduled for a retry if it opened mid-send).
+    """
+    outbox = state.outbox
+    if state.dedup.is_sent(entry.profile, entry.ad_id):
+        outbox.mark_sent(entry.profile, entry.ad_id)
+        return "skipped"
+    guard_for(entry.listing_url).check()
+    if not outbox.begin_send(entry.profile, entry.ad_id):
+        return "skipped"
+    timer = timer or StageTimer()
+    try:
+        with timer.stage("send"), session.pages.lease("message") as page:
+            result = platform.send_message(page, entry.listing_url, entry.message)
+    except CircuitOpenError as e:
+        # Refused before the request went out
+        outbox.mark_failed(entry.profile, entry.ad_id, str(e))
+        raise
+    except Exception as e:
+        # Timeouts, deadline, crashes of the page: the message may already be on the site
+        return outbox.mark_unknown(entry.profile, entry.ad_id, str(e))
+    if result == SEND_UNCONFIRMED:
+        return outbox.mark_unknown(entry.profile, entry.ad_id, "Gesendet, aber nicht bestätigt")
+    if not result:
+        return outbox.mark_failed(entry.profile, entry.ad_id, "Senden fehlgeschlagen")
+    outbox.mark_sent(entry.profile, entry.ad_id)
+    state.dedup.mark_sent(entry.profile, entry.ad_id)
+    state.freshness.mark(entry.profile, entry.ad_id, "sent")
+    return "sent"
+
+
+def drain(
+    platform,
+    sessions: list[ProfileSession],
+    state: StateStore,
+    timer: StageTimer | None = None,
+    interval: float = 0.0,
+    deadline: Deadline | None = None,
+) -> dict[str, int]:
+    """
+    Send every due entry for the given sessions, waiting interval seconds between sends.
+    Stops once deadline has passed; the rest stays due for the next drain.
+    """
+    counts: dict[str, int] = {}
+    stale = state.outbox.recover_stale()
+    if stale:
+        console.print(f"[yellow]{stale} unterbrochene Sendungen als 'unknown' markiert (prüfen, dann requeue)[/yellow]")
+    for session in sessions:
+        for entry in state.outbox.due(session.name):
+            if deadline and deadline.expired:
+                console.print("[yellow]Zeitbudget aufgebraucht – Rest bleibt in der Outbox[/yellow]")
+                return counts
+            if interval and counts.get("sent"):
+                time.sleep(interval)
+            try:
+                status = deliver(platform, session, state, entry, timer)
+            except CircuitOpenError as e:
+                console.print(f"[yellow]{e} – Senden abgebrochen, Rest bleibt in der Outbox[/yellow]")
+                return counts
+            counts[status] = counts.get(status, 0) + 1
+            style = {"sent": "green", "skipped": "dim"}.get(status, "red")
+            console.print(f"  [{style}]{session.name} · {entry.ad_id}: {status}[/{style}]")
+    return counts
+
+
+def _print_entries(entries: list[OutboxEntry]) -> None:
+    table = Table(title=f"Outbox ({len(entries)})")
+    for col in ("Profil", "ID", "Status", "Versuche", "Nächster Versuch", "Fehler", "Aktualisiert"):
+        table.add_column(col)
+    for e in entries:
+        table.add_row(
+            e.profile,
+            e.ad_id,
+            e.status,
+            str(e.attempts),
+            e.next_attempt_at.strftime("%H:%M:%S") if e.next_attempt_at and e.status == "failed" else "",
+            e.last_error[:40],
+            e.updated_at.strftime("%Y-%m-%d %H:%M"),
+        )
+    console.print(table)
+
+
+def _send(args: argparse.Namespace) -> None:
+    from playwright.sync_api import sync_playwright
+
+    from config import get_profiles
+    from browser_server import attach_or_launch, server_context
+    from launch import resolve_launch_profile
+    from platforms import PLATFORMS
+    from sessions import close_session, open_session, save_session
+
+    platform = PLATFORMS["wggesucht"]
+    try:
+        profiles = [p for p in get_profiles() if not args.profile or p.name == args.profile]
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    if not profiles:
+        console.print(f"[red]Profil nicht gefunden: {args.profile}[/red]")
+        return
+    state = StateStore()
+    try:
+        with sync_playwright() as p:
+            browser_profile = resolve_launch_profile()
+            browser, server = attach_or_launch(p, browser_profile, headless=not args.visible, use_server=not args.visible)
+            sessions = []
+            for profile in profiles:
+                if not state.outbox.due(profile.name, limit=1):
+                    continue
+                session = open_session(
+                    browser, profile, platform=platform, launch_profile=browser_profile,
+                    context=server_context(browser, server, profile.name),
+                )
+                with session.pages.lease("search") as page:
+                    platform.login(page, email=profile.email, password=profile.password)
+                    session.pages.warm(page.url)
+                save_session(session)
+                sessions.append(session)
+            counts = drain(platform, sessions, state, interval=args.interval)
+            for session in sessions:
+                close_session(session)
+            browser.close()
+    finally:
+        state.close()
+    summary = ", ".join(f"{k}: {v}" for k, v in sorted(counts.items())) or "nichts fällig"
+    console.print(f"[bold]Outbox geleert[/bold] – {summary}")
+
+
+def run_outbox(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="flatscraper outbox", description="Outbox anzeigen und senden")
+    parser.add_argument("action", nargs="?", choices=["list", "send", "requeue"], default="list")
+    parser.add_argument("target", nargs="*", help="requeue: PROFIL AD_ID")
+    parser.add_argument("--status", choices=["pending", "sending", "sent", "failed", "unknown", "dead"])
+    parser.add_argument("--profile")
+    parser.add_argument("--interval", type=float, default=0.0, help="Sekunden zwischen zwei Sendungen")
+    parser.add_argument("--visible", action="store_true")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.action == "send":
+        _send(args)
+        return
+    state = StateStore()
+    try:
+        if args.action == "requeue":
+            if len(args.target) != 2:
+                parser.error("requeue erwartet PROFIL AD_ID")
+            if state.outbox.requeue(*args.target):
+                console.print(f"[green]{args.target[1]} wieder in der Warteschlange[/green]")
+            else:
+                console.print(f"[yellow]{args.target[1]}: kein Eintrag mit Status unknown/dead/failed[/yellow]")
+            return
+        _print_entries(state.outbox.entries(status=args.status, limit=args.limit))
+    finally:
+        state.close()
@@ -0,0 +1,100 @@
+"""
+Page pool: dedicated, pre-warmed tabs per role (search, detail, message) on one browser context.
+Roles never share a tab, so modals or scroll state from one step cannot leak into the next,
+and tabs are health-checked and recycled after a number of uses to keep memory in check.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Page
+
+ROLES = ("search", "detail", "message")
+MAX_USES = 50
+MAX_HEAP_MB = 256
+
+_HEAP_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class PagePool:
+    """One tab per role, leased with `with pool.lease("detail") as page:`."""
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        roles: tuple[str, ...] = ROLES,
+        max_uses: int = MAX_USES,
+        max_heap_mb: int = MAX_HEAP_MB,
+    ):
+        self.context = context
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.recycled: Counter = Counter()
+        self._pages: dict[str, Page] = {role: context.new_page() for role in roles}
+        self._uses: Counter = Counter()
+        self._leased: set[str] = set()
+        self._warm_url: str | None = None
+
+    def warm(self, url: str) -> None:
+        """Open the site's origin in every idle tab, so later steps start on a live, same-origin page."""
+        parts = urlsplit(url)
+        if not parts.scheme.startswith("http"):
+            return
+        self._warm_url = f"{parts.scheme}://{parts.netloc}/"
+        for role, page in self._pages.items():
+            if page.url == "about:blank" and role not in self._leased:
+                self._goto_warm(page)
+
+    def _goto_warm(self, page: Page) -> None:
+        try:
+            page.goto(self._warm_url, wait_until="domcontentloaded", timeout=15000)
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self, role: str) -> Iterator[Page]:
+        if role not in self._pages:
+            raise KeyError(f"Unknown page role: {role}")
+        if role in self._leased:
+            raise RuntimeError(f"Page '{role}' is already leased")
+        if not self._healthy(self._pages[role]):
+            self._recycle(role)
+        self._leased.add(role)
+        try:
+            yield self._pages[role]
+        finally:
+            self._leased.discard(role)
+            self._uses[role] += 1
+            if self._uses[role] >= self.max_uses or not self._healthy(self._pages[role]):
+                self._recycle(role)
+
+    def _healthy(self, page: Page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            heap = page.evaluate(_HEAP_JS)
+        except Exception:
+            return False
+        return not self.max_heap_mb or heap < self.max_heap_mb * 1024 * 1024
+
+    def _recycle(self, role: str) -> None:
+        old = self._pages[role]
+        try:
+            old.close()
+        except Exception:
+            pass
+        page = self.context.new_page()
+        self._pages[role] = page
+        self._uses[role] = 0
+        self.recycled[role] += 1
+        if self._warm_url:
+            self._goto_warm(page)
+
+    def close(self) -> None:
+        for page in self._pages.values():
+            try:
+                page.close()
+            except Exception:
+                pass
@@ -1,10 +1,20 @@
 """Abstract base for flat search platforms."""
 
 from abc import ABC, abstractmethod
+from typing import Callable
 
-from playwright.sync_api import Page
+from playwright.sync_api import BrowserContext, Page
 
-from models import Listing, ListingDetails
+from models import Conversation, Listing, ListingDetails
+from prefilter import CompiledRules
+
+# send_message result: the message was submitted but the site didn't confirm it. It may have
+# gone out, so callers must neither retry nor fall back to another send path.
+SEND_UNCONFIRMED = "posted"
+
+
+class EmptyInboxError(RuntimeError):
+    """The inbox's first page showed no conversation: an empty account or changed page markup."""
 
 
 # Re-export for backward compatibility
@@ -20,22 +30,67 @@ class Platform(ABC):
         """Platform identifier."""
         pass
 
+    def prepare_context(self, context: BrowserContext) -> None:
+        """
+        Set up a fresh browser context before its first page loads (e.g. saved consent
+        cookies, init scripts that suppress overlays). Default: nothing to do.
+        """
+
     @abstractmethod
-    def login(self, page: Page) -> None:
-        """Log in to the platform."""
+    def login(self, page: Page, email: str | None = None, password: str | None = None) -> None:
+        """Log in to the platform. Credentials default to the .env account."""
         pass
 
     @abstractmethod
-    def run_search(self, page: Page, include_all: bool = False) -> list[Listing]:
-        """Run search and return listings."""
+    def run_search(
+        self,
+        page: Page,
+        include_all: bool = False,
+        search_urls: list[str] | None = None,
+        prefilter: CompiledRules | None = None,
+    ) -> list[Listing]:
+        """
+        Run search and return listings. search_urls defaults to the profile's URLs.
+        prefilter (card-level rules) drops unwanted cards before any detail page load.
+        """
         pass
 
+    def probe(self, page: Page, search_urls: list[str] | None = None) -> dict[str, list[str] | None] | None:
+        """
+        Cheap change probe: top ad_ids per search URL without rendering the search pages
+        (None per URL if that probe failed). None overall if the platform has no probe.
+        """
+        return None
+
+    def sync_inbox(self, page: Page, known: Callable[[list[str]], set[str]]) -> list[Conversation] | None:
+        """
+        Conversations from the account's inbox that aren't stored yet (known(ids) returns the
+        stored ones), newest first, without navigating page. None if the platform has no inbox sync.
+        Raises EmptyInboxError if no conversation is recognized at all.
+        """
+        return None
+
+    def create_watcher(
+        self,
+        page: Page,
+        include_all: bool = False,
+        search_urls: list[str] | None = None,
+        prefilter: CompiledRules | None = None,
+    ):
+        """
+        Live watcher for watch mode: an object with prime() (initial listings), poll() (only
+        listings that appeared since) and forget(ad_ids). None = no live watcher; watch mode
+        then runs a full search every interval.
+        """
+        return None
+
     @abstractmethod
     def extract_details(self, page: Page, url: str) -> ListingDetails | None:
         """Extract listing details from a detail page."""
         pass
 
     @abstractmethod
-    def send_message(self, page: Page, listing_url: str, message_text: str) -> bool:
-        """Send contact message for a listing."""
+    def send_message(self, page: Page, listing_url: str, message_text: str) -> bool | str:
+        """Send contact message for a listing: True sent, False not sent, SEND_UNCONFIRMED unclear."""
         pass
+
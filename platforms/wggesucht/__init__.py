@@ -5,6 +5,7 @@ from platforms.wggesucht.config import PLATFORM_NAME
 from platforms.wggesucht.search import run_search
 from platforms.wggesucht.extractor import extract_listing_details
 from platforms.wggesucht.login import login_wggesucht, accept_cookie_banner
+from platforms.wggesucht.consent import prepare_context
 from platforms.wggesucht.messenger import send_anschreiben
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "ListingDetails",
     "login_wggesucht",
     "accept_cookie_banner",
+    "prepare_context",
     "send_anschreiben",
 ]
@@ -0,0 +1,94 @@
+"""
+WG-Gesucht consent and overlays: the CMP consent cookies are kept once the banner was
+accepted and injected into every new context, and an init script hides the known overlays
+(cookie CMP, #sec_advice, login/register prompts) before the site's own scripts run, so no
+page type has to find and click them away.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext
+
+from config import STATE_DIR
+from platforms.wggesucht.config import BASE_URL
+
+CONSENT_PATH = STATE_DIR / "wggesucht.consent.json"
+
+_CONSENT_COOKIE_RE = re.compile(r"^(__cmp|euconsent)|consent", re.I)
+
+# Overlays hidden by CSS from document start
+OVERLAY_SELECTORS = ("#cmpbox", "#cmpbox2", ".cmpboxBG", "#cmpwrapper", "#sec_advice")
+# The site's "log in / register" prompts reuse the login modal: hidden unless login.py opened it
+# (LOGIN_FLAG set in sessionStorage, so it survives the reloads of the login and 2FA steps)
+LOGIN_PROMPT_SELECTORS = ("#login_modal", ".modal-backdrop")
+LOGIN_FLAG = "flatscraper-login"
+
+_SUPPRESS_OVERLAYS_JS = """
+(([selectors, prompts, flag]) => {
+    const gated = prompts.map(sel => `html:not(.${flag}) ${sel}`);
+    const css = [...selectors, ...gated].join(', ')
+        + ' { display: none !important; visibility: hidden !important; }'
+        + ' body.modal-open { overflow: auto !important; }';
+    const install = () => {
+        try {
+            if (sessionStorage.getItem(flag)) document.documentElement.classList.add(flag);
+        } catch (e) {}
+        if (document.getElementById('flatscraper-overlays')) return;
+        const style = document.createElement('style');
+        style.id = 'flatscraper-overlays';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    install();
+    document.addEventListener('DOMContentLoaded', install);
+})(%s);
+"""
+
+
+def is_consent_cookie(name: str) -> bool:
+    return bool(_CONSENT_COOKIE_RE.search(name))
+
+
+def has_consent(context: BrowserContext) -> bool:
+    """True if the context already carries the site's consent cookies (no banner to expect)."""
+    try:
+        return any(is_consent_cookie(c["name"]) for c in context.cookies(BASE_URL))
+    except Exception:
+        return False
+
+
+def save_consent(context: BrowserContext, path: Path = CONSENT_PATH) -> int:
+    """Store the context's consent cookies for future contexts; returns how many were saved."""
+    return write_consent(context.cookies(BASE_URL), path)
+
+
+def write_consent(cookies: list[dict], path: Path = CONSENT_PATH) -> int:
+    cookies = [c for c in cookies if is_consent_cookie(c["name"])]
+    if cookies:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cookies, indent=2), encoding="utf-8")
+    return len(cookies)
+
+
+def load_consent(path: Path = CONSENT_PATH) -> list[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def overlay_script() -> str:
+    return _SUPPRESS_OVERLAYS_JS % json.dumps([list(OVERLAY_SELECTORS), list(LOGIN_PROMPT_SELECTORS), LOGIN_FLAG])
+
+
+def prepare_context(context: BrowserContext, path: Path = CONSENT_PATH) -> None:
+    """Inject saved consent cookies and install the overlay-suppressing init script."""
+    cookies = load_consent(path)
+    if cookies:
+        try:
+            context.add_cookies(cookies)
+        except Exception:
+            pass
+    context.add_init_script(script=overlay_script())
@@ -0,0 +1,85 @@
+"""
+Inbox sync for WG-Gesucht: reads the account's conversation list with plain HTTP GETs through
+the browser context (session cookies, no rendering), newest first, and stops at the first
+page without unknown conversations. Covers ads messaged from other devices, too.
+"""
+
+import html
+import re
+from typing import Callable
+
+from playwright.sync_api import Page
+
+from models import Conversation
+from platforms.base import EmptyInboxError
+from platforms.wggesucht.config import BASE_URL
+
+INBOX_URL = BASE_URL + "nachrichten.html"
+MAX_PAGES = 25
+
+_CONVERSATION_ID_RE = re.compile(
+    r'data-conversation-id="(\d+)"|[?&](?:nachrichten-id|conversation_id|conv_id)=(\d+)'
+)
+_AD_ID_RE = re.compile(r'data-ad-id="(\d+)"|[?&]ad_id=(\d+)|href="[^"]*?[./](\d{5,})\.html')
+_PARTNER_RE = re.compile(
+    r'class="[^"]*(?:partner_name|user_name|conversation_name|conversation_partner)[^"]*"[^>]*>\s*([^<]+?)\s*<'
+)
+
+
+def _first(match: re.Match | None) -> str:
+    return next((g for g in match.groups() if g), "") if match else ""
+
+
+def parse_conversations(page_html: str) -> list[Conversation]:
+    """Conversations in page order: id, the ad it belongs to and the other party's name."""
+    starts: list[tuple[int, str]] = []
+    seen: set[str] = set()
+    for m in _CONVERSATION_ID_RE.finditer(page_html):
+        conversation_id = _first(m)
+        if conversation_id not in seen:
+            seen.add(conversation_id)
+            starts.append((m.start(), conversation_id))
+    conversations = []
+    for i, (start, conversation_id) in enumerate(starts):
+        # Each conversation's markup runs from its first id mention to the next conversation's
+        block = page_html[start:starts[i + 1][0] if i + 1 < len(starts) else len(page_html)]
+        conversations.append(Conversation(
+            conversation_id=conversation_id,
+            ad_id=_first(_AD_ID_RE.search(block)),
+            landlord=html.unescape(_first(_PARTNER_RE.search(block))),
+        ))
+    return conversations
+
+
+def _page_url(number: int) -> str:
+    return INBOX_URL if number == 1 else f"{INBOX_URL}?page={number}"
+
+
+def sync_inbox(
+    page: Page, known: Callable[[list[str]], set[str]], max_pages: int = MAX_PAGES
+) -> list[Conversation]:
+    """
+    Conversations not stored yet. known(ids) returns the ids that are; paging stops after the
+    first page with nothing new, so a routine sync costs one request. Raises RuntimeError if a
+    page can't be read, EmptyInboxError if the first page shows no conversation at all (nothing
+    is returned, so the sync isn't recorded and the next one starts over).
+    """
+    new: list[Conversation] = []
+    for number in range(1, max_pages + 1):
+        resp = page.context.request.get(_page_url(number), timeout=15000, max_redirects=3)
+        if not resp.ok:
+            raise RuntimeError(f"Postfach Seite {number}: HTTP {resp.status}")
+        conversations = parse_conversations(resp.text())
+        if number == 1 and not conversations:
+            # Also a parser that no longer matches the site's markup: never report that as synced
+            if "Abmelden" not in resp.text():
+                raise RuntimeError("Postfach nicht lesbar (nicht angemeldet?)")
+            raise EmptyInboxError("keine Unterhaltungen erkannt (leeres Postfach oder geändertes Seitenlayout)")
+        stored = known([c.conversation_id for c in conversations])
+        fresh = [c for c in conversations if c.conversation_id not in stored]
+        new.extend(fresh)
+        # Sorted by last activity, so a reply can lift an old conversation above a new one:
+        # only a page with nothing new means the rest is stored too
+        if not fresh:
+            break
+    return new
@@ -7,54 +7,94 @@ import time
 
 from playwright.sync_api import Page
 
+from breaker import guard_for
 from config import EMAIL, PASSWORD
 from platforms.wggesucht.config import BASE_URL
+from platforms.wggesucht.consent import LOGIN_FLAG, has_consent, save_consent
+
+
+# Clicks the first consent accept control in one round trip; DOM clicks also reach a banner
+# the overlay init script has hidden, so the consent cookies still get set
+_ACCEPT_COOKIES_JS = """
+() => {
+    const byText = (sel, re) => [...document.querySelectorAll(sel)].find(el => re.test(el.textContent || ''));
+    const target = byText('button', /Alle akzeptieren/i)
+        || byText('button', /Akzeptieren/i)
+        || byText('a', /Alle akzeptieren/i)
+        || document.querySelector('[class*="accept"], [id*="accept"], [class*="cmp"] button, [class*="consent"] button');
+    if (!target) return false;
+    target.click();
+    return true;
+}
+"""
+
+# Also lifts the overlay script's suppression of the login modal (see consent.LOGIN_PROMPT_SELECTORS)
+_OPEN_LOGIN_MODAL_JS = """
+    (function() {
+        sessionStorage.setItem('%(flag)s', '1');
+        document.documentElement.classList.add('%(flag)s');
+        if (typeof fireLoginOrRegisterModalRequest === 'function') {
+            fireLoginOrRegisterModalRequest('sign_in');
+        } else if (typeof $ !== 'undefined') {
+            $('#login_modal').modal('show');
+        }
+    })();
+""" % {"flag": LOGIN_FLAG}
+_END_LOGIN_JS = f"sessionStorage.removeItem('{LOGIN_FLAG}'); document.documentElement.classList.remove('{LOGIN_FLAG}')"
+
+_LOGIN_ERROR_TEXTS = ("text=Falsche E-Mail-Adresse", "text=Unbekannte E-Mail-Adresse")
 
 
 def accept_cookie_banner(page: Page) -> bool:
-    """Dismiss cookie consent banner if present."""
-    cookie_selectors = [
-        'button:has-text("Alle akzeptieren")',
-        'button:has-text("Akzeptieren")',
-        'a:has-text("Alle akzeptieren")',
-        '[class*="accept"]',
-        '[id*="accept"]',
-        '[class*="cmp"] button',
-        '[class*="consent"] button',
-    ]
-    for selector in cookie_selectors:
-        try:
-            btn = page.locator(selector).first
-            if btn.is_visible(timeout=1000):
-                btn.click()
-                print("Cookie banner accepted.")
-                time.sleep(0.5)
-                return True
-        except Exception:
-            continue
-    return False
+    """Accept the cookie consent banner if present and keep its cookies for future contexts."""
+    try:
+        if not page.evaluate(_ACCEPT_COOKIES_JS):
+            return False
+    except Exception:
+        return False
+    print("Cookie banner accepted.")
+    time.sleep(0.5)
+    save_consent(page.context)
+    return True
+
 
+def _is_logged_in(page: Page) -> bool:
+    """True if the page shows the logout link (session restored from storage state)."""
+    try:
+        return page.locator("a:has-text(\"Abmelden\")").count() > 0
+    except Exception:
+        return False
 
-def login_wggesucht(page: Page) -> None:
-    """Log in to WG-Gesucht."""
-    page.goto(BASE_URL, wait_until="domcontentloaded")
+
+def login_wggesucht(page: Page, email: str | None = None, password: str | None = None) -> None:
+    """
+    Log in to WG-Gesucht. email/password default to FLATSCRAPER_EMAIL/PASSWORD.
+    Skips the login form when the context already carries a valid session.
+    """
+    guard_for(BASE_URL).navigate(page, BASE_URL, "login", 30000)
     time.sleep(2)
-    accept_cookie_banner(page)
-    time.sleep(0.5)
+    if not has_consent(page.context):
+        accept_cookie_banner(page)
+    if _is_logged_in(page):
+        print("[OK] Session restored")
+        return
+
+    try:
+        _submit_login(page, email, password)
+    finally:
+        try:
+            page.evaluate(_END_LOGIN_JS)
+        except Exception:
+            pass
+    print("[OK] Logged in")
 
+
+def _submit_login(page: Page, email: str | None, password: str | None) -> None:
     mein_konto = page.locator('a:has-text("Mein Konto"), button:has-text("Mein Konto")').first
     mein_konto.click(timeout=3000)
     time.sleep(1)
 
-    page.evaluate("""
-        (function() {
-            if (typeof fireLoginOrRegisterModalRequest === 'function') {
-                fireLoginOrRegisterModalRequest('sign_in');
-            } else if (typeof $ !== 'undefined') {
-                $('#login_modal').modal('show');
-            }
-        })();
-    """)
+    page.evaluate(_OPEN_LOGIN_MODAL_JS)
     time.sleep(1.5)
     if not page.locator("#login_email_username").is_visible():
         page.locator('a[onclick*="sign_in"]').first.click(force=True, timeout=2000)
@@ -63,8 +103,8 @@ def login_wggesucht(page: Page) -> None:
     time.sleep(0.5)
 
     page.locator("#login_email_username").wait_for(state="visible", timeout=5000)
-    page.locator("#login_email_username").fill(EMAIL)
-    page.locator("#login_password").fill(PASSWORD)
+    page.locator("#login_email_username").fill(email or EMAIL)
+    page.locator("#login_password").fill(password or PASSWORD)
     page.locator("#auto_login").check()
     page.locator("#login_submit").click()
     time.sleep(3)
@@ -74,7 +114,6 @@ def login_wggesucht(page: Page) -> None:
         input()
         time.sleep(2)
     if not (page.locator("text=Mein Konto").first.is_visible() or page.locator("text=Abmelden").first.is_visible()):
-        if page.locator("text=Falsche E-Mail-Adresse").first.is_visible() or page.locator("text=Unbekannte E-Mail-Adresse").first.is_visible():
+        if any(page.locator(text).first.is_visible() for text in _LOGIN_ERROR_TEXTS):
             raise RuntimeError("Login failed: Invalid email or password")
         raise RuntimeError("Login failed")
-    print("[OK] Logged in")
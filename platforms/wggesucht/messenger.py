@@ -1,63 +1,175 @@
 #!/usr/bin/env python3
 """
 Send WG Anschreiben via WG-Gesucht message form.
+Fast path: submit the form over HTTP from inside the page (session cookies + CSRF token of the
+form); slow path: fill and click the form in the UI.
 """
 
+import re
 import time
 
 from playwright.sync_api import Page
 
+from breaker import guard_for
+from platforms.base import SEND_UNCONFIRMED
+
 
 def _message_url_from_listing_url(listing_url: str) -> str:
     """Build message page URL from listing URL."""
     return listing_url.replace("wg-gesucht.de/", "wg-gesucht.de/nachricht-senden/")
 
 
-def send_anschreiben(page: Page, listing_url: str, message_text: str) -> bool:
+# Fetches the message form, copies its fields (hidden CSRF token included), fills the message
+# and submits it with fetch(): same origin, so the browser adds the session cookies itself.
+# Once the POST has started, errors report posted: true with status 0 (it may have gone out).
+_DIRECT_SEND_JS = """
+async ([messageUrl, text]) => {
+    let resp;
+    try {
+        resp = await fetch(messageUrl, {credentials: 'include'});
+    } catch (e) {
+        return {posted: false, reason: `Formular nicht geladen: ${e}`};
+    }
+    if (!resp.ok) return {posted: false, reason: `Formular HTTP ${resp.status}`};
+    const doc = new DOMParser().parseFromString(await resp.text(), 'text/html');
+    const textarea = doc.querySelector('textarea[name="message"], form textarea[name]');
+    const form = textarea && textarea.closest('form');
+    if (!form) return {posted: false, reason: 'kein Nachrichtenformular'};
+    const data = new URLSearchParams();
+    for (const el of form.querySelectorAll('input[name], select[name], textarea[name]')) {
+        if (['submit', 'button', 'file'].includes(el.type)) continue;
+        if (['checkbox', 'radio'].includes(el.type) && !el.checked) continue;
+        data.append(el.name, el.value);
+    }
+    data.set(textarea.name, text);
+    const action = new URL(form.getAttribute('action') || messageUrl, messageUrl).href;
+    try {
+        const post = await fetch(action, {
+            method: 'POST',
+            body: data,
+            credentials: 'include',
+            headers: {'Content-Type': 'application/x-www-form-urlencoded'},
+        });
+        return {posted: true, status: post.status, body: (await post.text()).substring(0, 50000)};
+    } catch (e) {
+        return {posted: true, status: 0, body: ''};
+    }
+}
+"""
+
+_SUCCESS_RE = re.compile(r"erfolgreich (?:gesendet|verschickt)|Nachricht wurde (?:gesendet|verschickt)", re.I)
+_CONTACTED_JS = """
+async (url) => {
+    const resp = await fetch(url, {credentials: 'include'});
+    return resp.ok && (await resp.text()).includes('Unterhaltung ansehen');
+}
+"""
+
+
+_TEXTAREA_SELECTOR = (
+    'textarea[name="message"], textarea[id*="message"], '
+    'textarea[placeholder*="Nachricht"], textarea[placeholder*="Message"], '
+    'form textarea'
+)
+# The overlay init script (consent.py) already hides #sec_advice; this also closes it for
+# contexts without the script
+_HIDE_SEC_ADVICE_JS = """
+    const m = document.getElementById('sec_advice');
+    if (m) {
+        if (typeof $ !== 'undefined') $('#sec_advice').modal('hide');
+        else m.style.display = 'none';
+    }
+"""
+_SEND_BUTTON_SELECTOR = (
+    'button.conversation_send_button, button:has-text("Senden"), '
+    'input[type="submit"][value*="Senden"]'
+)
+
+
+def _direct_send_result(result: dict | None) -> bool | str | None:
+    """
+    Interpret _DIRECT_SEND_JS: True confirmed, False rejected (non-2xx answer), SEND_UNCONFIRMED
+    posted without confirmation or without an answer, None nothing posted.
+    """
+    if not result or not result.get("posted"):
+        return None
+    status = result["status"]
+    if status and not 200 <= status < 300:
+        return False
+    if status and _SUCCESS_RE.search(result["body"]):
+        return True
+    return SEND_UNCONFIRMED
+
+
+def _confirm_contacted(page: Page, listing_url: str) -> bool | str:
+    """After an unconfirmed post: the listing shows the conversation once a message went through."""
+    try:
+        if page.evaluate(_CONTACTED_JS, listing_url):
+            return True
+    except Exception:
+        pass
+    return SEND_UNCONFIRMED
+
+
+def _send_direct(page: Page, listing_url: str, message_text: str) -> bool | str | None:
     """
-    Navigate to message page, fill the Anschreiben, and send.
-    Returns True if sent successfully, False otherwise.
+    Submit the message form over HTTP. True if the server confirmed the message, False if it
+    rejected the post, SEND_UNCONFIRMED if the form was posted without confirmation (it may
+    have gone out), None if nothing was posted (use the UI path).
     """
+    if "wg-gesucht.de" not in page.url:
+        return None  # fetch() needs the site's origin for cookies
     message_url = _message_url_from_listing_url(listing_url)
-    page.goto(message_url, wait_until="domcontentloaded", timeout=15000)
+    try:
+        result = page.evaluate(_DIRECT_SEND_JS, [message_url, message_text])
+    except Exception:
+        # The script may have died after its POST went out (navigation, timeout)
+        return _confirm_contacted(page, listing_url)
+    outcome = _direct_send_result(result)
+    if outcome != SEND_UNCONFIRMED:
+        return outcome
+    return _confirm_contacted(page, listing_url)
+
+
+def send_anschreiben(page: Page, listing_url: str, message_text: str) -> bool | str:
+    """
+    Send the Anschreiben by direct form post, falling back to the UI form only if nothing was
+    posted. Returns True if sent, False if not, SEND_UNCONFIRMED if a post went out unconfirmed.
+    """
+    # CircuitOpenError: don't post into a degraded site; a half-open trial is left to a page load
+    guard_for(listing_url).check(claim=False)
+    outcome = _send_direct(page, listing_url, message_text)
+    if outcome is not None:
+        return outcome
+    return _send_via_form(page, listing_url, message_text)
+
+
+def _send_via_form(page: Page, listing_url: str, message_text: str) -> bool | str:
+    """
+    Navigate to message page, fill the Anschreiben, and send. False if the form couldn't be
+    submitted; after the click, True only with a success marker, else SEND_UNCONFIRMED.
+    """
+    message_url = _message_url_from_listing_url(listing_url)
+    guard_for(message_url).navigate(page, message_url, "message", 15000)
     time.sleep(2)
 
     try:
-        textarea = page.locator(
-            'textarea[name="message"], textarea[id*="message"], '
-            'textarea[placeholder*="Nachricht"], textarea[placeholder*="Message"], '
-            'form textarea'
-        ).first
+        textarea = page.locator(_TEXTAREA_SELECTOR).first
         textarea.wait_for(state="visible", timeout=8000)
         textarea.fill(message_text)
-        time.sleep(0.5)
-
-        try:
-            modal_btn = page.locator("#sec_advice button, #sec_advice .modal-footer button").first
-            if modal_btn.is_visible(timeout=1000):
-                modal_btn.click(timeout=3000)
-                time.sleep(0.8)
-        except Exception:
-            pass
-
         try:
-            page.evaluate("""
-                const m = document.getElementById('sec_advice');
-                if (m) {
-                    if (typeof $ !== 'undefined') $('#sec_advice').modal('hide');
-                    else m.style.display = 'none';
-                }
-            """)
-            time.sleep(0.5)
+            page.evaluate(_HIDE_SEC_ADVICE_JS)
         except Exception:
             pass
 
-        send_btn = page.locator(
-            'button.conversation_send_button, button:has-text("Senden"), '
-            'input[type="submit"][value*="Senden"]'
-        ).first
+        send_btn = page.locator(_SEND_BUTTON_SELECTOR).first
         send_btn.click(timeout=5000)
-        time.sleep(2)
-        return True
     except Exception:
         return False
+    time.sleep(2)
+    try:
+        if _SUCCESS_RE.search(page.content()):
+            return True
+    except Exception:
+        pass
+    return _confirm_contacted(page, listing_url)
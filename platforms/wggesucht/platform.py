@@ -1,12 +1,20 @@
 """WG-Gesucht platform implementation of the Platform ABC."""
 
+from typing import Callable
+
+from models import Conversation
 from platforms.base import Platform, Listing, ListingDetails
+from prefilter import CompiledRules
 from platforms.wggesucht.login import login_wggesucht
 from platforms.wggesucht.search import run_search
 from platforms.wggesucht.extractor import extract_listing_details
 from platforms.wggesucht.messenger import send_anschreiben
+from platforms.wggesucht.consent import prepare_context
+from platforms.wggesucht.probe import probe_search
+from platforms.wggesucht.inbox import sync_inbox
+from platforms.wggesucht.watch import SearchWatcher
 
-from playwright.sync_api import Page
+from playwright.sync_api import BrowserContext, Page
 
 
 class WgGesuchtPlatform(Platform):
@@ -16,14 +24,41 @@ class WgGesuchtPlatform(Platform):
     def name(self) -> str:
         return "wggesucht"
 
-    def login(self, page: Page) -> None:
-        login_wggesucht(page)
+    def prepare_context(self, context: BrowserContext) -> None:
+        prepare_context(context)
+
+    def login(self, page: Page, email: str | None = None, password: str | None = None) -> None:
+        login_wggesucht(page, email=email, password=password)
+
+    def run_search(
+        self,
+        page: Page,
+        include_all: bool = False,
+        search_urls: list[str] | None = None,
+        prefilter: CompiledRules | None = None,
+    ) -> list[Listing]:
+        return run_search(
+            page, include_all_for_debug=include_all, search_urls=search_urls, prefilter=prefilter
+        )
 
-    def run_search(self, page: Page, include_all: bool = False) -> list[Listing]:
-        return run_search(page, include_all_for_debug=include_all)
+    def probe(self, page: Page, search_urls: list[str] | None = None) -> dict[str, list[str] | None]:
+        return probe_search(page, search_urls=search_urls)
+
+    def sync_inbox(self, page: Page, known: Callable[[list[str]], set[str]]) -> list[Conversation]:
+        return sync_inbox(page, known)
+
+    def create_watcher(
+        self,
+        page: Page,
+        include_all: bool = False,
+        search_urls: list[str] | None = None,
+        prefilter: CompiledRules | None = None,
+    ) -> SearchWatcher:
+        return SearchWatcher(page, search_urls=search_urls, include_all=include_all, prefilter=prefilter)
 
     def extract_details(self, page: Page, url: str) -> ListingDetails | None:
         return extract_listing_details(page, url)
 
-    def send_message(self, page: Page, listing_url: str, message_text: str) -> bool:
+    def send_message(self, page: Page, listing_url: str, message_text: str) -> bool | str:
         return send_anschreiben(page, listing_url, message_text)
+
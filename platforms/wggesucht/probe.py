@@ -0,0 +1,40 @@
+"""
+Cheap change probe for WG-Gesucht search pages: one bare HTTP GET through the browser
+context (its cookies, no rendering, no subresources) that extracts the top organic ad_ids.
+"""
+
+import re
+
+from playwright.sync_api import Page
+
+from platforms.wggesucht.search import _get_search_urls
+
+_PARTNER_MARKER = "Weitere Angebote von verifizierten Anbietern"
+_AD_HREF_RE = re.compile(r'href="[^"]*?[./](\d{5,})\.html|asset_id=(\d{5,})')
+
+PROBE_TOP = 5
+
+
+def _top_ad_ids(html: str, top: int = PROBE_TOP) -> list[str]:
+    """First `top` distinct organic ad_ids in page order (partner section excluded)."""
+    organic = html.split(_PARTNER_MARKER, 1)[0]
+    ids: list[str] = []
+    for m in _AD_HREF_RE.finditer(organic):
+        ad_id = m.group(1) or m.group(2)
+        if ad_id not in ids:
+            ids.append(ad_id)
+            if len(ids) >= top:
+                break
+    return ids
+
+
+def probe_search(page: Page, search_urls: list[str] | None = None, top: int = PROBE_TOP) -> dict[str, list[str] | None]:
+    """Top ad_ids per search URL; None for a URL whose probe failed (caller should scan it)."""
+    results: dict[str, list[str] | None] = {}
+    for url in list(search_urls) if search_urls else _get_search_urls():
+        try:
+            resp = page.context.request.get(url, timeout=15000, max_redirects=3)
+            results[url] = _top_ad_ids(resp.text(), top) if resp.ok else None
+        except Exception:
+            results[url] = None
+    return results
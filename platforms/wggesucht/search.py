@@ -9,8 +9,10 @@ import time
 
 from playwright.sync_api import Page
 
+from breaker import guard_for
 from config import get_search_urls
 from models import Listing
+from prefilter import CompiledRules
 from platforms.wggesucht.config import MAX_LISTING_AGE_HOURS, EXCLUDED_PROVIDERS, WG_SEARCH_URLS as DEFAULT_WG_SEARCH_URLS
 
 
@@ -55,65 +57,68 @@ def _get_search_urls() -> list[str]:
     return list(urls)
 
 
-def _scan_listings_fallback(page: Page, include_all: bool = False) -> list[Listing]:
-    """Fallback: use JavaScript to extract listing data from page."""
-    excluded = EXCLUDED_PROVIDERS or []
-    result = page.evaluate("""
-        (excludedProviders) => {
-            const listings = [];
-            const partnerHeader = document.evaluate(
-                "//*[contains(text(), 'Weitere Angebote von verifizierten Anbietern')]",
-                document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
-            ).singleNodeValue;
-            const stopBefore = partnerHeader ? partnerHeader.getBoundingClientRect().top : Infinity;
-
-            const links = document.querySelectorAll('a[href*=".html"]');
-            const seen = new Set();
-            for (const a of links) {
-                const href = a.getAttribute('href') || '';
-                let adId = '';
-                if (href.includes('asset_id=')) {
-                    const m = href.match(/asset_id=(\\d+)/);
-                    adId = m ? m[1] : '';
-                } else {
-                    const m = href.match(/\\.(\\d{5,})\\.html/) || href.match(/\\/(\\d{5,})\\.html/);
-                    adId = m ? m[1] : '';
-                }
-                if (!adId) continue;
-                if (seen.has(adId)) continue;
-                if (href.includes('impressum') || href.includes('datenschutz')) continue;
-
-                const card = a.closest('tr') || a.closest('[class*="list"]') || a.closest('[class*="card"]') || a.closest('[class*="offer"]') || a.parentElement;
-                if (!card) continue;
-                const rect = card.getBoundingClientRect();
-                if (rect.top > stopBefore) continue;
-
-                const cardText = card.innerText || '';
-                if (!cardText.includes('Online:')) continue;
-                if (cardText.includes('kontaktiert') || card.querySelector('.ribbon-contacted')) continue;
-                if (excludedProviders && excludedProviders.some(p => cardText.includes(p))) continue;
-
-                const onlineMatch = cardText.match(/Online:\\s*([^\\n]+)/);
-                const rawAge = onlineMatch ? onlineMatch[1].trim() : '';
-                const priceMatch = cardText.match(/(\\d+\\s*€)\\s*\\|?\\s*(\\d+\\s*m²)/);
-                const price = priceMatch ? priceMatch[1] : '';
-                const size = priceMatch ? priceMatch[2] : '';
-                const title = a.innerText ? a.innerText.substring(0, 100) : '';
-                const fullUrl = href.startsWith('http') ? href : 'https://www.wg-gesucht.de' + (href.startsWith('/') ? href : '/' + href);
-
-                seen.add(adId);
-                listings.push({
-                    ad_id: adId,
-                    title: title,
-                    url: fullUrl,
-                    price: price,
-                    size: size,
-                    raw_age_text: rawAge
-                });
+# Extracts organic cards (above the partner section) from the rendered search page
+_SCAN_JS = """
+    (excludedProviders) => {
+        const listings = [];
+        const partnerHeader = document.evaluate(
+            "//*[contains(text(), 'Weitere Angebote von verifizierten Anbietern')]",
+            document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        const stopBefore = partnerHeader ? partnerHeader.getBoundingClientRect().top : Infinity;
+
+        const links = document.querySelectorAll('a[href*=".html"]');
+        const seen = new Set();
+        for (const a of links) {
+            const href = a.getAttribute('href') || '';
+            let adId = '';
+            if (href.includes('asset_id=')) {
+                const m = href.match(/asset_id=(\\d+)/);
+                adId = m ? m[1] : '';
+            } else {
+                const m = href.match(/\\.(\\d{5,})\\.html/) || href.match(/\\/(\\d{5,})\\.html/);
+                adId = m ? m[1] : '';
             }
-            return listings;
+            if (!adId) continue;
+            if (seen.has(adId)) continue;
+            if (href.includes('impressum') || href.includes('datenschutz')) continue;
+
+            const card = a.closest('tr') || a.closest('[class*="list"]') || a.closest('[class*="card"]') || a.closest('[class*="offer"]') || a.parentElement;
+            if (!card) continue;
+            const rect = card.getBoundingClientRect();
+            if (rect.top > stopBefore) continue;
+
+            const cardText = card.innerText || '';
+            if (!cardText.includes('Online:')) continue;
+            if (cardText.includes('kontaktiert') || card.querySelector('.ribbon-contacted')) continue;
+            if (excludedProviders && excludedProviders.some(p => cardText.includes(p))) continue;
+
+            const onlineMatch = cardText.match(/Online:\\s*([^\\n]+)/);
+            const rawAge = onlineMatch ? onlineMatch[1].trim() : '';
+            const priceMatch = cardText.match(/(\\d+\\s*€)\\s*\\|?\\s*(\\d+\\s*m²)/);
+            const price = priceMatch ? priceMatch[1] : '';
+            const size = priceMatch ? priceMatch[2] : '';
+            const title = a.innerText ? a.innerText.substring(0, 100) : '';
+            const fullUrl = href.startsWith('http') ? href : 'https://www.wg-gesucht.de' + (href.startsWith('/') ? href : '/' + href);
+
+            seen.add(adId);
+            listings.push({
+                ad_id: adId,
+                title: title,
+                url: fullUrl,
+                price: price,
+                size: size,
+                raw_age_text: rawAge,
+                card_text: cardText.substring(0, 1000)
+            });
         }
-    """, excluded)
+        return listings;
+    }
+"""
+
+
+def _listings_from_scan(result: list[dict], include_all: bool = False, search_url: str = "") -> list[Listing]:
+    """Build Listings from the _SCAN_JS result, applying the age filter."""
     listings = []
     max_age_minutes = int(MAX_LISTING_AGE_HOURS * 60)
     for r in result:
@@ -129,31 +134,60 @@ def _scan_listings_fallback(page: Page, include_all: bool = False) -> list[Listi
             size=r["size"],
             age_minutes=age_minutes,
             raw_age_text=r.get("raw_age_text", ""),
+            search_url=search_url,
+            card_text=r.get("card_text", ""),
         ))
     return listings
 
 
-def run_search(page: Page, include_all_for_debug: bool = False) -> list[Listing]:
+def _scan_listings_fallback(page: Page, include_all: bool = False, search_url: str = "") -> list[Listing]:
+    """Fallback: use JavaScript to extract listing data from page."""
+    result = page.evaluate(_SCAN_JS, EXCLUDED_PROVIDERS or [])
+    return _listings_from_scan(result, include_all=include_all, search_url=search_url)
+
+
+def run_search(
+    page: Page,
+    include_all_for_debug: bool = False,
+    search_urls: list[str] | None = None,
+    prefilter: CompiledRules | None = None,
+) -> list[Listing]:
     """
     Run search across all WG_SEARCH_URLS, return valid listings (< 1 hour old).
     Deduplicates by ad_id. If include_all_for_debug: return all organic listings.
+    search_urls overrides the profile's URLs (multi-profile runs).
+    prefilter drops cards by the profile's rules (reasons are recorded on the prefilter).
     """
-    urls = _get_search_urls()
+    urls = list(search_urls) if search_urls else _get_search_urls()
     all_listings: list[Listing] = []
     seen_ids: set[str] = set()
 
     for url in urls:
-        page.goto(url, wait_until="domcontentloaded", timeout=45000)
+        guard = guard_for(url)
+        guard.navigate(page, url, "search", 45000)
         time.sleep(2)
+        t0 = time.perf_counter()
         try:
-            page.wait_for_selector('a[href*=".html"]', timeout=15000)
+            page.wait_for_selector('a[href*=".html"]', timeout=guard.timeout_ms("search_ready", 15000))
+            guard.observe("search_ready", time.perf_counter() - t0)
         except Exception:
             pass
         time.sleep(2)
-        listings = _scan_listings_fallback(page, include_all=include_all_for_debug)
-        for lst in listings:
-            if lst.ad_id not in seen_ids:
-                seen_ids.add(lst.ad_id)
-                all_listings.append(lst)
+        listings = _scan_listings_fallback(page, include_all=include_all_for_debug, search_url=url)
+        all_listings.extend(_new_listings(listings, seen_ids, prefilter))
 
     return all_listings
+
+
+def _new_listings(
+    listings: list[Listing], seen_ids: set[str], prefilter: CompiledRules | None = None
+) -> list[Listing]:
+    """Listings whose ad_id is not in seen_ids (updated in place) and that pass the prefilter."""
+    fresh = []
+    for lst in listings:
+        if lst.ad_id not in seen_ids:
+            seen_ids.add(lst.ad_id)
+            if prefilter and prefilter.check(lst):
+                continue
+            fresh.append(lst)
+    return fresh
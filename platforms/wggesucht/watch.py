@@ -0,0 +1,86 @@
+"""
+WG-Gesucht live watcher: keeps one search tab open and refreshes the result lists in place.
+Each poll fetches the search HTML from inside the page (session cookies, no subresources),
+swaps it into the open document and scans it, emitting only ad_ids not seen before.
+"""
+
+from playwright.sync_api import Page
+
+from breaker import guard_for
+from models import Listing
+from prefilter import CompiledRules
+from platforms.wggesucht.search import _get_search_urls, _scan_listings_fallback
+
+# Images, frames and scripts are dropped before the swap, so a refresh costs one HTML request
+_REFRESH_JS = """
+async (url) => {
+    const resp = await fetch(url, {credentials: 'include', cache: 'no-store'});
+    if (!resp.ok) return resp.status;
+    const doc = new DOMParser().parseFromString(await resp.text(), 'text/html');
+    doc.querySelectorAll('img, picture, iframe, script, video').forEach(el => el.remove());
+    document.body.replaceWith(document.adoptNode(doc.body));
+    window.scrollTo(0, 0);
+    return resp.status;
+}
+"""
+
+
+class SearchWatcher:
+    """Polls the search URLs in one tab; poll() returns listings that appeared since the last call."""
+
+    def __init__(
+        self,
+        page: Page,
+        search_urls: list[str] | None = None,
+        include_all: bool = False,
+        prefilter: CompiledRules | None = None,
+    ):
+        self.page = page
+        self.urls = list(search_urls) if search_urls else _get_search_urls()
+        self.include_all = include_all
+        self.prefilter = prefilter
+        self.seen: set[str] = set()
+        self.polls = 0
+        self.refresh_errors = 0
+
+    def prime(self) -> list[Listing]:
+        """Load the first search URL normally (origin, cookies), then scan every URL once."""
+        guard_for(self.urls[0]).navigate(self.page, self.urls[0], "search", 45000)
+        try:
+            self.page.wait_for_selector('a[href*=".html"]', timeout=15000)
+        except Exception:
+            pass
+        return self._scan_all(refresh_first=False)
+
+    def poll(self) -> list[Listing]:
+        """Refresh every search URL in place and return only newly appeared listings."""
+        self.polls += 1
+        return self._scan_all(refresh_first=True)
+
+    def forget(self, ad_ids) -> None:
+        """Emit these ads again on the next poll (they didn't reach a final outcome)."""
+        self.seen.difference_update(ad_ids)
+
+    def _scan_all(self, refresh_first: bool) -> list[Listing]:
+        new: list[Listing] = []
+        for i, url in enumerate(self.urls):
+            if refresh_first or i > 0:
+                guard = guard_for(url)
+                guard.check()
+                status = self.page.evaluate(_REFRESH_JS, url)
+                if status != 200:
+                    self.refresh_errors += 1
+                    if status >= 500:
+                        guard.breaker.record_failure()
+                    else:
+                        guard.breaker.release()
+                    continue
+                guard.breaker.record_success()
+            for lst in _scan_listings_fallback(self.page, include_all=self.include_all, search_url=url):
+                if lst.ad_id in self.seen:
+                    continue
+                self.seen.add(lst.ad_id)
+                if self.prefilter and self.prefilter.check(lst):
+                    continue
+                new.append(lst)
+        return new
@@ -0,0 +1,87 @@
+"""
+Card-level pre-filter: declarative rules from the profile, compiled once and evaluated
+against search card data before any detail page load or LLM call.
+"""
+
+import re
+
+from models import FilterRules, Listing
+from normalize import parse_area, parse_euro, price_per_m2
+
+
+class CompiledRules:
+    """
+    FilterRules compiled into one case-insensitive multi-pattern regex (all include and
+    exclude keywords as named alternatives) plus one provider regex.
+    check() returns the drop reason or None, and records every drop in .dropped.
+    """
+
+    def __init__(self, rules: FilterRules):
+        self.rules = rules
+        self.dropped: list[tuple[Listing, str]] = []
+        self._keywords: dict[str, tuple[str, str]] = {}
+        alternatives = []
+        # Excludes first: at the same position the earlier alternative wins
+        for kind, words in (("e", rules.exclude_keywords), ("i", rules.include_keywords)):
+            for idx, word in enumerate(w for w in words if w.strip()):
+                group = f"{kind}{idx}"
+                self._keywords[group] = (kind, word.strip())
+                alternatives.append(f"(?P<{group}>{re.escape(word.strip())})")
+        self._matcher = re.compile("|".join(alternatives), re.I) if alternatives else None
+        providers = [p for p in rules.exclude_providers if p.strip()]
+        self._providers = re.compile("|".join(f"(?:{p})" for p in providers), re.I) if providers else None
+
+    def _match_keywords(self, text: str) -> tuple[str | None, bool]:
+        """Single pass over text: (first exclude keyword hit, any include keyword hit)."""
+        excluded = None
+        included = False
+        for m in self._matcher.finditer(text):
+            kind, word = self._keywords[m.lastgroup]
+            if kind == "e" and excluded is None:
+                excluded = word
+            elif kind == "i":
+                included = True
+        return excluded, included
+
+    def _reason(self, listing: Listing) -> str | None:
+        rules = self.rules
+        text = f"{listing.title}\n{listing.card_text}"
+        if self._providers:
+            m = self._providers.search(listing.card_text or listing.title)
+            if m:
+                return f"Anbieter ausgeschlossen ({m.group(0)})"
+        if self._matcher:
+            excluded, included = self._match_keywords(text)
+            if excluded:
+                return f"Ausschlusswort '{excluded}'"
+            if rules.include_keywords and not included:
+                return "kein Suchbegriff enthalten"
+
+        price = parse_euro(listing.price)
+        size = parse_area(listing.size)
+        ppm = price_per_m2(price, size)
+        for value, limit, is_max, label in (
+            (price, rules.min_price, False, "Preis"),
+            (price, rules.max_price, True, "Preis"),
+            (size, rules.min_size, False, "Größe"),
+            (size, rules.max_size, True, "Größe"),
+            (ppm, rules.max_price_per_m2, True, "€/m²"),
+        ):
+            if value is None or limit is None:
+                continue
+            if (is_max and value > limit) or (not is_max and value < limit):
+                return f"{label} {value:g} {'>' if is_max else '<'} {limit:g}"
+        return None
+
+    def check(self, listing: Listing) -> str | None:
+        reason = self._reason(listing)
+        if reason:
+            self.dropped.append((listing, reason))
+        return reason
+
+
+def compile_rules(rules: FilterRules | None) -> CompiledRules | None:
+    """Compile rules, or None if no rule is configured (zero overhead)."""
+    if rules is None or rules == FilterRules():
+        return None
+    return CompiledRules(rules)
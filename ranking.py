@@ -0,0 +1,130 @@
+"""
+Relevance ranking: scores a batch of candidate listings against the persona in one pass
+(freshness, price per m², persona keyword hits, TF-IDF similarity) so the best match is
+contacted first.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from models import Listing, ListingDetails, UserProfile
+from normalize import parse_area, parse_euro
+
+_WORD_RE = re.compile(r"[a-zäöüß]{3,}")
+_STOPWORDS = {
+    "und", "oder", "der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem", "einer",
+    "mit", "für", "von", "bei", "auf", "aus", "ist", "sind", "wir", "ich", "sie", "uns", "euch", "nicht",
+    "auch", "als", "wie", "gerne", "sehr", "zum", "zur", "nach", "sich", "mein", "meine", "dein", "eure",
+    "bin", "hat", "haben", "wird", "werden", "dass", "aber", "noch", "nur", "alle", "mal", "ganz",
+}
+
+
+def _tokens(text: str) -> list[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+@dataclass
+class RankWeights:
+    """Weights of the score components (normalized to sum 1)."""
+
+    freshness: float = 0.35
+    price: float = 0.25
+    keywords: float = 0.2
+    similarity: float = 0.2
+    freshness_half_life_min: float = 20.0
+
+
+def persona_text(profile: UserProfile | None) -> str:
+    """What the persona is looking for, plus who they are (hobbies, personality)."""
+    if profile is None:
+        return ""
+    p = profile.persona
+    return " ".join((p.looking_for, p.hobbies, p.personality, p.job))
+
+
+def _document(listing: Listing, details: ListingDetails | None) -> str:
+    if details:
+        return f"{details.title} {details.full_description} {details.wg_details}"
+    return f"{listing.title} {listing.card_text}"
+
+
+def score_listings(
+    listings: list[Listing],
+    profile: UserProfile | None,
+    details: dict[str, ListingDetails] | None = None,
+    weights: RankWeights | None = None,
+) -> np.ndarray:
+    """Score in [0, 1] per listing (same order as listings)."""
+    n = len(listings)
+    if not n:
+        return np.zeros(0)
+    weights = weights or RankWeights()
+    details = details or {}
+
+    # Freshness: exponential decay with the card's online age (unknown = oldest in batch, >= 1h)
+    ages = np.array([lst.age_minutes if lst.age_minutes is not None else np.nan for lst in listings], dtype=float)
+    unknown_age = 60.0 if np.isnan(ages).all() else max(float(np.nanmax(ages)), 60.0)
+    ages = np.where(np.isnan(ages), unknown_age, ages)
+    freshness = np.exp2(-ages / weights.freshness_half_life_min)
+
+    # Price per m²: cheapest in batch = 1, most expensive = 0, unknown = neutral
+    prices = np.array([parse_euro(lst.price) or np.nan for lst in listings], dtype=float)
+    sizes = np.array([parse_area(lst.size) or np.nan for lst in listings], dtype=float)
+    ppm = prices / sizes
+    price = np.full(n, 0.5)
+    known = ~np.isnan(ppm)
+    if known.sum() > 1 and np.ptp(ppm[known]) > 0:
+        price[known] = 1.0 - (ppm[known] - ppm[known].min()) / np.ptp(ppm[known])
+
+    # Term-document matrix over listings + persona query
+    docs = [_tokens(_document(lst, details.get(lst.ad_id))) for lst in listings]
+    query = _tokens(persona_text(profile))
+    vocab: dict[str, int] = {}
+    for words in docs + [query]:
+        for w in words:
+            vocab.setdefault(w, len(vocab))
+    tf = np.zeros((n + 1, max(len(vocab), 1)))
+    for row, words in enumerate(docs + [query]):
+        for w in words:
+            tf[row, vocab[w]] += 1.0
+
+    keywords = np.zeros(n)
+    similarity = np.zeros(n)
+    if query:
+        query_cols = np.array(sorted({vocab[w] for w in query}))
+        # Share of distinct persona keywords the listing mentions
+        keywords = (tf[:n, query_cols] > 0).mean(axis=1)
+        # TF-IDF cosine similarity (smoothed idf over the batch)
+        df = (tf[:n] > 0).sum(axis=0)
+        idf = np.log((1 + n) / (1 + df)) + 1.0
+        tfidf = np.log1p(tf) * idf
+        norms = np.linalg.norm(tfidf, axis=1)
+        norms[norms == 0] = 1.0
+        tfidf /= norms[:, None]
+        similarity = tfidf[:n] @ tfidf[n]
+        if similarity.max() > 0:
+            similarity = similarity / similarity.max()
+
+    w = np.array([weights.freshness, weights.price, weights.keywords, weights.similarity], dtype=float)
+    w = w / w.sum()
+    return np.stack([freshness, price, keywords, similarity], axis=1) @ w
+
+
+def rank(
+    listings: list[Listing],
+    profile: UserProfile | None,
+    details: dict[str, ListingDetails] | None = None,
+    min_score: float = 0.0,
+    weights: RankWeights | None = None,
+) -> list[tuple[Listing, float]]:
+    """Listings with score >= min_score, best first (stable for equal scores)."""
+    scores = score_listings(listings, profile, details, weights)
+    order = np.argsort(-scores, kind="stable")
+    return [
+        (listings[i], float(scores[i]))
+        for i in order
+        if scores[i] >= min_score or math.isclose(scores[i], min_score)
+    ]
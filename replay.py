@@ -0,0 +1,47 @@
+"""
+Record/replay harness for deterministic end-to-end cycle benchmarks.
+--record PATH captures all browser traffic of a cycle into a HAR archive (plus the generated
+messages next to it); --replay PATH serves the same cycle offline from that archive through
+Playwright routing. Anything not in the archive is aborted, so replayed sends never reach the site.
+"""
+
+import json
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext
+
+
+def har_path_for(path: str, profile_name: str, multi: bool) -> Path:
+    """One archive per profile when several profiles are recorded."""
+    p = Path(path)
+    return p.with_name(f"{p.stem}.{profile_name}{p.suffix}") if multi else p
+
+
+def record_context_options(har_path: Path) -> dict:
+    """new_context() options that record the full traffic (bodies embedded) to har_path."""
+    har_path.parent.mkdir(parents=True, exist_ok=True)
+    return {"record_har_path": str(har_path), "record_har_content": "embed", "record_har_mode": "full"}
+
+
+def install_replay(context: BrowserContext, har_path: Path) -> None:
+    """Serve every request of context from the archive; unknown requests are aborted."""
+    if not har_path.exists():
+        raise FileNotFoundError(f"HAR archive not found: {har_path}")
+    context.route_from_har(str(har_path), not_found="abort", update=False)
+
+
+class MessageArchive:
+    """Generated Anschreiben by ad_id, recorded alongside the HAR so replays skip the LLM."""
+
+    def __init__(self, har_path: Path):
+        self.path = har_path.with_suffix(".messages.json")
+        self._messages: dict[str, str] = {}
+        if self.path.exists():
+            self._messages = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, ad_id: str) -> str | None:
+        return self._messages.get(ad_id)
+
+    def put(self, ad_id: str, message: str) -> None:
+        self._messages[ad_id] = message
+        self.path.write_text(json.dumps(self._messages, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 """
 FlatScraper - flat search automation (WG-Gesucht).
-CLI: flatscraper | flatscraper --no-send | flatscraper --visible | flatscraper setup
+CLI: flatscraper | flatscraper --no-send | flatscraper --visible | flatscraper --profile NAME | flatscraper --workers N | flatscraper --watch | flatscraper setup | flatscraper history | flatscraper outbox | flatscraper browser
 """
 
+import os
+import socket
 import sys
+import tempfile
 import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
 
 if sys.platform == "win32":
@@ -20,82 +27,310 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.rule import Rule
 from rich.table import Table
 
+from breaker import CircuitOpenError
+from browser_server import attach_or_launch, server_context
 from config import (
     AUTO_RUN_ENABLED,
+    CYCLE_BUDGET_SECONDS,
     GOOGLE_DRIVE_LINK,
-    GROQ_MODEL,
+    INBOX_SKIP_LANDLORDS,
+    INBOX_SYNC_MINUTES,
+    MESSAGE_GENERATOR,
+    NEAR_DUPLICATES,
+    RANK_MIN_SCORE,
     RUN_INTERVAL_MINUTES,
+    WATCH_INTERVAL_SECONDS,
+    get_profiles,
 )
 from groq_client import generate_anschreiben
-from models import ListingData
+from launch import LaunchProfile, resolve_launch_profile
+from llm import get_router
+from local_writer import generate_local
+from models import Listing, ListingData, OutboxEntry
+from outbox import deliver, drain
 from platforms import PLATFORMS
+from platforms.base import SEND_UNCONFIRMED, EmptyInboxError
+from prefilter import compile_rules
+from ranking import rank
+from replay import har_path_for
+from sessions import ProfileSession, close_session, open_session, round_robin, save_session
+from store import StateStore
+from timing import Deadline, DeadlineExceeded, StageTimer, deadline_scope, percentile
 
 console = Console()
 
-
-def run_platform(platform, page) -> None:
-    """Run crawler for the given platform."""
-    debug = "--debug" in sys.argv or "-d" in sys.argv
-    no_send = "--no-send" in sys.argv
-
-    # Login
-    console.print()
-    console.print(Rule("[bold]Anmeldung[/bold]", style="blue"))
-    platform.login(page)
-
-    # Search
-    console.print()
-    console.print(Rule("[bold]Suche[/bold]", style="blue"))
-    with console.status("[bold green]Durchsuche WG-Gesucht...[/bold green]", spinner="dots"):
-        listings = platform.run_search(page, include_all=debug)
-
-    if not listings:
-        console.print("[yellow]Keine neuen Anzeigen gefunden.[/yellow]")
+# Assumed cost of one listing (detail page, generation, send) until the cycle has measured it
+LISTING_ESTIMATE_SECONDS = 20.0
+
+# Profiles whose empty inbox was already reported in this process
+_EMPTY_INBOX_NOTED: set[str] = set()
+
+
+def _arg_value(flag: str) -> str | None:
+    """Value following a CLI flag (e.g. --profile anna), or None."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return sys.argv[idx + 1]
+    return None
+
+
+def cycle_budget(use_schedule: bool) -> float | None:
+    """
+    Time budget per cycle in seconds: --budget, else CYCLE_BUDGET_SECONDS, else the schedule
+    interval for scheduled runs (a cycle should end before the next is due). None = unbounded.
+    """
+    budget = float(_arg_value("--budget") or CYCLE_BUDGET_SECONDS or 0)
+    if not budget and use_schedule:
+        budget = RUN_INTERVAL_MINUTES * 60
+    return budget or None
+
+
+def launch_profile() -> LaunchProfile:
+    """Browser launch profile: --browser-profile / --viewport / --scale, else the BROWSER_* settings."""
+    scale = _arg_value("--scale")
+    return resolve_launch_profile(
+        _arg_value("--browser-profile"), _arg_value("--viewport"), float(scale) if scale else None
+    )
+
+
+def _owner_id() -> str:
+    """Claim owner for the dedup store: unique per process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class CycleContext:
+    """Per-cycle state and options passed through the pipeline stages."""
+
+    state: StateStore
+    timer: StageTimer
+    debug: bool = False
+    no_send: bool = False
+    probe: bool = False
+    duplicates: str = "skip"  # near-duplicates of contacted ads: skip | reuse | off
+    rank: bool = True
+    min_score: float = 0.0
+    polls: Counter = field(default_factory=Counter)  # probes, scans, unchanged
+    deadline: Deadline = field(default_factory=Deadline)
+    generator: str = "llm"  # llm | fallback (local templates if the LLM fails) | local
+    # Listings without a final outcome (failed, deferred, never reached): picked up again later
+    unfinished: list[tuple[ProfileSession, Listing]] = field(default_factory=list)
+
+
+def _probe_changed_urls(platform, session: ProfileSession, ctx: CycleContext, page) -> tuple[list[str] | None, dict]:
+    """
+    Two-tier polling: probe every search URL cheaply and return the ones showing an unknown
+    ad_id (None = probing unavailable, scan everything) plus the probe results.
+    """
+    with ctx.timer.stage("probe"):
+        probes = platform.probe(page, session.search_urls)
+    if probes is None:
+        return None, {}
+    ctx.polls["probes"] += len(probes)
+    changed = [url for url, ids in probes.items() if ctx.state.probes.changed(session.name, url, ids)]
+    ctx.polls["unchanged"] += len(probes) - len(changed)
+    return changed, probes
+
+
+def _sync_inbox(platform, session: ProfileSession, ctx: CycleContext, page) -> None:
+    """
+    Pull new conversations from the profile's inbox into the contacted set, at most every
+    INBOX_SYNC_MINUTES. Ads messaged from the phone or the website are skipped from then on.
+    """
+    inbox = ctx.state.inbox
+    last = inbox.last_sync(session.name)
+    if INBOX_SYNC_MINUTES <= 0 or session.replaying or (last and time.time() - last < INBOX_SYNC_MINUTES * 60):
         return
+    try:
+        with ctx.timer.stage("inbox"):
+            conversations = platform.sync_inbox(page, lambda ids: inbox.known(session.name, ids))
+    except EmptyInboxError as e:
+        # Only suspicious once earlier syncs found conversations; a new account just has none yet
+        if inbox.count(session.name):
+            console.print(f"[yellow]Postfach ({session.name}) nicht synchronisiert: {e}[/yellow]")
+        elif session.name not in _EMPTY_INBOX_NOTED:
+            _EMPTY_INBOX_NOTED.add(session.name)
+            console.print(f"[dim]Postfach ({session.name}): noch keine Unterhaltungen[/dim]")
+        return
+    except Exception as e:
+        console.print(f"[yellow]Postfach ({session.name}) nicht synchronisiert: {e}[/yellow]")
+        return
+    if conversations is None:
+        return
+    inbox.add(session.name, conversations)
+    inbox.mark_synced(session.name)
+    for conversation in conversations:
+        # An interrupted send that did reach the site shows up here as a conversation
+        entry = ctx.state.outbox.get(session.name, conversation.ad_id) if conversation.ad_id else None
+        if entry and entry.status == "unknown":
+            ctx.state.outbox.mark_sent(session.name, conversation.ad_id)
+    if conversations:
+        console.print(f"[dim]Postfach ({session.name}): {len(conversations)} neue Unterhaltungen übernommen[/dim]")
+
+
+def _search_session(platform, session: ProfileSession, ctx: CycleContext) -> list[Listing]:
+    """Log in and search for one profile."""
+    rules = compile_rules(session.persona.filters if session.persona else None)
+    with session.pages.lease("search") as page:
+        search_urls = session.search_urls
+        probes: dict = {}
+        if ctx.probe and not ctx.debug and not session.messages:
+            changed, probes = _probe_changed_urls(platform, session, ctx, page)
+            if changed is not None:
+                if not changed:
+                    console.print(f"[dim]Vorab-Prüfung ({session.name}): keine neuen Anzeigen, Suche übersprungen[/dim]")
+                    return []
+                search_urls = changed
+        with ctx.timer.stage("login"):
+            platform.login(page, email=session.profile.email, password=session.profile.password)
+        save_session(session)
+        session.pages.warm(page.url)
+        _sync_inbox(platform, session, ctx, page)
+        with ctx.timer.stage("search"), console.status(
+            f"[bold green]Durchsuche WG-Gesucht ({session.name})...[/bold green]", spinner="dots"
+        ):
+            listings = platform.run_search(page, include_all=ctx.debug, search_urls=search_urls, prefilter=rules)
+        ctx.polls["scans"] += len(search_urls) if search_urls else 1
+        for url in search_urls or []:
+            if url in probes:
+                ctx.state.probes.remember(session.name, url, probes[url])
+    if rules and rules.dropped:
+        table = Table(title=f"Vorfilter: {len(rules.dropped)} Anzeigen verworfen", show_header=False)
+        table.add_column("", style="dim")
+        table.add_column("")
+        table.add_column("", style="yellow")
+        for dropped, reason in rules.dropped:
+            table.add_row(dropped.ad_id, dropped.title[:50], reason)
+        console.print(table)
+    return listings
+
+
+def _process_listing(
+    platform,
+    session: ProfileSession,
+    listing: Listing,
+    label: str,
+    ctx: CycleContext,
+) -> str:
+    """
+    Extract details, generate the Anschreiben and send it for one listing.
+    Returns the outcome: "sent", "generated", "skipped" or "failed".
+    """
+    dedup = ctx.state.dedup
+    if not dedup.claim(session.name, listing.ad_id, _owner_id()):
+        console.print(f"  [dim]{listing.ad_id}: bereits bearbeitet (anderer Worker/Lauf), übersprungen[/dim]")
+        return "skipped"
+    try:
+        outcome = _process_claimed_listing(platform, session, listing, label, ctx)
+    except Exception:
+        dedup.release(session.name, listing.ad_id)
+        raise
+    if outcome == "sent":
+        dedup.mark_sent(session.name, listing.ad_id)
+    else:
+        dedup.release(session.name, listing.ad_id)
+    return outcome
+
+
+def _process_claimed_listing(
+    platform,
+    session: ProfileSession,
+    listing: Listing,
+    label: str,
+    ctx: CycleContext,
+) -> str:
+    state = ctx.state
+    console.print(Panel.fit(
+        f"[bold]{listing.title[:70]}{'...' if len(listing.title) > 70 else ''}[/bold]\n"
+        f"ID: {listing.ad_id}  |  {listing.price}  |  {listing.size}  |  {listing.raw_age_text}\n"
+        f"[dim]{listing.url}[/dim]",
+        title=label,
+        border_style="cyan",
+    ))
 
-    age_info = "alle Anzeigen (Debug)" if debug else "unter 1 Stunde alt"
-    console.print(f"[green]Gefunden: {len(listings)} Anzeigen[/green] ({age_info})")
-    console.print()
-
-    # Process each listing
-    for i, listing in enumerate(listings, 1):
-        console.print(Panel.fit(
-            f"[bold]{listing.title[:70]}{'...' if len(listing.title) > 70 else ''}[/bold]\n"
-            f"ID: {listing.ad_id}  |  {listing.price}  |  {listing.size}  |  {listing.raw_age_text}\n"
-            f"[dim]{listing.url}[/dim]",
-            title=f"Anzeige {i}/{len(listings)}",
-            border_style="cyan",
-        ))
-
-        with console.status("[dim]Öffne Anzeige...[/dim]", spinner="dots"):
-            details = platform.extract_details(page, listing.url)
-
-        if not details:
-            try:
-                if page.get_by_text("Unterhaltung ansehen").first.is_visible():
+    queued = state.outbox.get(session.name, listing.ad_id)
+    if queued and queued.status in ("sent", "sending", "unknown", "dead"):
+        console.print(f"  [dim]→ Outbox-Status '{queued.status}', übersprungen[/dim]")
+        console.print()
+        return "skipped"
+    if queued:
+        # Generated in an earlier run but not delivered: no detail load, no LLM call
+        console.print("  [dim]→ Anschreiben bereits in der Outbox[/dim]")
+        return _send_queued(platform, session, queued, ctx)
+
+    details, card_state = state.details.lookup(listing)
+    if details:
+        console.print("  [dim]→ Anzeige unverändert, Details aus Cache[/dim]")
+    else:
+        if card_state == "changed":
+            console.print("  [yellow]→ Anzeige wurde geändert, wird neu verarbeitet[/yellow]")
+        with session.pages.lease("detail") as page:
+            with ctx.timer.stage("extract"), console.status("[dim]Öffne Anzeige...[/dim]", spinner="dots"):
+                details = platform.extract_details(page, listing.url)
+            if not details:
+                try:
+                    contacted = page.get_by_text("Unterhaltung ansehen").first.is_visible()
+                except Exception:
+                    contacted = False
+                if contacted:
                     console.print("  [yellow]→ Bereits kontaktiert, übersprungen[/yellow]")
-                else:
-                    console.print("  [yellow]→ Details konnten nicht extrahiert werden[/yellow]")
-            except Exception:
+                    console.print()
+                    return "skipped"
                 console.print("  [yellow]→ Details konnten nicht extrahiert werden[/yellow]")
+                console.print()
+                return "failed"
+        state.history.record_details(details)
+        repost_of = state.details.save(listing, details)
+        if INBOX_SKIP_LANDLORDS and state.inbox.landlord_contacted(session.name, details.publisher_name):
+            console.print(f"  [yellow]→ {details.publisher_name} bereits im Postfach angeschrieben, übersprungen[/yellow]")
             console.print()
-            continue
-
-        # Listing info
-        table = Table(show_header=False)
-        table.add_column("", style="dim", width=12)
-        table.add_column("")
-        table.add_row("Titel", details.title[:80] + ("..." if len(details.title) > 80 else ""))
-        table.add_row("Adresse", details.address)
-        table.add_row("Typ", "WG-Zimmer" if details.ad_type == "wg" else "Wohnung")
-        console.print(table)
-
-        # Generate Anschreiben
-        def on_rate_limit(wait_sec: float, attempt: int) -> None:
-            console.print(f"  [yellow]Rate limit – warte {wait_sec:.0f}s (Versuch {attempt + 1}/4)...[/yellow]")
-
-        with console.status(f"[dim]Generiere Anschreiben mit {GROQ_MODEL}...[/dim]", spinner="dots"):
-            anschreiben = None
+            return "skipped"
+        if repost_of:
+            console.print(f"  [yellow]→ Inhalt identisch mit Anzeige {repost_of} (Repost)[/yellow]")
+
+    # Listing info
+    table = Table(show_header=False)
+    table.add_column("", style="dim", width=12)
+    table.add_column("")
+    table.add_row("Titel", details.title[:80] + ("..." if len(details.title) > 80 else ""))
+    table.add_row("Adresse", details.address)
+    table.add_row("Typ", "WG-Zimmer" if details.ad_type == "wg" else "Wohnung")
+    console.print(table)
+
+    # Near-duplicate of an ad this profile already messaged (same room, other id/search)
+    anschreiben = None
+    matches = state.similar.add(details) if ctx.duplicates != "off" else []
+    duplicate = matches[0] if matches else None
+    earlier = None
+    for dup_id, score in matches:
+        entry = state.outbox.get(session.name, dup_id)
+        # Only a message that went out (or may have) counts; pending/failed/dead ones were never delivered
+        if entry and entry.status in ("sent", "sending", "unknown"):
+            duplicate, earlier = (dup_id, score), entry
+            break
+    if earlier:
+        dup_id, score = duplicate
+        if ctx.duplicates == "skip":
+            console.print(
+                f"  [yellow]→ Nahezu identisch mit Anzeige {dup_id} ({score:.0%}), bereits angeschrieben – übersprungen[/yellow]"
+            )
+            console.print()
+            return "skipped"
+        console.print(f"  [dim]→ Nahezu identisch mit Anzeige {dup_id} ({score:.0%}), Anschreiben wiederverwendet[/dim]")
+        anschreiben = earlier.message
+    elif duplicate:
+        console.print(f"  [dim]→ Ähnlich zu Anzeige {duplicate[0]} ({duplicate[1]:.0%})[/dim]")
+
+    # Generate Anschreiben
+    def on_rate_limit(wait_sec: float, attempt: int) -> None:
+        console.print(f"  [yellow]Rate limit – warte {wait_sec:.0f}s (Versuch {attempt + 1}/4)...[/yellow]")
+
+    if anschreiben is None:
+        model = "lokaler Vorlage" if ctx.generator == "local" else get_router().label()
+        with ctx.timer.stage("generate"), console.status(
+            f"[dim]Generiere Anschreiben mit {model}...[/dim]", spinner="dots"
+        ):
             try:
                 data = ListingData(
                     title=details.title,
@@ -105,30 +340,438 @@ def run_platform(platform, page) -> None:
                     google_drive=GOOGLE_DRIVE_LINK,
                     ad_type=details.ad_type,
                 )
-                anschreiben = generate_anschreiben(data, on_retry=on_rate_limit)
+                if session.messages and session.replaying:
+                    anschreiben = session.messages.get(listing.ad_id)
+                    if anschreiben is None:
+                        raise RuntimeError("Keine aufgezeichnete Nachricht im Archiv")
+                else:
+                    anschreiben = _generate(data, session, ctx, on_rate_limit)
+                    if session.messages:
+                        session.messages.put(listing.ad_id, anschreiben)
+            except DeadlineExceeded:
+                raise
             except Exception as e:
                 console.print(f"  [red]Fehler bei KI-Generierung: {e}[/red]")
 
-        if anschreiben:
-            console.print()
-            console.print(Panel(
-                anschreiben,
-                title="[bold]Generiertes Anschreiben[/bold]",
-                subtitle=f"{len(anschreiben)} Zeichen, {len(anschreiben.split())} Wörter",
-                border_style="green",
-            ))
-
-            if no_send:
-                console.print("  [yellow]→ Nicht gesendet (--no-send)[/yellow]")
+    outcome = "failed"
+    if anschreiben:
+        outcome = "generated"
+        console.print()
+        console.print(Panel(
+            anschreiben,
+            title="[bold]Generiertes Anschreiben[/bold]",
+            subtitle=f"{len(anschreiben)} Zeichen, {len(anschreiben.split())} Wörter",
+            border_style="green",
+        ))
+
+        state.freshness.mark(session.name, listing.ad_id, "generated")
+        if not session.replaying:
+            state.outbox.enqueue(session.name, listing.ad_id, listing.url, anschreiben)
+        if ctx.no_send:
+            console.print("  [yellow]→ Nicht gesendet (--no-send), in Outbox gespeichert[/yellow]")
+        else:
+            entry = state.outbox.get(session.name, listing.ad_id)
+            if entry:
+                return _send_queued(platform, session, entry, ctx)
+            with ctx.timer.stage("send"), console.status("[dim]Sende Nachricht...[/dim]", spinner="dots"), \
+                    session.pages.lease("message") as page:
+                result = platform.send_message(page, listing.url, anschreiben)
+            outcome = "sent" if result is True else "failed"
+            if result is True:
+                state.freshness.mark(session.name, listing.ad_id, "sent")
+                console.print("  [green]✓ Nachricht gesendet[/green]")
+            elif result == SEND_UNCONFIRMED:
+                console.print("  [yellow]? Gesendet, aber nicht bestätigt[/yellow]")
             else:
-                with console.status("[dim]Sende Nachricht...[/dim]", spinner="dots"):
-                    success = platform.send_message(page, listing.url, anschreiben)
-                if success:
-                    console.print("  [green]✓ Nachricht gesendet[/green]")
-                else:
-                    console.print("  [red]✗ Senden fehlgeschlagen[/red]")
+                console.print("  [red]✗ Senden fehlgeschlagen[/red]")
 
+    console.print()
+    return outcome
+
+
+def _generate(data: ListingData, session: ProfileSession, ctx: CycleContext, on_retry) -> str:
+    """Anschreiben per ctx.generator: LLM, local templates, or LLM with the templates as fallback."""
+    if ctx.generator == "local":
+        return generate_local(data, session.persona)
+    try:
+        return generate_anschreiben(data, on_retry=on_retry, persona=session.persona, deadline=ctx.deadline)
+    except Exception as e:
+        if ctx.generator != "fallback":
+            raise
+        console.print(f"  [yellow]KI nicht verfügbar ({e}) – lokale Vorlage verwendet[/yellow]")
+        return generate_local(data, session.persona)
+
+
+def _send_queued(platform, session: ProfileSession, entry: OutboxEntry, ctx: CycleContext) -> str:
+    """Deliver an outbox entry; failures stay queued for the sender with backoff."""
+    if ctx.no_send:
+        console.print("  [yellow]→ Nicht gesendet (--no-send)[/yellow]")
+        console.print()
+        return "generated"
+    if entry.status == "failed" and entry.next_attempt_at and entry.next_attempt_at > datetime.now():
+        console.print(f"  [dim]→ Nächster Sendeversuch ab {entry.next_attempt_at:%H:%M:%S}[/dim]")
+        console.print()
+        return "deferred"  # the cycle-end outbox drain sends it once the backoff has passed
+    if ctx.deadline.expired:
+        console.print("  [yellow]→ Zeitbudget aufgebraucht – bleibt in der Outbox für den nächsten Lauf[/yellow]")
+        console.print()
+        return "deferred"
+    with console.status("[dim]Sende Nachricht...[/dim]", spinner="dots"):
+        status = deliver(platform, session, ctx.state, entry, ctx.timer)
+    if status == "sent":
+        console.print("  [green]✓ Nachricht gesendet[/green]")
+    elif status == "skipped":
+        console.print("  [dim]→ Bereits von anderem Sender übernommen[/dim]")
+    elif status == "unknown":
+        console.print("  [yellow]? Senden abgebrochen, Ergebnis unklar – als 'unknown' geparkt (prüfen, dann requeue)[/yellow]")
+    else:
+        console.print(f"  [red]✗ Senden fehlgeschlagen – bleibt in der Outbox ({status})[/red]")
+    console.print()
+    return {"sent": "sent", "skipped": "skipped"}.get(status, "failed")
+
+
+def _make_context(
+    state_path: Path | None = None,
+    timer: StageTimer | None = None,
+    probe: bool = False,
+    deadline: Deadline | None = None,
+) -> CycleContext:
+    return CycleContext(
+        state=StateStore(state_path),
+        timer=timer or StageTimer(),
+        debug="--debug" in sys.argv or "-d" in sys.argv,
+        no_send="--no-send" in sys.argv,
+        probe=probe,
+        duplicates=_arg_value("--duplicates") or NEAR_DUPLICATES,
+        rank="--no-rank" not in sys.argv,
+        min_score=float(_arg_value("--min-score") or RANK_MIN_SCORE),
+        deadline=deadline or Deadline(),
+        generator=_arg_value("--generator") or MESSAGE_GENERATOR,
+    )
+
+
+def run_platform(
+    platform,
+    sessions: list[ProfileSession],
+    state_path: Path | None = None,
+    timer: StageTimer | None = None,
+    probe: bool = False,
+    deadline: Deadline | None = None,
+) -> Counter:
+    """
+    Run crawler for the given platform across all profile sessions (fair interleaving).
+    Returns outcome counts (found, sent, generated, skipped, failed, deferred, circuit_open,
+    deadline_missed) plus poll counts (probes, scans, unchanged). state_path overrides the
+    state database (replay runs use a throwaway one); probe enables the cheap change probe
+    before each full search. deadline bounds the cycle: navigation, generation and sending
+    stop when it passes, and lower-ranked listings are deferred once it comes close.
+    """
+    ctx = _make_context(state_path, timer, probe=probe, deadline=deadline)
+    try:
+        stale = ctx.state.outbox.recover_stale()
+        if stale:
+            console.print(f"[yellow]{stale} unterbrochene Sendungen als 'unknown' markiert (prüfen, dann requeue)[/yellow]")
+        with deadline_scope(ctx.deadline):
+            stats = _run_cycle(platform, sessions, ctx)
+        stats.update(ctx.polls)
+        remaining = ctx.deadline.remaining()
+        if remaining is not None and remaining < 0:
+            stats["deadline_missed"] = 1
+            console.print(f"[red]Zeitbudget um {-remaining:.0f}s überschritten ({ctx.deadline.budget:.0f}s)[/red]")
+        return stats
+    finally:
+        ctx.state.close()
+
+
+def _run_cycle(platform, sessions: list[ProfileSession], ctx: CycleContext) -> Counter:
+    multi = len(sessions) > 1
+
+    # Login + search per profile
+    queues: list[tuple[ProfileSession, list[Listing]]] = []
+    for session in sessions:
         console.print()
+        title = f"Anmeldung & Suche – {session.name}" if multi else "Anmeldung & Suche"
+        console.print(Rule(f"[bold]{title}[/bold]", style="blue"))
+        try:
+            listings = _search_session(platform, session, ctx)
+        except CircuitOpenError as e:
+            console.print(f"[yellow]Suche übersprungen ({session.name}): {e}[/yellow]")
+            continue
+        except DeadlineExceeded as e:
+            console.print(f"[yellow]Suche abgebrochen ({session.name}): {e}[/yellow]")
+            break
+        except Exception as e:
+            console.print(f"[red]Fehler ({session.name}): {e}[/red]")
+            continue
+        queues.append((session, listings))
+
+    age_info = "alle Anzeigen (Debug)" if ctx.debug else "unter 1 Stunde alt"
+    stats = _process_found(platform, queues, ctx, age_info)
+    # The probe remembered these searches before their listings were handled: rescan them next
+    # cycle, or an unchanged top of the page would hide the listings that failed
+    for session, listing in ctx.unfinished:
+        if listing.search_url:
+            ctx.state.probes.forget(session.name, listing.search_url)
+    if not stats["found"]:
+        console.print("[yellow]Keine neuen Anzeigen gefunden.[/yellow]")
+    _drain_outbox(platform, sessions, ctx, stats)
+    return stats
+
+
+def _drain_outbox(platform, sessions: list[ProfileSession], ctx: CycleContext, stats: Counter) -> None:
+    """
+    Deliver outbox entries that are due (pending, or failed with elapsed backoff) within the
+    cycle's time budget, also for ads that no longer show up in the search.
+    """
+    if ctx.no_send or ctx.deadline.expired:
+        return
+    due = [s for s in sessions if not s.messages and ctx.state.outbox.due(s.name, limit=1)]
+    if not due:
+        return
+    console.print()
+    console.print(Rule("[bold]Outbox[/bold]", style="blue"))
+    ready = []
+    for session in due:
+        try:
+            # A session whose search the probe skipped hasn't logged in this cycle
+            with ctx.timer.stage("login"), session.pages.lease("search") as page:
+                platform.login(page, email=session.profile.email, password=session.profile.password)
+            ready.append(session)
+        except Exception as e:
+            console.print(f"[yellow]Outbox ({session.name}) übersprungen: {e}[/yellow]")
+    counts = drain(platform, ready, ctx.state, ctx.timer, deadline=ctx.deadline)
+    stats["sent"] += counts.get("sent", 0)
+    stats["failed"] += sum(counts.get(k, 0) for k in ("failed", "dead", "unknown"))
+
+
+def _process_found(
+    platform,
+    queues: list[tuple[ProfileSession, list[Listing]]],
+    ctx: CycleContext,
+    age_info: str,
+) -> Counter:
+    """Record found listings and process them, one per profile in turn."""
+    state = ctx.state
+    multi = len(queues) > 1
+    stats: Counter = Counter()
+    for session, listings in queues:
+        state.history.record_listings(session.name, listings)
+        state.freshness.record_discovered(session.name, listings)
+    queues = [(session, _drop_contacted(session, listings, ctx, stats)) for session, listings in queues]
+    queues = [(session, listings) for session, listings in queues if listings]
+
+    total = sum(len(items) for _, items in queues)
+    stats["found"] = total
+    if not total:
+        return stats
+
+    console.print(f"[green]Gefunden: {total} Anzeigen[/green] ({age_info})")
+
+    # Best match first within each profile's queue
+    scores: dict[tuple[str, str], float] = {}
+    if ctx.rank:
+        with ctx.timer.stage("rank"):
+            ranked_queues = []
+            for session, listings in queues:
+                cached = state.details.cached([lst.ad_id for lst in listings])
+                ranked = rank(listings, session.persona, details=cached, min_score=ctx.min_score)
+                scores.update({(session.name, lst.ad_id): score for lst, score in ranked})
+                ranked_queues.append((session, [lst for lst, _ in ranked]))
+        queues = [(session, listings) for session, listings in ranked_queues if listings]
+        below = total - len(scores)
+        total = len(scores)
+        stats["below_cutoff"] = below
+        if below:
+            console.print(f"[dim]{below} Anzeigen unter Mindest-Relevanz {ctx.min_score:g} übersprungen[/dim]")
+    console.print()
+
+    durations: list[float] = []
+    order = list(round_robin(queues))
+    for i, (session, listing) in enumerate(order, 1):
+        # Queues are ranked, so whatever doesn't fit the budget is the least relevant rest
+        remaining = ctx.deadline.remaining()
+        estimate = percentile(durations, 90) if len(durations) >= 3 else LISTING_ESTIMATE_SECONDS
+        if remaining is not None and remaining < estimate:
+            _defer(order[i - 1:], ctx, stats)
+            console.print(
+                f"[yellow]Zeitbudget: noch {max(remaining, 0):.0f}s, ~{estimate:.0f}s pro Anzeige – "
+                f"{total - i + 1} Anzeigen auf den nächsten Lauf verschoben[/yellow]"
+            )
+            break
+        label = f"Anzeige {i}/{total}" + (f" · {session.name}" if multi else "")
+        score = scores.get((session.name, listing.ad_id))
+        if score is not None:
+            label += f" · Relevanz {score:.2f}"
+        t0 = time.perf_counter()
+        try:
+            outcome = _process_listing(platform, session, listing, label, ctx)
+            stats[outcome] += 1
+            if outcome in ("failed", "deferred"):
+                ctx.unfinished.append((session, listing))
+        except CircuitOpenError as e:
+            # Degraded site: stop here; deferring makes the next cycle rescan their search pages
+            _defer(order[i - 1:], ctx, stats)
+            stats["circuit_open"] = total - i + 1
+            console.print(f"[yellow]{e} – {stats['circuit_open']} Anzeigen auf den nächsten Lauf verschoben[/yellow]")
+            break
+        except DeadlineExceeded as e:
+            _defer(order[i - 1:], ctx, stats)
+            console.print(f"[yellow]{e} – {total - i + 1} Anzeigen auf den nächsten Lauf verschoben[/yellow]")
+            break
+        except Exception as e:
+            console.print(f"  [red]Fehler: {e}[/red]")
+            stats["failed"] += 1
+            ctx.unfinished.append((session, listing))
+        durations.append(time.perf_counter() - t0)
+    return stats
+
+
+def _drop_contacted(session: ProfileSession, listings: list[Listing], ctx: CycleContext, stats: Counter) -> list[Listing]:
+    """
+    Listings whose ad isn't in the synced inbox yet. With INBOX_SKIP_LANDLORDS, also drops ads
+    whose cached details name a landlord already written to.
+    """
+    if not listings:
+        return listings
+    inbox = ctx.state.inbox
+    contacted = inbox.contacted_ids(session.name, [lst.ad_id for lst in listings])
+    if INBOX_SKIP_LANDLORDS:
+        cached = ctx.state.details.cached([lst.ad_id for lst in listings if lst.ad_id not in contacted])
+        contacted.update(
+            ad_id for ad_id, details in cached.items()
+            if inbox.landlord_contacted(session.name, details.publisher_name)
+        )
+    if contacted:
+        stats["inbox_contacted"] += len(contacted)
+        console.print(f"[dim]{len(contacted)} Anzeigen laut Postfach bereits angeschrieben ({session.name}), übersprungen[/dim]")
+    return [lst for lst in listings if lst.ad_id not in contacted]
+
+
+def _defer(rest: list[tuple[ProfileSession, Listing]], ctx: CycleContext, stats: Counter) -> None:
+    """Count deferred listings; as unfinished ones, their search pages are rescanned next cycle."""
+    stats["deferred"] += len(rest)
+    ctx.unfinished.extend(rest)
+
+
+def run_watch(
+    platform,
+    sessions: list[ProfileSession],
+    interval: float,
+    state_path: Path | None = None,
+) -> Counter:
+    """
+    Watch mode: log in once, keep each profile's search tab open and refresh the results in
+    place every interval seconds; only newly appeared listings go through the pipeline.
+    Runs until interrupted (Ctrl+C). Returns the summed outcome counts.
+    """
+    ctx = _make_context(state_path)
+    stats: Counter = Counter()
+    with ExitStack() as stack:
+        stack.callback(ctx.state.close)
+        watchers = []
+        queues: list[tuple[ProfileSession, list[Listing]]] = []
+        for session in sessions:
+            console.print()
+            console.print(Rule(f"[bold]Anmeldung & Beobachtung – {session.name}[/bold]", style="blue"))
+            page = stack.enter_context(session.pages.lease("search"))
+            try:
+                platform.login(page, email=session.profile.email, password=session.profile.password)
+                save_session(session)
+                session.pages.warm(page.url)
+                _sync_inbox(platform, session, ctx, page)
+                rules = compile_rules(session.persona.filters if session.persona else None)
+                options = dict(include_all=ctx.debug, search_urls=session.search_urls, prefilter=rules)
+                watcher = platform.create_watcher(page, **options) or _SearchPoller(platform, page, **options)
+                with ctx.timer.stage("search"):
+                    queues.append((session, watcher.prime()))
+            except Exception as e:
+                console.print(f"[red]Fehler ({session.name}): {e}[/red]")
+                continue
+            watchers.append((session, watcher))
+        stats.update(_process_found(platform, queues, ctx, "aktuell online"))
+        _rewatch_unfinished(watchers, ctx)
+
+        console.print(f"[dim]Beobachte {len(watchers)} Profil(e), Abfrage alle {interval:g}s (Strg+C beendet)[/dim]")
+        try:
+            while watchers:
+                time.sleep(interval)
+                queues = []
+                for session, watcher in watchers:
+                    _sync_inbox(platform, session, ctx, watcher.page)
+                    try:
+                        with ctx.timer.stage("poll"):
+                            queues.append((session, watcher.poll()))
+                    except Exception as e:
+                        console.print(f"[red]Fehler beim Aktualisieren ({session.name}): {e}[/red]")
+                found = _process_found(platform, queues, ctx, "neu seit letzter Abfrage")
+                stats.update(found)
+                _rewatch_unfinished(watchers, ctx)
+                if found["found"]:
+                    console.print(f"[dim]Beobachte weiter, Abfrage alle {interval:g}s...[/dim]")
+        except KeyboardInterrupt:
+            console.print("[dim]Beobachtung beendet.[/dim]")
+    return stats
+
+
+class _SearchPoller:
+    """Watcher for platforms without a live one: a full search per poll, new ad_ids only."""
+
+    def __init__(self, platform, page, include_all: bool = False, search_urls=None, prefilter=None):
+        self.platform = platform
+        self.page = page
+        self.include_all = include_all
+        self.search_urls = search_urls
+        self.prefilter = prefilter
+        self.seen: set[str] = set()
+
+    def prime(self) -> list[Listing]:
+        return self.poll()
+
+    def poll(self) -> list[Listing]:
+        listings = self.platform.run_search(
+            self.page, include_all=self.include_all, search_urls=self.search_urls, prefilter=self.prefilter
+        )
+        new = [lst for lst in listings if lst.ad_id not in self.seen]
+        self.seen.update(lst.ad_id for lst in new)
+        return new
+
+    def forget(self, ad_ids) -> None:
+        self.seen.difference_update(ad_ids)
+
+
+def _rewatch_unfinished(watchers: list, ctx: CycleContext) -> None:
+    """Let each watcher emit its listings without a final outcome again on the next poll."""
+    for session, watcher in watchers:
+        watcher.forget(lst.ad_id for s, lst in ctx.unfinished if s is session)
+    ctx.unfinished.clear()
+
+
+def _print_timings(timer: StageTimer) -> None:
+    """Per-stage wall time of the last cycle."""
+    table = Table(title=f"Laufzeit: {timer.elapsed:.1f}s gesamt")
+    for col in ("Phase", "Anzahl", "Summe (s)", "Ø (s)", "Max (s)"):
+        table.add_column(col, justify="right" if col != "Phase" else "left")
+    for name, count, total, mean, worst in timer.summary():
+        table.add_row(name, str(count), f"{total:.2f}", f"{mean:.2f}", f"{worst:.2f}")
+    console.print()
+    console.print(table)
+
+
+def _print_providers() -> None:
+    """Per-provider health of the LLM router (requests, latency, rate limits, errors)."""
+    rows = get_router().health()
+    if not any(row["requests"] for row in rows):
+        return
+    table = Table(title="KI-Anbieter")
+    for col in ("Anbieter", "Anfragen", "OK", "429", "Fehler", "p50 (s)", "p90 (s)", "Status"):
+        table.add_column(col, justify="right" if col not in ("Anbieter", "Status") else "left")
+    for row in rows:
+        status = "bereit" if row["available"] else f"pausiert ({row['last_error'][:60]})"
+        table.add_row(
+            row["name"], str(row["requests"]), str(row["successes"]), str(row["rate_limited"]),
+            str(row["failures"]), *(f"{row[k]:.2f}" if row[k] is not None else "–" for k in ("p50", "p90")), status,
+        )
+    console.print(table)
 
 
 def main() -> None:
@@ -138,6 +781,24 @@ def main() -> None:
         run_setup()
         return
 
+    # Anzeigen-Historie
+    if len(sys.argv) >= 2 and sys.argv[1].lower() == "history":
+        from history import run_history
+        run_history(sys.argv[2:])
+        return
+
+    # Warmer Browser-Server
+    if len(sys.argv) >= 2 and sys.argv[1].lower() == "browser":
+        from browser_server import run_browser_server
+        run_browser_server(sys.argv[2:])
+        return
+
+    # Outbox / Sender
+    if len(sys.argv) >= 2 and sys.argv[1].lower() == "outbox":
+        from outbox import run_outbox
+        run_outbox(sys.argv[2:])
+        return
+
     # Banner
     console.print()
     console.print(Panel.fit(
@@ -149,35 +810,123 @@ def main() -> None:
     platform = PLATFORMS["wggesucht"]
     use_schedule = "--schedule" in sys.argv or AUTO_RUN_ENABLED
 
-    if use_schedule:
+    if "--watch" in sys.argv:
+        console.print(f"[dim]Modus: Live-Beobachtung, alle {WATCH_INTERVAL_SECONDS}s[/dim]")
+    elif use_schedule:
         console.print(f"[dim]Modus: Alle {RUN_INTERVAL_MINUTES} Min.[/dim]")
     else:
         console.print("[dim]Modus: Einmal durchlaufen[/dim]")
 
+    budget = None if "--watch" in sys.argv else cycle_budget(use_schedule)
+    if budget:
+        console.print(f"[dim]Zeitbudget pro Lauf: {budget:.0f}s[/dim]")
+
     if "--no-send" in sys.argv:
         console.print("[yellow]Hinweis: Nachrichten werden nicht gesendet (--no-send)[/yellow]")
 
+    generator = _arg_value("--generator") or MESSAGE_GENERATOR
+    if generator == "local":
+        console.print("[dim]Anschreiben aus lokalen Vorlagen (ohne KI)[/dim]")
+    elif generator == "fallback":
+        console.print("[dim]Anschreiben per KI, lokale Vorlage falls kein KI-Anbieter verfügbar[/dim]")
+    if generator != "local" and len(get_router().providers) > 1:
+        console.print(f"[dim]KI-Anbieter (schnellster verfügbarer zuerst): {get_router().label()}[/dim]")
+
     show_browser = "--visible" in sys.argv or "-v" in sys.argv
     if show_browser:
         console.print("[dim]Browser sichtbar (--visible)[/dim]")
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=not show_browser)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 900},
-            locale="de-DE",
+    try:
+        browser_profile = launch_profile()
+    except (KeyError, ValueError) as e:
+        console.print(f"[red]{e.args[0]}[/red]")
+        return
+    if browser_profile.name != "default":
+        width, height = browser_profile.viewport
+        console.print(
+            f"[dim]Browser-Profil: {browser_profile.name} ({width}x{height}, Skalierung {browser_profile.device_scale_factor:g})[/dim]"
         )
-        page = context.new_page()
 
+    try:
+        profiles = get_profiles()
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    selected = _arg_value("--profile")
+    if selected:
+        profiles = [pr for pr in profiles if pr.name == selected]
+        if not profiles:
+            console.print(f"[red]Profil nicht gefunden: {selected}[/red]")
+            return
+    if len(profiles) > 1:
+        console.print(f"[dim]Profile: {', '.join(pr.name for pr in profiles)}[/dim]")
+
+    workers = int(_arg_value("--workers") or 1)
+    if workers > 1:
+        from workers import run_sharded
+
+        console.print(f"[dim]Parallel: {workers} Worker-Prozesse[/dim]")
+        run_sharded(profiles, workers, use_schedule, console, probe=use_schedule and "--no-probe" not in sys.argv)
+        console.print()
+        console.print(Rule("[bold green]Fertig[/bold green]", style="green"))
+        return
+
+    record = _arg_value("--record")
+    replay = _arg_value("--replay")
+    if record or replay:
+        console.print(f"[dim]{'Aufzeichnung nach' if record else 'Wiedergabe aus'} {record or replay}[/dim]")
+    multi = len(profiles) > 1
+
+    with sync_playwright() as p:
+        # A warm browser server (flatscraper browser start) saves the launch and the login form;
+        # record/replay always start from a fresh browser so cycles stay comparable
+        use_server = not (record or replay or show_browser) and "--no-server" not in sys.argv
+        browser, server = attach_or_launch(p, browser_profile, headless=not show_browser, use_server=use_server)
+        if server:
+            console.print(f"[dim]Verbunden mit Browser-Server {server.endpoint} (angemeldet: {server.profile})[/dim]")
+        sessions = [
+            open_session(
+                browser,
+                profile,
+                record_har=har_path_for(record, profile.name, multi) if record else None,
+                replay_har=har_path_for(replay, profile.name, multi) if replay else None,
+                platform=platform,
+                launch_profile=browser_profile,
+                context=server_context(browser, server, profile.name),
+            )
+            for profile in profiles
+        ]
+        replay_state = Path(tempfile.mkdtemp(prefix="flatscraper-replay-")) / "state.db" if replay else None
+
+        watch = "--watch" in sys.argv
+        if watch:
+            run_watch(platform, sessions, WATCH_INTERVAL_SECONDS, state_path=replay_state)
+
+        # Two-tier polling: only scheduled runs probe before the full search
+        probe = use_schedule and not (record or replay) and "--no-probe" not in sys.argv
+        polls: Counter = Counter()
         cycle = 0
-        while True:
+        while not watch:
             cycle += 1
             if use_schedule and cycle > 1:
                 console.print()
                 console.print(f"[dim]Nächster Lauf in {RUN_INTERVAL_MINUTES} Minuten...[/dim]")
                 time.sleep(RUN_INTERVAL_MINUTES * 60)
 
-            run_platform(platform, page)
+            timer = StageTimer()
+            stats = run_platform(
+                platform, sessions, state_path=replay_state, timer=timer, probe=probe, deadline=Deadline(budget)
+            )
+            if record or replay or "--timings" in sys.argv:
+                _print_timings(timer)
+                _print_providers()
+            elif len(get_router().providers) > 1:
+                _print_providers()
+            if probe:
+                polls.update({k: stats[k] for k in ("probes", "scans", "unchanged")})
+                console.print(
+                    f"[dim]Abfragen: {polls['probes']} Vorab-Prüfungen, {polls['scans']} vollständige Suchen, "
+                    f"{polls['unchanged']} Suchen gespart[/dim]"
+                )
 
             if not use_schedule:
                 break
@@ -187,19 +936,20 @@ def main() -> None:
         # Abschluss
         console.print()
         console.print(Rule("[bold green]Fertig[/bold green]", style="green"))
-        if not use_schedule:
+        if not use_schedule and not watch:
             console.print("FlatScraper wurde einmal durchlaufen.")
 
         if "--quick" in sys.argv:
             time.sleep(5)
-            browser.close()
         else:
             try:
                 console.print()
                 input("Enter drücken zum Beenden...")
             except EOFError:
                 pass
-            browser.close()
+        for session in sessions:
+            close_session(session)
+        browser.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""
+Profile sessions: one isolated BrowserContext per profile inside a single shared Chromium.
+Each context carries its own cookies/storage state, so N profiles cost N contexts, not N browsers.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, TypeVar
+
+from playwright.sync_api import Browser, BrowserContext
+
+from config import load_user_profile_from
+from launch import LAUNCH_PROFILES, LaunchProfile, context_options
+from models import ScraperProfile, UserProfile
+from pages import PagePool
+from replay import MessageArchive, install_replay, record_context_options
+
+T = TypeVar("T")
+
+_DONE = object()
+
+VIEWPORT = {"width": 1280, "height": 900}
+LOCALE = "de-DE"
+
+
+@dataclass
+class ProfileSession:
+    """Runtime state for one profile: its context, role tabs and resolved persona."""
+
+    profile: ScraperProfile
+    persona: UserProfile | None
+    context: BrowserContext
+    pages: PagePool
+    messages: MessageArchive | None = None
+    replaying: bool = False
+    owns_context: bool = True  # False for a warm browser server's context, which outlives the run
+
+    @property
+    def name(self) -> str:
+        return self.profile.name
+
+    @property
+    def search_urls(self) -> list[str] | None:
+        """The profile's URLs, else its own user_profile's; None = the platform's defaults."""
+        if self.profile.search_urls:
+            return self.profile.search_urls
+        return (self.persona.search_urls if self.persona else None) or None
+
+
+def open_session(
+    browser: Browser,
+    profile: ScraperProfile,
+    record_har: Path | None = None,
+    replay_har: Path | None = None,
+    platform=None,
+    launch_profile: LaunchProfile | None = None,
+    context: BrowserContext | None = None,
+) -> ProfileSession:
+    """
+    Create an isolated context for profile, restoring its storage state if present.
+    record_har/replay_har start a fresh context (no storage state) that records to or
+    replays from a HAR archive, so recorded and replayed cycles take the same path.
+    platform.prepare_context() runs before the role tabs open (consent, overlay scripts).
+    launch_profile sets viewport and device scale (default: 1280x900 at scale 1).
+    context reuses an existing, already logged-in context (warm browser server) instead of
+    creating one; it is left open by close_session.
+    """
+    owns_context = context is None
+    if context is None:
+        options: dict = {**context_options(launch_profile or LAUNCH_PROFILES["default"]), "locale": LOCALE}
+        if record_har:
+            options.update(record_context_options(record_har))
+        elif not replay_har and profile.storage_state and Path(profile.storage_state).exists():
+            options["storage_state"] = profile.storage_state
+        context = browser.new_context(**options)
+    if replay_har:
+        install_replay(context, replay_har)
+    if platform:
+        platform.prepare_context(context)
+    persona = load_user_profile_from(Path(profile.user_profile)) if profile.user_profile else None
+    har = record_har or replay_har
+    return ProfileSession(
+        profile=profile,
+        persona=persona,
+        context=context,
+        pages=PagePool(context),
+        messages=MessageArchive(har) if har else None,
+        replaying=replay_har is not None,
+        owns_context=owns_context,
+    )
+
+
+def save_session(session: ProfileSession) -> None:
+    """Persist cookies/localStorage so the next run can skip the login form."""
+    if not session.profile.storage_state or session.messages:
+        return
+    path = Path(session.profile.storage_state)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        session.context.storage_state(path=str(path))
+    except Exception:
+        pass
+
+
+def close_session(session: ProfileSession) -> None:
+    save_session(session)
+    session.pages.close()
+    if not session.owns_context:
+        return
+    try:
+        session.context.close()
+    except Exception:
+        pass
+
+
+def round_robin(queues: list[tuple[ProfileSession, list[T]]]) -> Iterator[tuple[ProfileSession, T]]:
+    """
+    Fair interleaving: yield one item per session in turn until all queues are drained,
+    so a profile with many hits cannot starve the others.
+    """
+    iterators = [(session, iter(items)) for session, items in queues]
+    while iterators:
+        remaining = []
+        for session, it in iterators:
+            item = next(it, _DONE)
+            if item is _DONE:
+                continue
+            remaining.append((session, it))
+            yield session, item
+        iterators = remaining
@@ -0,0 +1,821 @@
+"""
+Local SQLite state shared by all FlatScraper processes (.flatscraper/flatscraper.db).
+WAL mode lets several worker processes read and write concurrently.
+"""
+
+import hashlib
+import sqlite3
+import time
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+
+from config import DB_PATH
+from models import Conversation, Listing, ListingDetails, ListingRecord, OutboxEntry
+from neardup import THRESHOLD, band_keys, minhash, shingles, similarity
+from normalize import ad_type_from_url, parse_area, parse_date, parse_euro, price_per_m2
+from timing import percentile
+
+_CONTACTED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacted (
+    profile    TEXT NOT NULL,
+    ad_id      TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    owner      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (profile, ad_id)
+)
+"""
+
+_DETAILS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listing_details (
+    ad_id        TEXT PRIMARY KEY,
+    card_hash    TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    details_json TEXT NOT NULL,
+    first_seen   REAL NOT NULL,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_listing_details_content ON listing_details (content_hash);
+"""
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listing_history (
+    ad_id          TEXT PRIMARY KEY,
+    profile        TEXT NOT NULL DEFAULT '',
+    title          TEXT NOT NULL DEFAULT '',
+    url            TEXT NOT NULL DEFAULT '',
+    search_url     TEXT NOT NULL DEFAULT '',
+    ad_type        TEXT NOT NULL DEFAULT 'wg',
+    address        TEXT NOT NULL DEFAULT '',
+    price_eur      REAL,
+    size_m2        REAL,
+    price_per_m2   REAL,
+    available_from TEXT,
+    first_seen     REAL NOT NULL,
+    last_seen      REAL NOT NULL,
+    detailed_at    REAL
+);
+CREATE INDEX IF NOT EXISTS idx_history_price ON listing_history (price_eur);
+CREATE INDEX IF NOT EXISTS idx_history_ppm ON listing_history (price_per_m2);
+CREATE INDEX IF NOT EXISTS idx_history_size ON listing_history (size_m2);
+CREATE INDEX IF NOT EXISTS idx_history_type_seen ON listing_history (ad_type, first_seen);
+"""
+
+_OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    profile         TEXT NOT NULL,
+    ad_id           TEXT NOT NULL,
+    listing_url     TEXT NOT NULL,
+    message         TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL,
+    last_error      TEXT NOT NULL DEFAULT '',
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL,
+    PRIMARY KEY (profile, ad_id)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, next_attempt_at);
+"""
+
+_FRESHNESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS freshness (
+    profile       TEXT NOT NULL,
+    ad_id         TEXT NOT NULL,
+    search_url    TEXT NOT NULL DEFAULT '',
+    published_at  REAL,
+    discovered_at REAL NOT NULL,
+    generated_at  REAL,
+    sent_at       REAL,
+    PRIMARY KEY (profile, ad_id)
+);
+CREATE INDEX IF NOT EXISTS idx_freshness_discovered ON freshness (discovered_at);
+"""
+
+_PROBE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_probe (
+    profile    TEXT NOT NULL,
+    search_url TEXT NOT NULL,
+    top_ids    TEXT NOT NULL,
+    scanned_at REAL NOT NULL,
+    PRIMARY KEY (profile, search_url)
+)
+"""
+
+_SIMILARITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listing_minhash (
+    ad_id     TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS listing_lsh (
+    band   INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    ad_id  TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, ad_id)
+) WITHOUT ROWID;
+"""
+
+_INBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inbox_conversations (
+    profile         TEXT NOT NULL,
+    conversation_id TEXT NOT NULL,
+    ad_id           TEXT NOT NULL DEFAULT '',
+    landlord        TEXT NOT NULL DEFAULT '',
+    synced_at       REAL NOT NULL,
+    PRIMARY KEY (profile, conversation_id)
+);
+CREATE INDEX IF NOT EXISTS idx_inbox_ad ON inbox_conversations (profile, ad_id);
+CREATE INDEX IF NOT EXISTS idx_inbox_landlord ON inbox_conversations (profile, landlord);
+CREATE TABLE IF NOT EXISTS inbox_sync (
+    profile   TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+OUTBOX_COLUMNS = (
+    "profile", "ad_id", "listing_url", "message", "status", "attempts",
+    "next_attempt_at", "last_error", "created_at", "updated_at",
+)
+
+HISTORY_COLUMNS = (
+    "ad_id", "profile", "title", "url", "search_url", "ad_type", "address",
+    "price_eur", "size_m2", "price_per_m2", "available_from", "first_seen", "last_seen",
+)
+
+
+def _fingerprint(*parts: str) -> str:
+    normalized = "\x1f".join(" ".join((p or "").split()).lower() for p in parts)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def card_fingerprint(listing: Listing) -> str:
+    """Hash of what the search card shows (title, price, size)."""
+    return _fingerprint(listing.title, listing.price, listing.size)
+
+
+def content_fingerprint(details: ListingDetails) -> str:
+    """Hash of the detail page content relevant for the Anschreiben."""
+    return _fingerprint(
+        details.title,
+        details.address,
+        details.full_description,
+        details.rent,
+        details.size,
+        details.available_from,
+        details.publisher_name,
+    )
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column_def: str) -> None:
+    """Add a column introduced after the table was created (CREATE IF NOT EXISTS won't)."""
+    name = column_def.split()[0]
+    if name not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column_def}")
+
+
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    """Open the state database (autocommit, WAL, 30s busy timeout)."""
+    path = Path(path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class DedupStore:
+    """
+    Per-profile claim table so no ad is contacted twice, across cycles and worker processes.
+    A claim is a lease: if its owner dies without marking the ad sent, it expires after lease_seconds.
+    """
+
+    def __init__(self, path: Path | None = None, lease_seconds: float = 1800):
+        self.lease_seconds = lease_seconds
+        self._conn = connect(path)
+        self._conn.execute(_CONTACTED_SCHEMA)
+
+    def claim(self, profile: str, ad_id: str, owner: str) -> bool:
+        """Atomically claim ad_id for owner. False if already sent or leased by someone else."""
+        now = time.time()
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT status, owner, updated_at FROM contacted WHERE profile = ? AND ad_id = ?",
+                (profile, ad_id),
+            ).fetchone()
+            if row:
+                status, current_owner, updated_at = row
+                if status == "sent":
+                    conn.execute("ROLLBACK")
+                    return False
+                if current_owner != owner and now - updated_at < self.lease_seconds:
+                    conn.execute("ROLLBACK")
+                    return False
+            conn.execute(
+                "INSERT OR REPLACE INTO contacted (profile, ad_id, status, owner, updated_at) "
+                "VALUES (?, ?, 'claimed', ?, ?)",
+                (profile, ad_id, owner, now),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def mark_sent(self, profile: str, ad_id: str) -> None:
+        self._conn.execute(
+            "UPDATE contacted SET status = 'sent', updated_at = ? WHERE profile = ? AND ad_id = ?",
+            (time.time(), profile, ad_id),
+        )
+
+    def release(self, profile: str, ad_id: str) -> None:
+        """Drop an unfinished claim (e.g. --no-send or failed send) so a later cycle can retry."""
+        self._conn.execute(
+            "DELETE FROM contacted WHERE profile = ? AND ad_id = ? AND status = 'claimed'",
+            (profile, ad_id),
+        )
+
+    def is_sent(self, profile: str, ad_id: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM contacted WHERE profile = ? AND ad_id = ? AND status = 'sent'",
+            (profile, ad_id),
+        ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class DetailCache:
+    """
+    Extracted ListingDetails keyed by ad_id, with card and content fingerprints.
+    An unchanged card means the cached details can be reused without loading the detail page.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self._conn = connect(path)
+        self._conn.executescript(_DETAILS_SCHEMA)
+
+    def lookup(self, listing: Listing) -> tuple[ListingDetails | None, str]:
+        """
+        Returns (cached details, state). state is "new" (never seen), "unchanged"
+        (card identical, details returned) or "changed" (card edited – re-extract).
+        """
+        row = self._conn.execute(
+            "SELECT card_hash, details_json FROM listing_details WHERE ad_id = ?",
+            (listing.ad_id,),
+        ).fetchone()
+        if not row:
+            return None, "new"
+        card_hash, details_json = row
+        if card_hash != card_fingerprint(listing):
+            return None, "changed"
+        try:
+            return ListingDetails.model_validate_json(details_json), "unchanged"
+        except Exception:
+            return None, "changed"
+
+    def cached(self, ad_ids: list[str]) -> dict[str, ListingDetails]:
+        """Last extracted details for the given ads (no freshness check – for ranking only)."""
+        found: dict[str, ListingDetails] = {}
+        for start in range(0, len(ad_ids), 500):
+            chunk = ad_ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT ad_id, details_json FROM listing_details WHERE ad_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for ad_id, details_json in rows:
+                try:
+                    found[ad_id] = ListingDetails.model_validate_json(details_json)
+                except Exception:
+                    pass
+        return found
+
+    def save(self, listing: Listing, details: ListingDetails) -> str | None:
+        """
+        Store freshly extracted details. Returns the ad_id of an earlier ad with identical
+        content (a re-post under a new id), or None.
+        """
+        now = time.time()
+        content_hash = content_fingerprint(details)
+        repost = self._conn.execute(
+            "SELECT ad_id FROM listing_details WHERE content_hash = ? AND ad_id != ? LIMIT 1",
+            (content_hash, listing.ad_id),
+        ).fetchone()
+        self._conn.execute(
+            "INSERT INTO listing_details "
+            "(ad_id, card_hash, content_hash, details_json, first_seen, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(ad_id) DO UPDATE SET card_hash = excluded.card_hash, "
+            "content_hash = excluded.content_hash, details_json = excluded.details_json, "
+            "updated_at = excluded.updated_at",
+            (listing.ad_id, card_fingerprint(listing), content_hash, details.model_dump_json(), now, now),
+        )
+        return repost[0] if repost else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class HistoryStore:
+    """Append-only (upserted by ad_id) history of every listing seen, with typed columns."""
+
+    def __init__(self, path: Path | None = None):
+        self._conn = connect(path)
+        self._conn.executescript(_HISTORY_SCHEMA)
+        _ensure_column(self._conn, "listing_history", "detailed_at REAL")
+
+    def record_listings(self, profile: str, listings: list[Listing]) -> None:
+        """
+        Insert newly seen search cards; refresh last_seen and card values for known ones. Price
+        and size from a detail page (record_details) are kept: the card's are less accurate.
+        """
+        now = time.time()
+        rows = []
+        for lst in listings:
+            price = parse_euro(lst.price)
+            size = parse_area(lst.size)
+            rows.append((
+                lst.ad_id, profile, lst.title, lst.url, lst.search_url, ad_type_from_url(lst.url),
+                price, size, price_per_m2(price, size), now, now,
+            ))
+        self._conn.executemany(
+            "INSERT INTO listing_history "
+            "(ad_id, profile, title, url, search_url, ad_type, price_eur, size_m2, price_per_m2, "
+            "first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(ad_id) DO UPDATE SET last_seen = excluded.last_seen, "
+            "title = excluded.title, "
+            "price_eur = CASE WHEN listing_history.detailed_at IS NULL "
+            "THEN COALESCE(excluded.price_eur, listing_history.price_eur) ELSE listing_history.price_eur END, "
+            "size_m2 = CASE WHEN listing_history.detailed_at IS NULL "
+            "THEN COALESCE(excluded.size_m2, listing_history.size_m2) ELSE listing_history.size_m2 END, "
+            "price_per_m2 = CASE WHEN listing_history.detailed_at IS NULL "
+            "THEN COALESCE(excluded.price_per_m2, listing_history.price_per_m2) ELSE listing_history.price_per_m2 END",
+            rows,
+        )
+
+    def record_details(self, details: ListingDetails) -> None:
+        """Enrich a history row with detail-page values (Gesamtmiete, address, ad type, date)."""
+        if not details.ad_id:
+            return
+        price = parse_euro(details.rent)
+        size = parse_area(details.size)
+        available = parse_date(details.available_from)
+        self._conn.execute(
+            "UPDATE listing_history SET ad_type = ?, address = ?, "
+            "price_eur = COALESCE(?, price_eur), size_m2 = COALESCE(?, size_m2), "
+            "available_from = COALESCE(?, available_from), detailed_at = ? WHERE ad_id = ?",
+            (details.ad_type, details.address, price, size,
+             available.isoformat() if available else None, time.time(), details.ad_id),
+        )
+        self._conn.execute(
+            "UPDATE listing_history SET price_per_m2 = ROUND(price_eur / size_m2, 2) "
+            "WHERE ad_id = ? AND price_eur IS NOT NULL AND size_m2 > 0",
+            (details.ad_id,),
+        )
+
+    def query(
+        self,
+        *,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_size: float | None = None,
+        max_size: float | None = None,
+        max_price_per_m2: float | None = None,
+        ad_type: str | None = None,
+        since: datetime | None = None,
+        available_before: date | None = None,
+        order_by: str = "first_seen",
+        limit: int | None = 100,
+    ) -> list[ListingRecord]:
+        """Filter history rows; every predicate is backed by an index."""
+        where: list[str] = []
+        params: list = []
+        for column, op, value in (
+            ("price_eur", ">=", min_price),
+            ("price_eur", "<=", max_price),
+            ("size_m2", ">=", min_size),
+            ("size_m2", "<=", max_size),
+            ("price_per_m2", "<=", max_price_per_m2),
+            ("ad_type", "=", ad_type),
+            ("first_seen", ">=", since.timestamp() if since else None),
+            ("available_from", "<=", available_before.isoformat() if available_before else None),
+        ):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        if order_by not in HISTORY_COLUMNS:
+            raise ValueError(f"Unknown column: {order_by}")
+        direction = "DESC" if order_by in ("first_seen", "last_seen") else "ASC"
+        sql = f"SELECT {', '.join(HISTORY_COLUMNS)} FROM listing_history"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} {direction}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_history_record(row) for row in self._conn.execute(sql, params)]
+
+    def rows(self) -> sqlite3.Cursor:
+        """Raw cursor over all rows in HISTORY_COLUMNS order (for export)."""
+        return self._conn.execute(
+            f"SELECT {', '.join(HISTORY_COLUMNS)} FROM listing_history ORDER BY first_seen"
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _history_record(row: tuple) -> ListingRecord:
+    data = dict(zip(HISTORY_COLUMNS, row))
+    data["first_seen"] = datetime.fromtimestamp(data["first_seen"])
+    data["last_seen"] = datetime.fromtimestamp(data["last_seen"])
+    return ListingRecord.model_validate(data)
+
+
+class Outbox:
+    """
+    Durable queue of generated messages, one per (profile, ad_id).
+    Sending is idempotent: an entry goes pending -> sending -> sent exactly once. A send that
+    was interrupted (stale 'sending') becomes 'unknown' and is never retried automatically.
+    """
+
+    MAX_ATTEMPTS = 5
+    BACKOFF_BASE_SECONDS = 60.0
+    BACKOFF_MAX_SECONDS = 3600.0
+
+    def __init__(self, path: Path | None = None):
+        self._conn = connect(path)
+        self._conn.executescript(_OUTBOX_SCHEMA)
+
+    def enqueue(self, profile: str, ad_id: str, listing_url: str, message: str) -> bool:
+        """Store a generated message. False if the ad already has an outbox entry."""
+        now = time.time()
+        cur = self._conn.execute(
+            "INSERT OR IGNORE INTO outbox (profile, ad_id, listing_url, message, status, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, 'pending', ?, ?)",
+            (profile, ad_id, listing_url, message, now, now),
+        )
+        return cur.rowcount == 1
+
+    def get(self, profile: str, ad_id: str) -> OutboxEntry | None:
+        row = self._conn.execute(
+            f"SELECT {', '.join(OUTBOX_COLUMNS)} FROM outbox WHERE profile = ? AND ad_id = ?",
+            (profile, ad_id),
+        ).fetchone()
+        return _outbox_entry(row) if row else None
+
+    def due(self, profile: str | None = None, limit: int = 50) -> list[OutboxEntry]:
+        """Entries ready to send now (pending, or failed with elapsed backoff)."""
+        sql = (
+            f"SELECT {', '.join(OUTBOX_COLUMNS)} FROM outbox "
+            "WHERE (status = 'pending' OR (status = 'failed' AND next_attempt_at <= ?))"
+        )
+        params: list = [time.time()]
+        if profile is not None:
+            sql += " AND profile = ?"
+            params.append(profile)
+        sql += " ORDER BY created_at LIMIT ?"
+        params.append(limit)
+        return [_outbox_entry(row) for row in self._conn.execute(sql, params)]
+
+    def begin_send(self, profile: str, ad_id: str) -> bool:
+        """Atomically move a sendable entry to 'sending'. False if another sender got it first."""
+        cur = self._conn.execute(
+            "UPDATE outbox SET status = 'sending', attempts = attempts + 1, updated_at = ? "
+            "WHERE profile = ? AND ad_id = ? AND status IN ('pending', 'failed')",
+            (time.time(), profile, ad_id),
+        )
+        return cur.rowcount == 1
+
+    def mark_sent(self, profile: str, ad_id: str) -> None:
+        self._conn.execute(
+            "UPDATE outbox SET status = 'sent', last_error = '', updated_at = ? "
+            "WHERE profile = ? AND ad_id = ?",
+            (time.time(), profile, ad_id),
+        )
+
+    def mark_failed(self, profile: str, ad_id: str, error: str) -> str:
+        """Schedule a retry with exponential backoff; 'dead' after MAX_ATTEMPTS. Returns the new status."""
+        entry = self.get(profile, ad_id)
+        attempts = entry.attempts if entry else self.MAX_ATTEMPTS
+        status = "dead" if attempts >= self.MAX_ATTEMPTS else "failed"
+        delay = min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+        now = time.time()
+        self._conn.execute(
+            "UPDATE outbox SET status = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+            "WHERE profile = ? AND ad_id = ?",
+            (status, error[:500], now + delay, now, profile, ad_id),
+        )
+        return status
+
+    def mark_unknown(self, profile: str, ad_id: str, error: str) -> str:
+        """A send whose outcome can't be told (it may have gone out): park it, never retry automatically."""
+        self._conn.execute(
+            "UPDATE outbox SET status = 'unknown', last_error = ?, updated_at = ? WHERE profile = ? AND ad_id = ?",
+            (error[:500], time.time(), profile, ad_id),
+        )
+        return "unknown"
+
+    def recover_stale(self, lease_seconds: float = 300) -> int:
+        """Sends interrupted by a crash: outcome unknown, so park them instead of risking a duplicate."""
+        cur = self._conn.execute(
+            "UPDATE outbox SET status = 'unknown', last_error = 'Senden unterbrochen', updated_at = ? "
+            "WHERE status = 'sending' AND updated_at < ?",
+            (time.time(), time.time() - lease_seconds),
+        )
+        return cur.rowcount
+
+    def requeue(self, profile: str, ad_id: str) -> bool:
+        """Manually release an 'unknown', 'dead' or 'failed' entry for sending."""
+        cur = self._conn.execute(
+            "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = NULL, updated_at = ? "
+            "WHERE profile = ? AND ad_id = ? AND status IN ('unknown', 'dead', 'failed')",
+            (time.time(), profile, ad_id),
+        )
+        return cur.rowcount == 1
+
+    def entries(self, status: str | None = None, limit: int = 100) -> list[OutboxEntry]:
+        sql = f"SELECT {', '.join(OUTBOX_COLUMNS)} FROM outbox"
+        params: list = []
+        if status:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+        return [_outbox_entry(row) for row in self._conn.execute(sql, params)]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _outbox_entry(row: tuple) -> OutboxEntry:
+    data = dict(zip(OUTBOX_COLUMNS, row))
+    for key in ("next_attempt_at", "created_at", "updated_at"):
+        if data[key] is not None:
+            data[key] = datetime.fromtimestamp(data[key])
+    return OutboxEntry.model_validate(data)
+
+
+class FreshnessStore:
+    """
+    Per-listing timeline: estimated publication (discovery time minus the card's online age),
+    discovery, generation and send. Age at contact = sent_at - published_at.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self._conn = connect(path)
+        self._conn.executescript(_FRESHNESS_SCHEMA)
+
+    def record_discovered(self, profile: str, listings: list[Listing], now: float | None = None) -> None:
+        """First sighting only: later sightings would only make the age estimate coarser."""
+        now = now or time.time()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO freshness (profile, ad_id, search_url, published_at, discovered_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (profile, lst.ad_id, lst.search_url,
+                 now - lst.age_minutes * 60 if lst.age_minutes is not None else None, now)
+                for lst in listings
+            ],
+        )
+
+    def mark(self, profile: str, ad_id: str, stage: str, now: float | None = None) -> None:
+        """Record the first time stage ("generated" or "sent") was reached."""
+        if stage not in ("generated", "sent"):
+            raise ValueError(f"Unknown stage: {stage}")
+        column = f"{stage}_at"
+        self._conn.execute(
+            f"UPDATE freshness SET {column} = COALESCE({column}, ?) WHERE profile = ? AND ad_id = ?",
+            (now or time.time(), profile, ad_id),
+        )
+
+    def report(self, by: str = "search_url", since: datetime | None = None) -> list[tuple]:
+        """
+        Rows of (group, found, sent, discovery lag p50, age at contact p50, p90) in minutes,
+        grouped by search URL or by hour of day of publication.
+        """
+        if by not in ("search_url", "hour"):
+            raise ValueError(f"Unknown grouping: {by}")
+        sql = "SELECT search_url, published_at, discovered_at, sent_at FROM freshness WHERE published_at IS NOT NULL"
+        params: list = []
+        if since:
+            sql += " AND discovered_at >= ?"
+            params.append(since.timestamp())
+        groups: dict[str, tuple[list[float], list[float]]] = {}
+        for search_url, published, discovered, sent in self._conn.execute(sql, params):
+            key = search_url if by == "search_url" else f"{datetime.fromtimestamp(published).hour:02d}:00"
+            lags, ages = groups.setdefault(key, ([], []))
+            lags.append((discovered - published) / 60)
+            if sent is not None:
+                ages.append((sent - published) / 60)
+        return [
+            (key, len(lags), len(ages), percentile(lags, 50), percentile(ages, 50), percentile(ages, 90))
+            for key, (lags, ages) in sorted(groups.items())
+        ]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ProbeStore:
+    """Top ad_ids per (profile, search URL) as of the last completed full scan."""
+
+    def __init__(self, path: Path | None = None):
+        self._conn = connect(path)
+        self._conn.executescript(_PROBE_SCHEMA)
+
+    def changed(self, profile: str, search_url: str, top_ids: list[str] | None) -> bool:
+        """True if the probe saw an ad_id the last full scan did not (or nothing is known)."""
+        if not top_ids:
+            return True
+        row = self._conn.execute(
+            "SELECT top_ids FROM search_probe WHERE profile = ? AND search_url = ?", (profile, search_url)
+        ).fetchone()
+        if row is None:
+            return True
+        return not set(top_ids) <= set(row[0].split(","))
+
+    def remember(self, profile: str, search_url: str, top_ids: list[str] | None) -> None:
+        if not top_ids:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO search_probe (profile, search_url, top_ids, scanned_at) VALUES (?, ?, ?, ?)",
+            (profile, search_url, ",".join(top_ids), time.time()),
+        )
+
+    def forget(self, profile: str, search_url: str) -> None:
+        """Drop the remembered scan, so the next probe reports the URL as changed."""
+        self._conn.execute(
+            "DELETE FROM search_probe WHERE profile = ? AND search_url = ?", (profile, search_url)
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SimilarityIndex:
+    """
+    MinHash/LSH index over extracted details. A lookup reads one indexed bucket per band and
+    compares signatures only for those candidates, so it stays fast with tens of thousands of ads.
+    """
+
+    def __init__(self, path: Path | None = None, threshold: float = THRESHOLD):
+        self.threshold = threshold
+        self._conn = connect(path)
+        self._conn.executescript(_SIMILARITY_SCHEMA)
+
+    def find(self, details: ListingDetails, signature: list[int] | None = None) -> list[tuple[str, float]]:
+        """
+        Other ads at or above the threshold as (ad_id, estimated Jaccard), most similar first.
+        The index spans all profiles; callers filter by what the profile has contacted.
+        """
+        signature = signature or minhash(shingles(details))
+        candidates: set[str] = set()
+        for band, bucket in enumerate(band_keys(signature)):
+            candidates.update(
+                row[0] for row in self._conn.execute(
+                    "SELECT ad_id FROM listing_lsh WHERE band = ? AND bucket = ? AND ad_id != ?",
+                    (band, bucket, details.ad_id),
+                )
+            )
+        matches: list[tuple[str, float]] = []
+        for ad_id in candidates:
+            row = self._conn.execute(
+                "SELECT signature FROM listing_minhash WHERE ad_id = ?", (ad_id,)
+            ).fetchone()
+            if not row:
+                continue
+            score = similarity(signature, list(array("I", row[0])))
+            if score >= self.threshold:
+                matches.append((ad_id, score))
+        return sorted(matches, key=lambda m: m[1], reverse=True)
+
+    def add(self, details: ListingDetails) -> list[tuple[str, float]]:
+        """Index details (replacing an older version of the ad); returns find() for it first."""
+        signature = minhash(shingles(details))
+        matches = self.find(details, signature)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM listing_lsh WHERE ad_id = ?", (details.ad_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO listing_minhash (ad_id, signature) VALUES (?, ?)",
+                (details.ad_id, array("I", signature).tobytes()),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO listing_lsh (band, bucket, ad_id) VALUES (?, ?, ?)",
+                [(band, bucket, details.ad_id) for band, bucket in enumerate(band_keys(signature))],
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return matches
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def normalize_landlord(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class InboxStore:
+    """
+    Conversations synced from the account's inbox: which ads and landlords this profile has
+    already written to, including messages sent from the app or another device.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self._conn = connect(path)
+        self._conn.executescript(_INBOX_SCHEMA)
+
+    def known(self, profile: str, conversation_ids: list[str]) -> set[str]:
+        """The given conversation ids that are already stored."""
+        found: set[str] = set()
+        for start in range(0, len(conversation_ids), 500):
+            chunk = conversation_ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT conversation_id FROM inbox_conversations WHERE profile = ? "
+                f"AND conversation_id IN ({','.join('?' * len(chunk))})",
+                [profile, *chunk],
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def add(self, profile: str, conversations: list[Conversation], now: float | None = None) -> None:
+        now = now or time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO inbox_conversations (profile, conversation_id, ad_id, landlord, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(profile, c.conversation_id, c.ad_id, normalize_landlord(c.landlord), now) for c in conversations],
+            )
+
+    def contacted_ids(self, profile: str, ad_ids: list[str]) -> set[str]:
+        """The given ad_ids that have a conversation in the inbox."""
+        found: set[str] = set()
+        for start in range(0, len(ad_ids), 500):
+            chunk = ad_ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT ad_id FROM inbox_conversations WHERE profile = ? AND ad_id IN ({','.join('?' * len(chunk))})",
+                [profile, *chunk],
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def landlord_contacted(self, profile: str, name: str) -> bool:
+        """
+        Whether a conversation exists with this full name. Bare first names ("Lisa") are shared by
+        too many publishers to identify anyone, so they never match.
+        """
+        name = normalize_landlord(name)
+        if len(name.split()) < 2:
+            return False
+        row = self._conn.execute(
+            "SELECT 1 FROM inbox_conversations WHERE profile = ? AND landlord = ? LIMIT 1", (profile, name)
+        ).fetchone()
+        return row is not None
+
+    def last_sync(self, profile: str) -> float | None:
+        row = self._conn.execute("SELECT synced_at FROM inbox_sync WHERE profile = ?", (profile,)).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, profile: str, now: float | None = None) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO inbox_sync (profile, synced_at) VALUES (?, ?)", (profile, now or time.time())
+        )
+
+    def count(self, profile: str) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM inbox_conversations WHERE profile = ?", (profile,)
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class StateStore:
+    """All state tables for one process."""
+
+    def __init__(self, path: Path | None = None):
+        self.dedup = DedupStore(path)
+        self.details = DetailCache(path)
+        self.history = HistoryStore(path)
+        self.outbox = Outbox(path)
+        self.freshness = FreshnessStore(path)
+        self.probes = ProbeStore(path)
+        self.similar = SimilarityIndex(path)
+        self.inbox = InboxStore(path)
+
+    def close(self) -> None:
+        self.dedup.close()
+        self.details.close()
+        self.history.close()
+        self.outbox.close()
+        self.freshness.close()
+        self.probes.close()
+        self.similar.close()
+        self.inbox.close()
@@ -0,0 +1,128 @@
+"""Tests for adaptive navigation timeouts and the per-host circuit breaker."""
+
+import pytest
+
+from breaker import MIN_TIMEOUT_MS, TRIAL_SECONDS, CircuitBreaker, CircuitOpenError, HostGuard
+from timing import Deadline, DeadlineExceeded, deadline_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+
+
+class FakePage:
+    def __init__(self, fail: bool = False, status: int = 200):
+        self.fail = fail
+        self.status = status
+        self.timeouts: list[int] = []
+
+    def goto(self, url, wait_until=None, timeout=None):
+        self.timeouts.append(timeout)
+        if self.fail:
+            raise TimeoutError("Timeout exceeded")
+        return FakeResponse(self.status)
+
+
+def test_timeout_defaults_until_enough_samples_then_tracks_p99():
+    guard = HostGuard("www.wg-gesucht.de", factor=3.0)
+    for _ in range(5):
+        guard.observe("detail", 2.0)
+    assert guard.timeout_ms("detail", 25000) == 25000
+    for _ in range(10):
+        guard.observe("detail", 2.0)
+    assert guard.timeout_ms("detail", 25000) == 6000
+    for _ in range(20):
+        guard.observe("search", 0.1)
+    assert guard.timeout_ms("search", 45000) == MIN_TIMEOUT_MS
+    for _ in range(20):
+        guard.observe("slow", 30.0)
+    assert guard.timeout_ms("slow", 45000) == 45000
+
+
+def test_breaker_opens_after_consecutive_failures_and_backs_off():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=30, max_cooldown=100, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow() and breaker.state == "half_open"
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.retry_in() == 60
+
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.retry_in() == 100  # capped
+
+    clock.now += 100
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.cooldown == 30
+
+
+def test_half_open_admits_a_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow(claim=False)
+    assert breaker.allow()
+    assert not breaker.allow() and not breaker.allow(claim=False)
+    assert breaker.retry_in() == TRIAL_SECONDS
+
+    clock.now += TRIAL_SECONDS  # trial never reported back
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_navigate_fails_fast_once_open():
+    guard = HostGuard("www.wg-gesucht.de", breaker=CircuitBreaker(failure_threshold=2, clock=FakeClock()))
+    page = FakePage(fail=True)
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            guard.navigate(page, "https://www.wg-gesucht.de/a.html", "detail", 25000)
+    with pytest.raises(CircuitOpenError):
+        guard.navigate(page, "https://www.wg-gesucht.de/b.html", "detail", 25000)
+    assert len(page.timeouts) == 2
+
+
+def test_server_errors_count_as_failures():
+    guard = HostGuard("www.wg-gesucht.de", breaker=CircuitBreaker(failure_threshold=2, clock=FakeClock()))
+    page = FakePage(status=503)
+    guard.navigate(page, "https://www.wg-gesucht.de/", "search", 45000)
+    guard.navigate(page, "https://www.wg-gesucht.de/", "search", 45000)
+    assert guard.breaker.state == "open"
+    assert not guard.samples["search"]
+
+
+def test_navigation_cut_by_cycle_deadline_is_not_a_host_failure():
+    clock = FakeClock()
+    guard = HostGuard("www.wg-gesucht.de", breaker=CircuitBreaker(failure_threshold=1, clock=clock))
+    page = FakePage(fail=True)
+    with deadline_scope(Deadline(2, clock=clock)):
+        with pytest.raises(TimeoutError):
+            guard.navigate(page, "https://www.wg-gesucht.de/a.html", "detail", 25000)
+        assert page.timeouts == [2000]
+        assert guard.breaker.state == "closed"
+        clock.now += 3
+        with pytest.raises(DeadlineExceeded):
+            guard.navigate(page, "https://www.wg-gesucht.de/a.html", "detail", 25000)
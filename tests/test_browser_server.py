@@ -0,0 +1,73 @@
+"""Tests for browser_server module (warm browser server discovery)."""
+
+import json
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import browser_server
+from browser_server import read_info, running, server_context
+from models import BrowserServerInfo
+
+
+@pytest.fixture
+def cdp_endpoint():
+    """Minimal stand-in for Chromium's /json/version."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = json.dumps({"Browser": "HeadlessChrome/130.0"}).encode()
+            self.send_response(200 if self.path == "/json/version" else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _write(path, pid, endpoint, profile="anna"):
+    info = BrowserServerInfo(pid=pid, endpoint=endpoint, profile=profile, started_at=datetime.now())
+    path.write_text(info.model_dump_json(), encoding="utf-8")
+    return info
+
+
+def test_read_info_missing_or_broken(tmp_path):
+    assert read_info(tmp_path / "missing.json") is None
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    assert read_info(tmp_path / "broken.json") is None
+
+
+def test_running_needs_live_process_and_endpoint(tmp_path, cdp_endpoint):
+    path = tmp_path / "browser-server.json"
+    _write(path, os.getpid(), cdp_endpoint)
+    assert running(path).profile == "anna"
+
+    _write(path, os.getpid(), "http://127.0.0.1:1")
+    assert running(path) is None
+
+
+def test_stop_removes_stale_info(tmp_path, monkeypatch):
+    path = tmp_path / "browser-server.json"
+    _write(path, os.getpid(), "http://127.0.0.1:1")
+    monkeypatch.setattr(browser_server, "_pid_alive", lambda pid: False)
+    browser_server.stop(path)
+    assert not path.exists()
+
+
+def test_server_context_only_for_its_profile():
+    class FakeBrowser:
+        contexts = ["logged-in"]
+
+    info = BrowserServerInfo(pid=1, endpoint="http://127.0.0.1:1", profile="anna", started_at=datetime.now())
+    assert server_context(FakeBrowser(), info, "anna") == "logged-in"
+    assert server_context(FakeBrowser(), info, "ben") is None
+    assert server_context(FakeBrowser(), None, "anna") is None
@@ -109,3 +109,88 @@ def test_get_search_urls_empty_when_no_profile(monkeypatch, tmp_path):
 
     result = config_mod.get_search_urls()
     assert result == []
+
+
+def test_get_profiles_default_from_env(monkeypatch, tmp_path):
+    """Without profiles.json, a single 'default' profile is built from .env + user_profile.json."""
+    import config as config_mod
+
+    monkeypatch.setattr(config_mod, "PROFILES_PATH", tmp_path / "profiles.json")
+    monkeypatch.setattr(config_mod, "PROFILE_PATH", tmp_path / "nonexistent.json")
+    monkeypatch.setattr(config_mod, "STATE_DIR", tmp_path / "state")
+    monkeypatch.setattr(config_mod, "_user_profile", None)
+    monkeypatch.setattr(config_mod, "EMAIL", "env@example.com")
+
+    profiles = config_mod.get_profiles()
+    assert len(profiles) == 1
+    assert profiles[0].name == "default"
+    assert profiles[0].email == "env@example.com"
+    assert profiles[0].storage_state == str(tmp_path / "state" / "default.storage.json")
+
+
+def test_get_profiles_from_file(monkeypatch, tmp_path):
+    """profiles.json entries are loaded; relative paths resolve against the project root."""
+    import config as config_mod
+
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(
+        json.dumps([
+            {"name": "anna", "email": "anna@example.com", "user_profile": "anna.json"},
+            {"name": "ben", "search_urls": ["https://wg-gesucht.de/ben"]},
+        ]),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config_mod, "PROFILES_PATH", profiles_path)
+    monkeypatch.setattr(config_mod, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(config_mod, "STATE_DIR", tmp_path / "state")
+    monkeypatch.setattr(config_mod, "EMAIL", "env@example.com")
+
+    anna, ben = config_mod.get_profiles()
+    assert anna.email == "anna@example.com"
+    assert anna.user_profile == str(tmp_path / "anna.json")
+    assert ben.email == "env@example.com"
+    assert ben.search_urls == ["https://wg-gesucht.de/ben"]
+    assert ben.storage_state == str(tmp_path / "state" / "ben.storage.json")
+
+
+def test_get_profiles_rejects_invalid_file(monkeypatch, tmp_path):
+    """A broken profiles.json is an error, not a silent fallback to the .env account."""
+    import config as config_mod
+
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text('[{"email": "anna@example.com"}]', encoding="utf-8")
+    monkeypatch.setattr(config_mod, "PROFILES_PATH", profiles_path)
+
+    with pytest.raises(ValueError, match="profiles.json"):
+        config_mod.get_profiles()
+
+
+def test_get_llm_providers_defaults_to_groq(monkeypatch, tmp_path):
+    """Without llm_providers.json the Groq settings form the single provider."""
+    import config as config_mod
+
+    monkeypatch.setattr(config_mod, "PROVIDERS_PATH", tmp_path / "nonexistent.json")
+    monkeypatch.setattr(config_mod, "GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(config_mod, "GROQ_BASE_URL", "http://127.0.0.1:8766/")
+
+    (provider,) = config_mod.get_llm_providers()
+    assert provider.base_url == "http://127.0.0.1:8766/openai/v1"
+    assert provider.api_key == "gsk_test"
+
+
+def test_get_llm_providers_resolves_api_key_env(monkeypatch, tmp_path):
+    """Keys named by api_key_env are read from the environment."""
+    import config as config_mod
+
+    path = tmp_path / "llm_providers.json"
+    path.write_text(json.dumps([
+        {"name": "openai", "base_url": "https://api.openai.com/v1", "model": "gpt-4o-mini", "api_key_env": "TEST_LLM_KEY"},
+        {"name": "local", "base_url": "http://127.0.0.1:8080/v1", "model": "llama"},
+    ]), encoding="utf-8")
+    monkeypatch.setattr(config_mod, "PROVIDERS_PATH", path)
+    monkeypatch.setenv("TEST_LLM_KEY", "sk-test")
+
+    providers = config_mod.get_llm_providers()
+    assert [p.name for p in providers] == ["openai", "local"]
+    assert providers[0].api_key == "sk-test"
+    assert providers[1].api_key == ""
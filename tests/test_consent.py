@@ -0,0 +1,60 @@
+"""Tests for WG-Gesucht consent persistence and overlay suppression."""
+
+from platforms.wggesucht.consent import (
+    has_consent,
+    is_consent_cookie,
+    load_consent,
+    overlay_script,
+    prepare_context,
+    save_consent,
+)
+
+
+class FakeContext:
+    def __init__(self, cookies: list[dict] | None = None):
+        self._cookies = cookies or []
+        self.added: list[dict] = []
+        self.scripts: list[str] = []
+
+    def cookies(self, url=None):
+        return self._cookies
+
+    def add_cookies(self, cookies):
+        self.added.extend(cookies)
+
+    def add_init_script(self, script=None, path=None):
+        self.scripts.append(script)
+
+
+def _cookie(name: str) -> dict:
+    return {"name": name, "value": "1", "domain": ".wg-gesucht.de", "path": "/"}
+
+
+def test_consent_cookie_names():
+    assert is_consent_cookie("__cmpcc")
+    assert is_consent_cookie("__cmpconsentx12345")
+    assert is_consent_cookie("euconsent-v2")
+    assert not is_consent_cookie("PHPSESSID")
+    assert not is_consent_cookie("X-Client-Id")
+
+
+def test_consent_roundtrip_into_new_context(tmp_path):
+    path = tmp_path / "consent.json"
+    browsed = FakeContext([_cookie("__cmpcc"), _cookie("PHPSESSID")])
+    assert has_consent(browsed)
+    assert save_consent(browsed, path) == 1
+    assert [c["name"] for c in load_consent(path)] == ["__cmpcc"]
+
+    fresh = FakeContext()
+    assert not has_consent(fresh)
+    prepare_context(fresh, path)
+    assert [c["name"] for c in fresh.added] == ["__cmpcc"]
+    assert fresh.scripts == [overlay_script()]
+
+
+def test_prepare_context_without_saved_consent(tmp_path):
+    context = FakeContext()
+    prepare_context(context, tmp_path / "missing.json")
+    assert context.added == []
+    assert '"#sec_advice"' in context.scripts[0] and '"#cmpbox"' in context.scripts[0]
+    assert '"#login_modal"' in context.scripts[0]
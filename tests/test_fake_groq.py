@@ -0,0 +1,61 @@
+"""Tests for the local Groq/OpenAI-compatible stand-in."""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from bench.fake_groq import FakeGroq, FakeLLMConfig
+from groq_client import _parse_retry_after
+
+
+def _post(url: str, payload: dict) -> tuple[int, str]:
+    req = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, resp.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+_REQUEST = {"model": "fake", "messages": [{"role": "user", "content": "Hallo"}]}
+
+
+def test_completion():
+    with FakeGroq(FakeLLMConfig(latency_ms=1, distribution="fixed")) as server:
+        status, body = _post(server.base_url + "/openai/v1/chat/completions", _REQUEST)
+    assert status == 200
+    content = json.loads(body)["choices"][0]["message"]["content"]
+    assert content.startswith("Hallo")
+
+
+def test_streaming():
+    with FakeGroq(FakeLLMConfig(latency_ms=1, distribution="fixed")) as server:
+        status, body = _post(server.base_url + "/v1/chat/completions", {**_REQUEST, "stream": True})
+    assert status == 200
+    chunks = [line[6:] for line in body.splitlines() if line.startswith("data: ")]
+    assert chunks[-1] == "[DONE]"
+    text = "".join(json.loads(c)["choices"][0]["delta"].get("content", "") for c in chunks[:-1])
+    assert text.startswith("Hallo")
+
+
+def test_tpm_limit_returns_429_with_retry_hint():
+    with FakeGroq(FakeLLMConfig(latency_ms=1, distribution="fixed", tpm=100)) as server:
+        url = server.base_url + "/openai/v1/chat/completions"
+        assert _post(url, _REQUEST)[0] == 200
+        status, body = _post(url, _REQUEST)
+        assert server.stats.rate_limited == 1
+    assert status == 429
+    wait = _parse_retry_after(Exception(json.loads(body)["error"]["message"]))
+    assert wait is not None and 0 < wait <= 60
+
+
+def test_groq_sdk_against_fake():
+    groq = pytest.importorskip("groq")
+    with FakeGroq(FakeLLMConfig(latency_ms=1, distribution="fixed")) as server:
+        client = groq.Groq(api_key="test", base_url=server.base_url)
+        completion = client.chat.completions.create(**_REQUEST)
+    assert completion.choices[0].message.content.startswith("Hallo")
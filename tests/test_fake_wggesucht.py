@@ -0,0 +1,81 @@
+"""Tests for the local WG-Gesucht stand-in server."""
+
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from bench.fake_wggesucht import FakeSiteConfig, FakeWgGesucht
+from platforms.wggesucht.search import _parse_online_age
+
+
+def _get(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.read().decode("utf-8")
+
+
+def _post(url: str, data: dict) -> str:
+    body = urllib.parse.urlencode(data).encode()
+    with urllib.request.urlopen(url, data=body, timeout=5) as resp:
+        return resp.read().decode("utf-8")
+
+
+@pytest.fixture
+def site():
+    with FakeWgGesucht(FakeSiteConfig(cards=5, partner_cards=2)) as s:
+        yield s
+
+
+def test_search_page_cards_and_partner_section(site):
+    page = _get(site.base_url + "/wg-zimmer-in-Muenchen.90.0.1.0.html")
+    assert page.count('class="wgg_card offer_list_item"') == 7
+    assert "Weitere Angebote von verifizierten Anbietern" in page
+    ages = re.findall(r"Online: ([^<]+)", page)
+    assert all(_parse_online_age(a)[0] is not None for a in ages)
+    assert len(re.findall(r'href="/[^"]+\.\d{5,}\.html"', page)) == 7
+
+
+def test_search_is_stable_without_churn(site):
+    url = site.base_url + "/wg-zimmer-in-Muenchen.90.0.1.0.html"
+    assert _get(url) == _get(url)
+
+
+def test_churn_adds_new_ads():
+    with FakeWgGesucht(FakeSiteConfig(cards=3, partner_cards=0, churn=2)) as s:
+        url = s.base_url + "/wg-zimmer-in-Muenchen.90.0.1.0.html"
+        first = set(re.findall(r"\.(\d{5,})\.html", _get(url)))
+        second = set(re.findall(r"\.(\d{5,})\.html", _get(url)))
+        assert len(second - first) == 2
+
+
+def test_detail_page_blocks(site):
+    ad = site.ad(1234567)
+    page = _get(site.base_url + ad["path"])
+    assert "<h3>Adresse</h3>" in page
+    assert "Gesamtmiete:" in page
+    assert "Das Zimmer ist" in page
+    assert ("WG-Details" in page) == ad["is_wg"]
+
+
+def test_login_and_message_flow(site):
+    assert "Abmelden" not in _get(site.base_url + "/")
+    assert "Abmelden" in _post(site.base_url + "/ajax/sessions.php", {"login_email_username": "a@b.de"})
+    path = "/nachricht-senden" + site.ad(1234567)["path"]
+    assert "conversation_send_button" in _get(site.base_url + path)
+    token = re.search(r"name='csrf_token' value='(\w+)'", _get(site.base_url + path)).group(1)
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _post(site.base_url + path, {"message": "Hallo", "csrf_token": "wrong"})
+    assert exc.value.code == 403
+    assert "erfolgreich gesendet" in _post(site.base_url + path, {"message": "Hallo", "csrf_token": token})
+    assert site.stats.messages == [("1234567", "Hallo")]
+    assert "Unterhaltung ansehen" in _get(site.base_url + site.ad(1234567)["path"])
+
+
+def test_failure_injection():
+    with FakeWgGesucht(FakeSiteConfig(failure_rate=1.0)) as s:
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _get(s.base_url + "/")
+        assert exc.value.code == 503
+        assert s.stats.failures == 1
@@ -0,0 +1,96 @@
+"""Tests for the inbox sync against the local WG-Gesucht stand-in."""
+
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from bench.fake_wggesucht import INBOX_PAGE_SIZE, FakeSiteConfig, FakeWgGesucht
+from platforms.base import EmptyInboxError
+from platforms.wggesucht.config import BASE_URL
+from platforms.wggesucht.inbox import parse_conversations, sync_inbox
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: str):
+        self.status = status
+        self.ok = 200 <= status < 300
+        self._body = body
+
+    def text(self) -> str:
+        return self._body
+
+
+class FakeRequest:
+    def __init__(self, site: FakeWgGesucht):
+        self.site = site
+        self.urls: list[str] = []
+
+    def get(self, url: str, timeout: float, max_redirects: int) -> FakeResponse:
+        self.urls.append(url)
+        local = self.site.base_url + "/" + url.removeprefix(BASE_URL)
+        try:
+            with urllib.request.urlopen(local, timeout=5) as resp:
+                return FakeResponse(resp.status, resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            return FakeResponse(e.code, "")
+
+
+class FakePage:
+    def __init__(self, site: FakeWgGesucht):
+        self.context = type("Context", (), {"request": FakeRequest(site)})()
+
+
+@pytest.fixture
+def site():
+    with FakeWgGesucht(FakeSiteConfig(cards=5, partner_cards=0)) as s:
+        body = urllib.parse.urlencode({"login_email_username": "a@b.de"}).encode()
+        urllib.request.urlopen(s.base_url + "/ajax/sessions.php", data=body, timeout=5).close()
+        yield s
+
+
+def test_parse_conversations_reads_id_ad_and_partner():
+    page = (
+        '<div class="conversation_list_item" data-conversation-id="51">'
+        '<span class="conversation_partner_name"> Anna &amp; Ben </span>'
+        '<a href="/wg-zimmer-in-Muenchen.1234567.html">Anzeige</a></div>'
+        '<div data-conversation-id="50"><a href="/nachricht.html?nachrichten-id=50">ohne Anzeige</a></div>'
+    )
+    [first, second] = parse_conversations(page)
+    assert (first.conversation_id, first.ad_id, first.landlord) == ("51", "1234567", "Anna & Ben")
+    assert (second.conversation_id, second.ad_id, second.landlord) == ("50", "", "")
+
+
+def test_sync_pages_until_known_conversations(site):
+    for i in range(INBOX_PAGE_SIZE + 5):
+        site.contact_from_phone(2_000_000 + i)
+    page = FakePage(site)
+    stored: set[str] = set()
+    new = sync_inbox(page, lambda ids: stored & set(ids))
+    assert len(new) == INBOX_PAGE_SIZE + 5
+    assert new[0].ad_id == str(2_000_000 + INBOX_PAGE_SIZE + 4)  # newest first
+    assert new[0].landlord == site.ad(2_000_000 + INBOX_PAGE_SIZE + 4)["publisher"]
+    stored.update(c.conversation_id for c in new)
+
+    site.contact_from_phone(3_000_000)
+    page.context.request.urls.clear()
+    [latest] = sync_inbox(page, lambda ids: stored & set(ids))
+    assert latest.ad_id == "3000000"
+    assert len(page.context.request.urls) == 2  # page 2 holds nothing new
+
+    page.context.request.urls.clear()
+    stored.add(latest.conversation_id)
+    assert sync_inbox(page, lambda ids: stored & set(ids)) == []
+    assert len(page.context.request.urls) == 1
+
+
+def test_sync_fails_when_logged_out(site):
+    site.logged_in = False
+    with pytest.raises(RuntimeError):
+        sync_inbox(FakePage(site), lambda ids: set())
+
+
+def test_sync_without_recognized_conversations_is_an_error(site):
+    with pytest.raises(EmptyInboxError, match="keine Unterhaltungen"):
+        sync_inbox(FakePage(site), lambda ids: set())
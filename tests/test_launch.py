@@ -0,0 +1,50 @@
+"""Tests for launch module (browser launch profiles)."""
+
+import pytest
+
+import launch
+from launch import LAUNCH_PROFILES, context_options, launch_options, parse_viewport, resolve_launch_profile
+
+
+def test_default_profile_is_stock_launch():
+    options = launch_options(LAUNCH_PROFILES["default"], headless=True)
+    assert options == {"headless": True}
+    assert context_options(LAUNCH_PROFILES["default"]) == {
+        "viewport": {"width": 1280, "height": 900},
+        "device_scale_factor": 1.0,
+    }
+
+
+def test_lean_profiles_disable_background_features():
+    for name in ("minimal", "shell", "new-headless"):
+        args = launch_options(LAUNCH_PROFILES[name])["args"]
+        for flag in ("--disable-gpu", "--disable-extensions", "--disable-background-networking"):
+            assert flag in args
+    assert launch_options(LAUNCH_PROFILES["new-headless"])["channel"] == "chromium"
+
+
+def test_parse_viewport():
+    assert parse_viewport("1024x768") == (1024, 768)
+    assert parse_viewport("800X600") == (800, 600)
+    with pytest.raises(ValueError):
+        parse_viewport("1024")
+
+
+def test_resolve_overrides(monkeypatch):
+    monkeypatch.setattr(launch, "BROWSER_PROFILE", "minimal")
+    monkeypatch.setattr(launch, "BROWSER_VIEWPORT", "")
+    monkeypatch.setattr(launch, "BROWSER_DEVICE_SCALE", 0.0)
+    assert resolve_launch_profile().name == "minimal"
+
+    profile = resolve_launch_profile("shell", "800x600", 0.5)
+    assert profile.name == "shell"
+    assert context_options(profile) == {"viewport": {"width": 800, "height": 600}, "device_scale_factor": 0.5}
+    assert LAUNCH_PROFILES["shell"].viewport == (1024, 768)
+
+    monkeypatch.setattr(launch, "BROWSER_VIEWPORT", "1920x1080")
+    assert resolve_launch_profile("default").viewport == (1920, 1080)
+
+
+def test_unknown_profile():
+    with pytest.raises(KeyError):
+        resolve_launch_profile("turbo")
@@ -0,0 +1,134 @@
+"""Tests for llm module (provider routing and health stats)."""
+
+import pytest
+
+from llm import ProviderError, RateLimited, Router, parse_duration, parse_retry_after
+from timing import Deadline, DeadlineExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeProvider:
+    """Scripted backend: each call pops the next outcome (str reply or exception)."""
+
+    def __init__(self, name, clock, latency=1.0, outcomes=None, headers=None):
+        self.name = name
+        self.clock = clock
+        self.latency = latency
+        self.outcomes = list(outcomes or [])
+        self.headers = headers or {}
+        self.calls = 0
+
+    def complete(self, messages, timeout, **params):
+        self.calls += 1
+        self.clock.now += self.latency
+        outcome = self.outcomes.pop(0) if self.outcomes else f"Hallo von {self.name}"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome, self.headers
+
+
+MESSAGES = [{"role": "user", "content": "Hallo"}]
+
+
+class TestParsing:
+    def test_parse_duration_formats(self):
+        assert parse_duration("7.66s") == pytest.approx(7.66)
+        assert parse_duration("2m59.56s") == pytest.approx(179.56)
+        assert parse_duration("120ms") == pytest.approx(0.12)
+        assert parse_duration("3") == 3.0
+        assert parse_duration("soon") is None
+        assert parse_duration(None) is None
+
+    def test_retry_after_from_message_then_header(self):
+        assert parse_retry_after("Please try again in 1.234s.") == pytest.approx(1.234)
+        assert parse_retry_after("rate limited", {"retry-after": "4"}) == 4.0
+        assert parse_retry_after("rate limited") is None
+
+
+class TestRouter:
+    def test_explores_untried_then_prefers_fastest(self):
+        clock = FakeClock()
+        slow = FakeProvider("slow", clock, latency=3.0)
+        fast = FakeProvider("fast", clock, latency=0.5)
+        router = Router([slow, fast], clock=clock)
+        router.complete(MESSAGES)
+        router.complete(MESSAGES)
+        assert (slow.calls, fast.calls) == (1, 1)
+        for _ in range(3):
+            assert router.complete(MESSAGES) == "Hallo von fast"
+        assert slow.calls == 1
+
+    def test_rate_limited_provider_is_skipped_until_hint_expires(self):
+        clock = FakeClock()
+        fast = FakeProvider("fast", clock, latency=0.5, outcomes=[RateLimited("429", retry_after=30)])
+        slow = FakeProvider("slow", clock, latency=2.0)
+        router = Router([fast, slow], clock=clock)
+        assert router.complete(MESSAGES) == "Hallo von slow"
+        assert router.complete(MESSAGES) == "Hallo von slow"
+        assert fast.calls == 1
+        clock.now += 30
+        assert router.complete(MESSAGES) == "Hallo von fast"
+        stats = {row["name"]: row for row in router.health()}
+        assert stats["fast"]["rate_limited"] == 1
+        assert stats["slow"]["successes"] == 2
+
+    def test_token_quota_from_headers(self):
+        clock = FakeClock()
+        quota = {"x-ratelimit-remaining-tokens": "100", "x-ratelimit-reset-tokens": "10s"}
+        fast = FakeProvider("fast", clock, latency=0.1, headers=quota)
+        slow = FakeProvider("slow", clock, latency=2.0)
+        router = Router([fast, slow], clock=clock)
+        router.complete(MESSAGES, tokens_needed=50)
+        router.complete(MESSAGES, tokens_needed=50)  # explores slow
+        assert router.complete(MESSAGES, tokens_needed=500) == "Hallo von slow"
+        assert router.complete(MESSAGES, tokens_needed=50) == "Hallo von fast"
+
+    def test_consecutive_failures_pause_provider(self):
+        clock = FakeClock()
+        flaky = FakeProvider("flaky", clock, latency=0.1, outcomes=[ProviderError("500"), ProviderError("500")])
+        other = FakeProvider("other", clock, latency=1.0)
+        router = Router([flaky, other], clock=clock)
+        assert router.complete(MESSAGES) == "Hallo von other"
+        assert router.complete(MESSAGES) == "Hallo von other"
+        assert flaky.calls == 2
+        assert not {row["name"]: row for row in router.health()}["flaky"]["available"]
+        router.complete(MESSAGES)
+        assert flaky.calls == 2
+
+    def test_waits_with_backoff_when_all_rate_limited(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr("llm.time.sleep", lambda s: setattr(clock, "now", clock.now + s))
+        only = FakeProvider("only", clock, outcomes=[RateLimited("429", retry_after=5)])
+        waits = []
+        router = Router([only], clock=clock)
+        result = router.complete(MESSAGES, on_retry=lambda wait, attempt: waits.append(wait))
+        assert result == "Hallo von only"
+        assert waits == [pytest.approx(5.0)]
+
+    def test_wait_past_deadline_raises(self):
+        clock = FakeClock()
+        only = FakeProvider("only", clock, outcomes=[RateLimited("429", retry_after=60)])
+        router = Router([only], clock=clock)
+        deadline = Deadline(10, clock=clock)
+        with pytest.raises(DeadlineExceeded):
+            router.complete(MESSAGES, deadline=deadline)
+
+    def test_gives_up_after_max_rounds(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr("llm.time.sleep", lambda s: setattr(clock, "now", clock.now + s))
+        only = FakeProvider("only", clock, outcomes=[RateLimited("429", retry_after=1)] * 3)
+        router = Router([only], clock=clock)
+        with pytest.raises(RateLimited):
+            router.complete(MESSAGES, max_rounds=3)
+        assert only.calls == 3
+
+    def test_no_providers(self):
+        with pytest.raises(RuntimeError):
+            Router([]).complete(MESSAGES)
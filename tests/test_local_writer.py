@@ -0,0 +1,48 @@
+"""Tests for the local template Anschreiben generator."""
+
+from local_writer import generate_local, greeting, icebreaker
+from models import ListingData, Persona, UserProfile
+
+
+def _data(**kwargs) -> ListingData:
+    values = {"title": "Helles Zimmer in 3er WG", "address": "Maxvorstadt", "full_description": "", "ad_type": "wg"}
+    values.update(kwargs)
+    return ListingData(**values)
+
+
+def _profile(**persona) -> UserProfile:
+    values = {"first_name": "Lukas", "age": "26", "job": "Software Engineer", "from_city": "Berlin",
+              "hobbies": "Klettern, Kochen", "move_in": "ab 1. Mai"}
+    values.update(persona)
+    return UserProfile(persona_block="", persona=Persona(**values), persona_name="Lukas")
+
+
+def test_greeting_rules():
+    assert greeting(_data(publisher_name="Marco Rossi")) == "Hallo Marco,"
+    assert greeting(_data(publisher_name="Frau Müller", ad_type="wohnung")) == "Sehr geehrte Frau Müller,"
+    assert greeting(_data(publisher_name="Huber Immobilien GmbH", ad_type="wohnung")) == "Hallo,"
+    assert greeting(_data(full_description="Wir sind Jonas und Lisa, beide 25.")) == "Hallo Jonas,"
+    assert greeting(_data(full_description="Wir sind Studenten und suchen Verstärkung.")) == "Hallo liebe WG,"
+
+
+def test_icebreaker_prefers_shared_hobby_then_ad_details():
+    persona = _profile().persona
+    assert "Klettern" in icebreaker(_data(full_description="Wir gehen oft zusammen klettern."), persona)
+    assert "Balkon" in icebreaker(_data(full_description="Großer Balkon nach Süden."), persona)
+    assert "Zimmer in 3er WG" in icebreaker(_data(title="Zimmer in 3er WG", full_description="Ab sofort frei."), persona)
+    assert "Helle" in icebreaker(_data(full_description="Ab sofort frei."), persona)  # from the title
+    # WG-only sentences are not used for Wohnungen
+    wohnung = icebreaker(_data(ad_type="wohnung", full_description="Gemeinsam kochen, ruhig gelegen."), persona)
+    assert "WG" not in wohnung and "ruhig" in wohnung
+
+
+def test_generate_local_message():
+    wg = generate_local(_data(full_description="Wir sind Jonas und Lisa.", google_drive="https://drive.example/x"), _profile())
+    assert wg.startswith("Hallo Jonas,")
+    assert "Ich bin Lukas, 26, Software Engineer aus Berlin." in wg
+    assert "findet ihr hier: https://drive.example/x" in wg
+    assert len(wg.split()) < 150
+
+    wohnung = generate_local(_data(ad_type="wohnung", google_drive="https://drive.example/x"), _profile())
+    assert "finden Sie hier" in wohnung and "ihr" not in wohnung.split()
+    assert generate_local(_data(), _profile()) == generate_local(_data(), _profile())
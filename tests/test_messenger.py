@@ -0,0 +1,77 @@
+"""Tests for WG-Gesucht message sending helpers."""
+
+from platforms.base import SEND_UNCONFIRMED
+from platforms.wggesucht.messenger import (
+    _CONTACTED_JS,
+    _DIRECT_SEND_JS,
+    _SUCCESS_RE,
+    _message_url_from_listing_url,
+    _send_direct,
+    send_anschreiben,
+)
+
+LISTING = "https://www.wg-gesucht.de/wg-zimmer-in-Muenchen.1234567.html"
+
+
+class FakePage:
+    def __init__(self, url: str, direct_result, contacted: bool = False):
+        self.url = url
+        self.direct_result = direct_result
+        self.contacted = contacted
+        self.scripts: list[str] = []
+
+    def evaluate(self, script, arg=None):
+        self.scripts.append(script)
+        if script == _DIRECT_SEND_JS:
+            if isinstance(self.direct_result, Exception):
+                raise self.direct_result
+            return self.direct_result
+        if script == _CONTACTED_JS:
+            return self.contacted
+        raise AssertionError("unexpected script")
+
+
+def test_message_url_from_listing_url():
+    url = "https://www.wg-gesucht.de/wg-zimmer-in-Muenchen-Maxvorstadt.1234567.html"
+    assert _message_url_from_listing_url(url) == (
+        "https://www.wg-gesucht.de/nachricht-senden/wg-zimmer-in-Muenchen-Maxvorstadt.1234567.html"
+    )
+
+
+def test_success_marker_in_form_response():
+    assert _SUCCESS_RE.search("<p class='alert-success'>Nachricht erfolgreich gesendet.</p>")
+    assert not _SUCCESS_RE.search('{"conversation_id": "987", "messages": []}')
+    assert not _SUCCESS_RE.search("<form><textarea name='message'></textarea></form>")
+
+
+def test_send_direct_success():
+    page = FakePage("https://www.wg-gesucht.de/", {"posted": True, "status": 200, "body": "Nachricht erfolgreich gesendet"})
+    assert _send_direct(page, LISTING, "Hallo") is True
+
+
+def test_send_direct_unconfirmed_but_already_contacted():
+    page = FakePage("https://www.wg-gesucht.de/", {"posted": True, "status": 200, "body": "<form></form>"}, contacted=True)
+    assert _send_direct(page, LISTING, "Hallo") is True
+    assert page.scripts == [_DIRECT_SEND_JS, _CONTACTED_JS]
+
+
+def test_send_direct_rejected_post_is_not_sent():
+    page = FakePage("https://www.wg-gesucht.de/", {"posted": True, "status": 403, "body": "Forbidden"})
+    assert _send_direct(page, LISTING, "Hallo") is False
+
+
+def test_unconfirmed_post_is_not_retried_via_form():
+    page = FakePage("https://www.wg-gesucht.de/", {"posted": True, "status": 0, "body": ""})
+    assert send_anschreiben(page, LISTING, "Hallo") == SEND_UNCONFIRMED
+    assert page.scripts == [_DIRECT_SEND_JS, _CONTACTED_JS]
+
+
+def test_script_error_counts_as_unconfirmed():
+    page = FakePage("https://www.wg-gesucht.de/", RuntimeError("Execution context was destroyed"))
+    assert _send_direct(page, LISTING, "Hallo") == SEND_UNCONFIRMED
+
+
+def test_send_direct_needs_site_origin():
+    page = FakePage("about:blank", None)
+    assert _send_direct(page, LISTING, "Hallo") is None
+    assert page.scripts == []
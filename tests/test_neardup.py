@@ -0,0 +1,46 @@
+"""Tests for MinHash near-duplicate detection."""
+
+from models import ListingDetails
+from neardup import minhash, shingles, similarity
+from store import SimilarityIndex
+
+_TEXT = (
+    "Helles 18 qm Zimmer in einer ruhigen 3er WG in Schwabing. Wir sind zwei Studentinnen, "
+    "kochen gerne zusammen und suchen ab Mai eine entspannte Mitbewohnerin. Die Küche ist "
+    "voll ausgestattet, es gibt einen Balkon und eine Waschmaschine im Keller."
+)
+
+
+def _details(ad_id: str, description: str = _TEXT, address: str = "Musterstr. 1, 80799 München") -> ListingDetails:
+    return ListingDetails(
+        title="Zimmer", address=address, full_description=description, ad_id=ad_id,
+        rent="650 €", size="18 m²", available_from="01.05.2026", publisher_name="Lisa",
+    )
+
+
+def test_similar_texts_have_similar_signatures():
+    base = minhash(shingles(_details("1")))
+    edited = minhash(shingles(_details("2", _TEXT.replace("ab Mai", "ab Juni"))))
+    other = minhash(shingles(_details("3", "Große 2-Zimmer-Wohnung mit Garten in Pasing, ruhige Lage.",
+                                      address="Bahnhofstr. 5, 81241 München")))
+    assert similarity(base, edited) > 0.7
+    assert similarity(base, other) < 0.3
+
+
+def test_index_finds_repost_but_not_unrelated_ad(tmp_path):
+    index = SimilarityIndex(tmp_path / "state.db")
+    assert index.add(_details("1")) == []
+    assert index.add(_details("2", "Große 2-Zimmer-Wohnung mit Garten in Pasing.", address="Bahnhofstr. 5")) == []
+    matches = index.add(_details("3", _TEXT + " Bitte mit kurzer Vorstellung melden."))
+    assert [m[0] for m in matches] == ["1"] and matches[0][1] >= index.threshold
+    # Re-indexing an ad never matches itself
+    assert index.find(_details("2", "Große 2-Zimmer-Wohnung mit Garten in Pasing.", address="Bahnhofstr. 5")) == []
+
+
+def test_index_returns_every_match_most_similar_first(tmp_path):
+    index = SimilarityIndex(tmp_path / "state.db")
+    index.add(_details("1"))
+    index.add(_details("2", _TEXT + " Bitte mit kurzer Vorstellung melden."))
+    matches = index.find(_details("3", _TEXT + " Bitte melden."))
+    assert {m[0] for m in matches} == {"1", "2"}
+    assert matches[0][1] >= matches[1][1] >= index.threshold
@@ -0,0 +1,57 @@
+"""Tests for free-form listing value normalization."""
+
+from datetime import date
+
+from normalize import ad_type_from_url, parse_area, parse_date, parse_euro, price_per_m2
+
+
+class TestParseEuro:
+    def test_simple(self):
+        assert parse_euro("650 €") == 650.0
+
+    def test_thousands_separator(self):
+        assert parse_euro("1.200 €") == 1200.0
+
+    def test_decimal_comma(self):
+        assert parse_euro("650,50 €") == 650.5
+
+    def test_prefers_euro_amount(self):
+        assert parse_euro("2 Zimmer, 890 €") == 890.0
+
+    def test_empty(self):
+        assert parse_euro("") is None
+        assert parse_euro("k.A.") is None
+
+
+class TestParseArea:
+    def test_simple(self):
+        assert parse_area("18 m²") == 18.0
+
+    def test_decimal(self):
+        assert parse_area("18,5 m²") == 18.5
+
+    def test_none(self):
+        assert parse_area("groß") is None
+
+
+class TestParseDate:
+    def test_german_date(self):
+        assert parse_date("01.05.2026") == date(2026, 5, 1)
+
+    def test_embedded(self):
+        assert parse_date("frei ab: 1.5.2026") == date(2026, 5, 1)
+
+    def test_invalid(self):
+        assert parse_date("sofort") is None
+        assert parse_date("31.02.2026") is None
+
+
+def test_price_per_m2():
+    assert price_per_m2(650, 20) == 32.5
+    assert price_per_m2(650, None) is None
+    assert price_per_m2(None, 20) is None
+
+
+def test_ad_type_from_url():
+    assert ad_type_from_url("https://www.wg-gesucht.de/wg-zimmer-in-Muenchen-Maxvorstadt.123.html") == "wg"
+    assert ad_type_from_url("https://www.wg-gesucht.de/wohnungen-in-Muenchen.123.html") == "wohnung"
@@ -0,0 +1,82 @@
+"""Tests for delivering outbox entries."""
+
+from contextlib import contextmanager
+
+from outbox import deliver, drain
+from platforms.base import SEND_UNCONFIRMED
+from store import StateStore
+from timing import Deadline
+
+
+class FakePages:
+    @contextmanager
+    def lease(self, role: str):
+        yield object()
+
+
+class FakeSession:
+    name = "anna"
+    pages = FakePages()
+
+
+class FakePlatform:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def send_message(self, page, url: str, message: str):
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def _deliver(tmp_path, result) -> tuple[str, StateStore]:
+    state = StateStore(tmp_path / "state.db")
+    state.outbox.enqueue("anna", "1234567", "https://www.wg-gesucht.de/x.1234567.html", "Hallo")
+    status = deliver(FakePlatform(result), FakeSession(), state, state.outbox.get("anna", "1234567"))
+    return status, state
+
+
+def test_confirmed_send_is_recorded(tmp_path):
+    status, state = _deliver(tmp_path, True)
+    assert status == "sent"
+    assert state.outbox.get("anna", "1234567").status == "sent"
+    state.close()
+
+
+def test_failure_before_posting_is_retried(tmp_path):
+    status, state = _deliver(tmp_path, False)
+    assert status == "failed"
+    assert state.outbox.get("anna", "1234567").status == "failed"
+    state.close()
+
+
+def test_exception_mid_send_is_parked_as_unknown(tmp_path):
+    status, state = _deliver(tmp_path, TimeoutError("Timeout 30000ms exceeded"))
+    assert status == "unknown"
+    entry = state.outbox.get("anna", "1234567")
+    assert entry.status == "unknown"
+    assert "Timeout" in entry.last_error
+    assert not state.outbox.due()
+    state.close()
+
+
+def test_unconfirmed_post_is_parked_as_unknown(tmp_path):
+    status, state = _deliver(tmp_path, SEND_UNCONFIRMED)
+    assert status == "unknown"
+    assert not state.outbox.due()
+    state.close()
+
+
+def test_drain_stops_at_the_deadline(tmp_path):
+    state = StateStore(tmp_path / "state.db")
+    state.outbox.enqueue("anna", "1234567", "https://www.wg-gesucht.de/x.1234567.html", "Hallo")
+    state.outbox.enqueue("anna", "7654321", "https://www.wg-gesucht.de/x.7654321.html", "Hallo")
+    clock = iter([0.0, 5.0, 15.0]).__next__
+    platform = FakePlatform(True)
+    counts = drain(platform, [FakeSession()], state, deadline=Deadline(10, clock=clock))
+    assert counts == {"sent": 1}
+    assert platform.calls == 1
+    assert len(state.outbox.due("anna")) == 1
+    state.close()
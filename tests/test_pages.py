@@ -0,0 +1,76 @@
+"""Tests for the role page pool (recycling and health checks, without a browser)."""
+
+import pytest
+
+from pages import PagePool
+
+
+class _Page:
+    def __init__(self):
+        self.url = "about:blank"
+        self.closed = False
+        self.heap = 0
+        self.visits: list[str] = []
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def evaluate(self, script):
+        return self.heap
+
+    def goto(self, url, **kwargs):
+        self.url = url
+        self.visits.append(url)
+
+    def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self):
+        self.pages: list[_Page] = []
+
+    def new_page(self) -> _Page:
+        page = _Page()
+        self.pages.append(page)
+        return page
+
+
+def test_roles_get_dedicated_tabs():
+    pool = PagePool(_Context())
+    with pool.lease("search") as search, pool.lease("detail") as detail:
+        assert search is not detail
+    with pytest.raises(KeyError):
+        with pool.lease("unknown"):
+            pass
+
+
+def test_double_lease_is_rejected():
+    pool = PagePool(_Context())
+    with pool.lease("detail"):
+        with pytest.raises(RuntimeError):
+            with pool.lease("detail"):
+                pass
+
+
+def test_recycled_after_max_uses_and_rewarmed():
+    pool = PagePool(_Context(), max_uses=2)
+    pool.warm("https://www.wg-gesucht.de/wg-zimmer-in-Muenchen.90.0.1.0.html")
+    with pool.lease("detail") as first:
+        assert first.url == "https://www.wg-gesucht.de/"
+    with pool.lease("detail") as again:
+        assert again is first
+    assert first.closed
+    with pool.lease("detail") as fresh:
+        assert fresh is not first
+        assert fresh.url == "https://www.wg-gesucht.de/"
+    assert pool.recycled["detail"] == 1
+
+
+def test_unhealthy_page_is_replaced_before_lease():
+    pool = PagePool(_Context(), max_heap_mb=1)
+    with pool.lease("search") as page:
+        page.heap = 2 * 1024 * 1024
+    with pool.lease("search") as replacement:
+        assert replacement is not page
+    assert pool.recycled["search"] == 1
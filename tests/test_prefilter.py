@@ -0,0 +1,59 @@
+"""Tests for the card-level pre-filter rules engine."""
+
+from models import FilterRules, Listing
+from prefilter import compile_rules
+
+
+def _card(title="Helles WG-Zimmer", price="650 €", size="20 m²", card_text=""):
+    return Listing(
+        ad_id="1", title=title, url="https://wg-gesucht.de/1.html", price=price, size=size,
+        age_minutes=5, raw_age_text="Online: 5 Minuten", card_text=card_text,
+    )
+
+
+def test_no_rules_compiles_to_none():
+    assert compile_rules(None) is None
+    assert compile_rules(FilterRules()) is None
+
+
+def test_exclude_keyword_case_insensitive():
+    rules = compile_rules(FilterRules(exclude_keywords=["Zwischenmiete"]))
+    assert rules.check(_card(title="ZWISCHENMIETE bis Juni")) == "Ausschlusswort 'Zwischenmiete'"
+    assert rules.check(_card()) is None
+
+
+def test_include_keywords_required():
+    rules = compile_rules(FilterRules(include_keywords=["balkon", "altbau"]))
+    assert rules.check(_card(card_text="Schöner Altbau")) is None
+    assert rules.check(_card()) == "kein Suchbegriff enthalten"
+
+
+def test_exclude_wins_over_include():
+    rules = compile_rules(FilterRules(include_keywords=["balkon"], exclude_keywords=["befristet"]))
+    assert rules.check(_card(title="Balkon, befristet")) == "Ausschlusswort 'befristet'"
+
+
+def test_numeric_predicates():
+    rules = compile_rules(FilterRules(max_price=700, min_size=15, max_price_per_m2=35))
+    assert rules.check(_card()) is None
+    assert rules.check(_card(price="800 €")) == "Preis 800 > 700"
+    assert rules.check(_card(size="12 m²", price="400 €")) == "Größe 12 < 15"
+    assert rules.check(_card(size="16 m²")) == "€/m² 40.62 > 35"
+
+
+def test_unknown_values_are_not_dropped():
+    rules = compile_rules(FilterRules(max_price=700))
+    assert rules.check(_card(price="")) is None
+
+
+def test_provider_regex():
+    rules = compile_rules(FilterRules(exclude_providers=[r"wunderflats?", r"Housing\s*Anywhere"]))
+    assert rules.check(_card(card_text="Anbieter: Housing Anywhere")).startswith("Anbieter ausgeschlossen")
+    assert rules.check(_card(card_text="Lisa")) is None
+
+
+def test_drops_are_recorded():
+    rules = compile_rules(FilterRules(max_price=500))
+    rules.check(_card())
+    rules.check(_card(price="450 €"))
+    assert [(lst.price, reason) for lst, reason in rules.dropped] == [("650 €", "Preis 650 > 500")]
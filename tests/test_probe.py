@@ -0,0 +1,17 @@
+"""Tests for the cheap search-page change probe."""
+
+from platforms.wggesucht.probe import _top_ad_ids
+
+
+def test_top_ad_ids_skip_partner_section_and_duplicates():
+    html = (
+        '<a href="/wg-zimmer-in-Muenchen-Schwabing.1234567.html">A</a>'
+        '<a href="/wg-zimmer-in-Muenchen-Schwabing.1234567.html">A again</a>'
+        '<a href="/wohnungen-in-Muenchen.7654321.html">B</a>'
+        '<a href="/angebot.html?asset_id=5555555">C</a>'
+        "<h2>Weitere Angebote von verifizierten Anbietern</h2>"
+        '<a href="/wg-zimmer-in-Muenchen.9999999.html">Partner</a>'
+    )
+    assert _top_ad_ids(html) == ["1234567", "7654321", "5555555"]
+    assert _top_ad_ids(html, top=2) == ["1234567", "7654321"]
+    assert _top_ad_ids("<p>keine Treffer</p>") == []
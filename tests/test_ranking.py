@@ -0,0 +1,42 @@
+"""Tests for relevance ranking."""
+
+from models import Listing, Persona, UserProfile
+from ranking import RankWeights, rank, score_listings
+
+
+def _listing(ad_id: str, age: int | None = 10, price: str = "600 €", size: str = "20 m²", text: str = "") -> Listing:
+    return Listing(
+        ad_id=ad_id, title=f"Zimmer {ad_id}", url=f"https://x/{ad_id}.html", price=price, size=size,
+        age_minutes=age, raw_age_text="", card_text=text,
+    )
+
+
+def _profile(looking_for: str = "", hobbies: str = "") -> UserProfile:
+    return UserProfile(persona_block="", persona=Persona(looking_for=looking_for, hobbies=hobbies))
+
+
+def test_fresher_and_cheaper_ranks_first():
+    listings = [_listing("old", age=50), _listing("new", age=2), _listing("cheap", age=50, price="400 €")]
+    order = [lst.ad_id for lst, _ in rank(listings, None)]
+    assert order[0] == "new"
+    assert order.index("cheap") < order.index("old")
+
+
+def test_persona_keywords_and_similarity():
+    profile = _profile(looking_for="ruhige WG mit Balkon", hobbies="Klettern, Kochen")
+    listings = [
+        _listing("a", text="Party-WG im Zentrum, laut und lebendig"),
+        _listing("b", text="Ruhige WG mit Balkon, wir kochen gern und gehen klettern"),
+    ]
+    weights = RankWeights(freshness=0, price=0, keywords=1, similarity=1)
+    scores = score_listings(listings, profile, weights=weights)
+    assert scores[1] > scores[0]
+    assert [lst.ad_id for lst, _ in rank(listings, profile, weights=weights)] == ["b", "a"]
+
+
+def test_cutoff_and_unknown_values():
+    listings = [_listing("x", age=None, price="", size=""), _listing("y", age=0)]
+    scores = score_listings(listings, None)
+    assert ((scores >= 0) & (scores <= 1)).all()
+    assert [lst.ad_id for lst, _ in rank(listings, None, min_score=float(scores.max()))] == ["y"]
+    assert rank([], None) == []
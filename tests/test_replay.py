@@ -0,0 +1,33 @@
+"""Tests for the record/replay harness helpers and stage timing."""
+
+from pathlib import Path
+
+from replay import MessageArchive, har_path_for
+from timing import StageTimer
+
+
+def test_har_path_per_profile():
+    assert har_path_for("runs/cycle.har", "anna", multi=False) == Path("runs/cycle.har")
+    assert har_path_for("runs/cycle.har", "anna", multi=True) == Path("runs/cycle.anna.har")
+
+
+def test_message_archive_roundtrip(tmp_path):
+    har = tmp_path / "cycle.har"
+    archive = MessageArchive(har)
+    assert archive.get("123") is None
+    archive.put("123", "Hallo Lisa,")
+    assert MessageArchive(har).get("123") == "Hallo Lisa,"
+    assert (tmp_path / "cycle.messages.json").exists()
+
+
+def test_stage_timer_summary():
+    timer = StageTimer()
+    with timer.stage("extract"):
+        pass
+    with timer.stage("extract"):
+        pass
+    with timer.stage("send"):
+        pass
+    rows = {name: count for name, count, *_ in timer.summary()}
+    assert rows == {"extract": 2, "send": 1}
+    assert timer.elapsed >= 0
@@ -0,0 +1,44 @@
+"""Tests for multi-profile session scheduling."""
+
+from sessions import round_robin
+
+
+def test_round_robin_interleaves_fairly():
+    queues = [("a", [1, 2, 3]), ("b", [10]), ("c", [20, 21])]
+    result = list(round_robin(queues))
+    assert result == [("a", 1), ("b", 10), ("c", 20), ("a", 2), ("c", 21), ("a", 3)]
+
+
+def test_round_robin_empty():
+    assert list(round_robin([])) == []
+
+
+def test_search_urls_fall_back_to_the_profiles_own_user_profile():
+    from models import Persona, ScraperProfile, UserProfile
+    from sessions import ProfileSession
+
+    persona = UserProfile(persona_block="", persona=Persona(), search_urls=["own"])
+    session = ProfileSession(profile=ScraperProfile(name="anna"), persona=persona, context=None, pages=None)
+    assert session.search_urls == ["own"]
+    session.profile = ScraperProfile(name="anna", search_urls=["explicit"])
+    assert session.search_urls == ["explicit"]
+    session.persona = None
+    session.profile = ScraperProfile(name="anna")
+    assert session.search_urls is None
+
+
+def test_shard_profiles_keeps_each_profile_in_one_shard():
+    from models import ScraperProfile
+    from workers import shard_profiles
+
+    profiles = [
+        ScraperProfile(name="anna", search_urls=["u1", "u2", "u3"]),
+        ScraperProfile(name="ben"),
+        ScraperProfile(name="cleo", search_urls=["c1"]),
+    ]
+    shards = shard_profiles(profiles, 2)
+    assert [[(p.name, p.search_urls) for p in shard] for shard in shards] == [
+        [("anna", ["u1", "u2", "u3"])],
+        [("cleo", ["c1"]), ("ben", [])],
+    ]
+    assert len(shard_profiles(profiles[:1], 4)) == 1
@@ -0,0 +1,260 @@
+"""Tests for the shared SQLite state (dedup claims)."""
+
+from models import Conversation
+from store import DedupStore, FreshnessStore, InboxStore, Outbox, ProbeStore
+
+
+def test_claim_is_exclusive_between_owners(tmp_path):
+    store = DedupStore(tmp_path / "state.db")
+    assert store.claim("anna", "123", "w1")
+    assert not store.claim("anna", "123", "w2")
+    # Other profiles may contact the same ad
+    assert store.claim("ben", "123", "w2")
+
+
+def test_release_allows_retry(tmp_path):
+    store = DedupStore(tmp_path / "state.db")
+    assert store.claim("anna", "123", "w1")
+    store.release("anna", "123")
+    assert store.claim("anna", "123", "w2")
+
+
+def test_sent_is_never_reclaimed(tmp_path):
+    store = DedupStore(tmp_path / "state.db")
+    store.claim("anna", "123", "w1")
+    store.mark_sent("anna", "123")
+    assert store.is_sent("anna", "123")
+    assert not store.claim("anna", "123", "w1")
+    store.release("anna", "123")
+    assert store.is_sent("anna", "123")
+
+
+def test_expired_lease_can_be_taken_over(tmp_path):
+    store = DedupStore(tmp_path / "state.db", lease_seconds=0)
+    assert store.claim("anna", "123", "w1")
+    assert store.claim("anna", "123", "w2")
+
+
+def test_stores_share_one_database(tmp_path):
+    a = DedupStore(tmp_path / "state.db")
+    b = DedupStore(tmp_path / "state.db")
+    assert a.claim("anna", "1", "w1")
+    assert not b.claim("anna", "1", "w2")
+
+
+def _listing(ad_id="123", price="650 €"):
+    from models import Listing
+
+    return Listing(
+        ad_id=ad_id, title="Schönes Zimmer", url=f"https://wg-gesucht.de/{ad_id}.html",
+        price=price, size="18 m²", age_minutes=10, raw_age_text="Online: 10 Minuten",
+    )
+
+
+def _details(ad_id="123", description="Helles Zimmer"):
+    from models import ListingDetails
+
+    return ListingDetails(
+        title="Schönes Zimmer", address="Musterstr. 1", full_description=description,
+        ad_id=ad_id, rent="650 €", size="18 m²", available_from="01.05.2026", publisher_name="Lisa",
+    )
+
+
+class TestDetailCache:
+    def test_unknown_listing_is_new(self, tmp_path):
+        from store import DetailCache
+
+        cache = DetailCache(tmp_path / "state.db")
+        assert cache.lookup(_listing()) == (None, "new")
+
+    def test_unchanged_card_returns_cached_details(self, tmp_path):
+        from store import DetailCache
+
+        cache = DetailCache(tmp_path / "state.db")
+        cache.save(_listing(), _details())
+        details, state = cache.lookup(_listing())
+        assert state == "unchanged"
+        assert details == _details()
+
+    def test_edited_card_requires_reextraction(self, tmp_path):
+        from store import DetailCache
+
+        cache = DetailCache(tmp_path / "state.db")
+        cache.save(_listing(), _details())
+        assert cache.lookup(_listing(price="600 €")) == (None, "changed")
+
+    def test_repost_detected_by_content_hash(self, tmp_path):
+        from store import DetailCache
+
+        cache = DetailCache(tmp_path / "state.db")
+        assert cache.save(_listing("123"), _details("123")) is None
+        assert cache.save(_listing("456"), _details("456")) == "123"
+        assert cache.save(_listing("789"), _details("789", "Anderes Zimmer")) is None
+
+    def test_fingerprint_ignores_whitespace_and_case(self):
+        from store import card_fingerprint
+
+        a = _listing()
+        b = a.model_copy(update={"title": "  schönes   ZIMMER "})
+        assert card_fingerprint(a) == card_fingerprint(b)
+
+
+class TestHistoryStore:
+    def test_records_typed_values(self, tmp_path):
+        from store import HistoryStore
+
+        history = HistoryStore(tmp_path / "state.db")
+        history.record_listings("anna", [_listing("1", "650 €"), _listing("2", "900 €")])
+        records = history.query(max_price=700)
+        assert [r.ad_id for r in records] == ["1"]
+        assert records[0].size_m2 == 18.0
+        assert records[0].price_per_m2 == 36.11
+        assert records[0].profile == "anna"
+
+    def test_details_enrich_row(self, tmp_path):
+        from datetime import date
+
+        from store import HistoryStore
+
+        history = HistoryStore(tmp_path / "state.db")
+        history.record_listings("anna", [_listing("123", "")])
+        history.record_details(_details("123"))
+        (record,) = history.query()
+        assert record.price_eur == 650.0
+        assert record.address == "Musterstr. 1"
+        assert record.available_from == date(2026, 5, 1)
+        assert history.query(available_before=date(2026, 4, 1)) == []
+
+    def test_detail_rent_wins_over_card_price(self, tmp_path):
+        from store import HistoryStore
+
+        history = HistoryStore(tmp_path / "state.db")
+        history.record_listings("anna", [_listing("123", "600 €")])
+        history.record_details(_details("123"))
+        history.record_listings("anna", [_listing("123", "600 €")])  # seen again in a later search
+        (record,) = history.query()
+        assert record.price_eur == 650.0
+        assert record.price_per_m2 == 36.11
+
+    def test_rejects_unknown_sort_column(self, tmp_path):
+        import pytest
+
+        from store import HistoryStore
+
+        history = HistoryStore(tmp_path / "state.db")
+        with pytest.raises(ValueError):
+            history.query(order_by="1; DROP TABLE listing_history")
+
+
+def test_export_csv(tmp_path):
+    from history import export_history
+    from store import HistoryStore
+
+    history = HistoryStore(tmp_path / "state.db")
+    history.record_listings("anna", [_listing("1"), _listing("2")])
+    out = tmp_path / "history.csv"
+    assert export_history(history, out) == 2
+    assert out.read_text(encoding="utf-8").splitlines()[0].startswith("ad_id,profile,")
+
+
+def test_outbox_enqueue_is_idempotent(tmp_path):
+    outbox = Outbox(tmp_path / "state.db")
+    assert outbox.enqueue("anna", "1", "https://x/1.html", "Hallo")
+    assert not outbox.enqueue("anna", "1", "https://x/1.html", "Anderer Text")
+    assert outbox.get("anna", "1").message == "Hallo"
+    assert [e.ad_id for e in outbox.due("anna")] == ["1"]
+    assert outbox.due("ben") == []
+
+
+def test_outbox_send_happens_once(tmp_path):
+    a = Outbox(tmp_path / "state.db")
+    b = Outbox(tmp_path / "state.db")
+    a.enqueue("anna", "1", "https://x/1.html", "Hallo")
+    assert a.begin_send("anna", "1")
+    assert not b.begin_send("anna", "1")
+    a.mark_sent("anna", "1")
+    assert not b.begin_send("anna", "1")
+    assert a.due() == []
+    assert a.get("anna", "1").status == "sent"
+
+
+def test_outbox_failure_backs_off_then_dies(tmp_path):
+    outbox = Outbox(tmp_path / "state.db")
+    outbox.enqueue("anna", "1", "https://x/1.html", "Hallo")
+    outbox.begin_send("anna", "1")
+    assert outbox.mark_failed("anna", "1", "timeout") == "failed"
+    assert outbox.due() == []  # backoff not elapsed
+    assert outbox.get("anna", "1").status == "failed"
+    outbox.BACKOFF_BASE_SECONDS = 0
+    for _ in range(Outbox.MAX_ATTEMPTS - 1):
+        assert outbox.begin_send("anna", "1")
+        status = outbox.mark_failed("anna", "1", "timeout")
+    assert status == "dead"
+    assert outbox.requeue("anna", "1")
+    assert outbox.get("anna", "1").attempts == 0
+
+
+def test_outbox_interrupted_send_is_parked(tmp_path):
+    outbox = Outbox(tmp_path / "state.db")
+    outbox.enqueue("anna", "1", "https://x/1.html", "Hallo")
+    outbox.begin_send("anna", "1")
+    assert outbox.recover_stale(lease_seconds=-1) == 1
+    entry = outbox.get("anna", "1")
+    assert entry.status == "unknown"
+    assert not outbox.begin_send("anna", "1")
+    assert outbox.due() == []
+
+
+def test_freshness_report_age_at_contact(tmp_path):
+    store = FreshnessStore(tmp_path / "state.db")
+    now = 1_700_000_000.0
+    a = _listing("1").model_copy(update={"search_url": "u1"})
+    b = _listing("2").model_copy(update={"search_url": "u1", "age_minutes": 30})
+    store.record_discovered("anna", [a, b], now=now)
+    store.record_discovered("anna", [a], now=now + 600)  # later sighting keeps the first estimate
+    store.mark("anna", "1", "generated", now=now + 60)
+    store.mark("anna", "1", "sent", now=now + 120)
+    store.mark("anna", "1", "sent", now=now + 999)  # first send time wins
+    [(key, found, sent, lag50, age50, age90)] = store.report()
+    assert (key, found, sent) == ("u1", 2, 1)
+    assert lag50 in (10, 30)
+    assert age50 == age90 == 12
+    assert len(store.report(by="hour")) >= 1
+
+
+def test_probe_detects_unknown_ad_ids(tmp_path):
+    probes = ProbeStore(tmp_path / "state.db")
+    assert probes.changed("anna", "u1", ["3", "2", "1"])  # never scanned
+    probes.remember("anna", "u1", ["3", "2", "1"])
+    assert not probes.changed("anna", "u1", ["3", "2", "1"])
+    assert not probes.changed("anna", "u1", ["2", "1"])  # ad 3 went offline
+    assert probes.changed("anna", "u1", ["4", "3", "2"])
+    assert probes.changed("anna", "u1", None)  # failed probe
+    assert probes.changed("ben", "u1", ["3", "2", "1"])
+
+
+def test_probe_forget_forces_rescan(tmp_path):
+    probes = ProbeStore(tmp_path / "state.db")
+    probes.remember("anna", "u1", ["1", "2"])
+    assert not probes.changed("anna", "u1", ["1"])
+    probes.forget("anna", "u1")
+    assert probes.changed("anna", "u1", ["1"])
+    probes.close()
+
+
+def test_inbox_contacted_ads_and_landlords(tmp_path):
+    inbox = InboxStore(tmp_path / "state.db")
+    assert inbox.last_sync("anna") is None
+    inbox.add("anna", [
+        Conversation(conversation_id="2", ad_id="1234567", landlord="Frau  Müller"),
+        Conversation(conversation_id="1", landlord="Roomwise"),
+    ])
+    inbox.mark_synced("anna", now=100.0)
+    assert inbox.last_sync("anna") == 100.0
+    assert inbox.known("anna", ["1", "2", "3"]) == {"1", "2"}
+    assert inbox.contacted_ids("anna", ["1234567", "7654321"]) == {"1234567"}
+    assert inbox.landlord_contacted("anna", "frau müller")
+    assert not inbox.landlord_contacted("anna", "Roomwise")  # no full name, too ambiguous
+    assert not inbox.landlord_contacted("anna", "")
+    assert not inbox.contacted_ids("ben", ["1234567"])
+    inbox.close()
@@ -0,0 +1,47 @@
+"""Tests for stage timing and cycle deadlines."""
+
+import pytest
+
+from timing import Deadline, DeadlineExceeded, current_deadline, deadline_scope, percentile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+
+
+def test_deadline_clamps_and_expires():
+    clock = FakeClock()
+    deadline = Deadline(30, clock=clock)
+    assert deadline.clamp(60) == 30
+    clock.now += 25
+    assert deadline.clamp(60) == pytest.approx(5)
+    deadline.check("Suche")
+    clock.now += 10
+    assert deadline.expired and deadline.remaining() == pytest.approx(-5)
+    assert deadline.clamp(60) == 0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check("Suche")
+
+
+def test_unbounded_deadline():
+    deadline = Deadline()
+    assert deadline.remaining() is None and not deadline.expired
+    assert deadline.clamp(60) == 60
+
+
+def test_deadline_scope():
+    deadline = Deadline(10)
+    assert current_deadline() is None
+    with deadline_scope(deadline):
+        assert current_deadline() is deadline
+    assert current_deadline() is None
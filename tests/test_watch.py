@@ -0,0 +1,57 @@
+"""Tests for the WG-Gesucht live watcher (new-ad detection, without a browser)."""
+
+from platforms.wggesucht.watch import _REFRESH_JS, SearchWatcher
+
+
+def _card(ad_id: str) -> dict:
+    return {
+        "ad_id": ad_id, "title": f"Zimmer {ad_id}", "url": f"https://www.wg-gesucht.de/x.{ad_id}.html",
+        "price": "600 €", "size": "15 m²", "raw_age_text": "5 Minuten", "card_text": "",
+    }
+
+
+class _Page:
+    """Serves scripted result lists per search URL; the refresh swaps in the next one."""
+
+    def __init__(self, results: dict[str, list[list[str]]]):
+        self.results = results
+        self.current = ""
+        self.refreshes = 0
+
+    def goto(self, url, **kwargs):
+        self.current = url
+
+    def wait_for_selector(self, *args, **kwargs):
+        pass
+
+    def evaluate(self, script, arg=None):
+        if script == _REFRESH_JS:
+            self.refreshes += 1
+            self.current = arg
+            return 200
+        lists = self.results[self.current]
+        ids = lists.pop(0) if len(lists) > 1 else lists[0]
+        return [_card(i) for i in ids]
+
+
+def test_poll_emits_only_new_ads():
+    page = _Page({
+        "u1": [["1", "2"], ["3", "1", "2"], ["3", "1", "2"]],
+        "u2": [["2", "4"], ["2", "4"], ["5", "2", "4"]],
+    })
+    watcher = SearchWatcher(page, search_urls=["u1", "u2"])
+    assert [lst.ad_id for lst in watcher.prime()] == ["1", "2", "4"]
+    assert [lst.ad_id for lst in watcher.poll()] == ["3"]
+    assert [lst.ad_id for lst in watcher.poll()] == ["5"]
+    assert watcher.poll() == []
+    assert page.refreshes == 1 + 3 * 2
+
+
+def test_forgotten_ads_are_emitted_again():
+    page = _Page({"u1": [["1", "2"]]})
+    watcher = SearchWatcher(page, search_urls=["u1"])
+    assert [lst.ad_id for lst in watcher.prime()] == ["1", "2"]
+    assert watcher.poll() == []
+    watcher.forget(["2"])  # e.g. generation failed
+    assert [lst.ad_id for lst in watcher.poll()] == ["2"]
+    assert watcher.poll() == []
@@ -0,0 +1,94 @@
+"""
+Wall-time measurement per pipeline stage (login, search, extract, generate, send), and the
+per-cycle deadline the stages budget against.
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class StageTimer:
+    """Collects wall-time samples per stage name for one cycle."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - t0)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> list[tuple[str, int, float, float, float]]:
+        """Rows of (stage, count, total_s, mean_s, max_s) in first-seen order."""
+        return [
+            (name, len(values), sum(values), sum(values) / len(values), max(values))
+            for name, values in self.samples.items()
+            if values
+        ]
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile (pct in 0..100), None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class DeadlineExceeded(RuntimeError):
+    """The cycle's time budget ran out before a step could start."""
+
+
+class Deadline:
+    """Point in time a cycle has to finish by; seconds=None means unbounded."""
+
+    def __init__(self, seconds: float | None = None, clock=time.monotonic):
+        self.clock = clock
+        self.budget = seconds
+        self.at = clock() + seconds if seconds is not None else None
+
+    def remaining(self) -> float | None:
+        """Seconds left (negative once missed), None if unbounded."""
+        return None if self.at is None else self.at - self.clock()
+
+    @property
+    def expired(self) -> bool:
+        return self.at is not None and self.remaining() <= 0
+
+    def clamp(self, seconds: float) -> float:
+        """seconds, shortened to what is left of the budget."""
+        remaining = self.remaining()
+        return seconds if remaining is None else max(0.0, min(seconds, remaining))
+
+    def check(self, step: str) -> None:
+        """Raise DeadlineExceeded if no time is left for step."""
+        if self.expired:
+            raise DeadlineExceeded(f"Zeitbudget aufgebraucht vor: {step}")
+
+
+_deadline: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """Make deadline the current one for code that has no ctx to receive it (e.g. page navigation)."""
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _deadline.get()
@@ -0,0 +1,165 @@
+"""
+Process-pool sharding: split profiles across worker processes, each driving its own
+Chromium. A profile stays in one process, so an account logs in once and its session file
+has a single writer. Workers coordinate through the shared DedupStore so no ad is contacted
+twice, and stream console output and per-cycle stats back to the supervisor.
+"""
+
+import queue
+import sys
+import time
+import multiprocessing as mp
+from collections import Counter
+
+from rich.console import Console
+from rich.table import Table
+from rich.text import Text
+
+from models import ScraperProfile
+
+
+def shard_profiles(profiles: list[ScraperProfile], n_workers: int) -> list[list[ScraperProfile]]:
+    """
+    Distribute whole profiles over n_workers shards, most search URLs first onto the least
+    loaded shard. Splitting one profile's URLs would log the same account in from several
+    processes racing on its storage_state file. Empty shards are dropped.
+    """
+    shards: list[list[ScraperProfile]] = [[] for _ in range(max(1, n_workers))]
+    load = [0] * len(shards)
+    for profile in sorted(profiles, key=lambda pr: len(pr.search_urls), reverse=True):
+        i = load.index(min(load))
+        shards[i].append(profile)
+        load[i] += max(1, len(profile.search_urls))
+    return [shard for shard in shards if shard]
+
+
+class _QueueWriter:
+    """File-like object that forwards complete lines to the supervisor queue."""
+
+    def __init__(self, events, index: int):
+        self._events = events
+        self._index = index
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            if line.strip():
+                self._events.put(("log", self._index, line))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _worker_main(index: int, profiles_data: list[dict], events, use_schedule: bool, probe: bool) -> None:
+    """Worker process entry point: own Playwright + browser, runs cycles for its shard."""
+    try:
+        from playwright.sync_api import sync_playwright
+
+        import run
+        from config import RUN_INTERVAL_MINUTES
+        from platforms import PLATFORMS
+        from launch import launch_browser
+        from sessions import close_session, open_session
+        from timing import Deadline
+
+        run.console = Console(file=_QueueWriter(events, index), width=110, soft_wrap=True)
+        profiles = [ScraperProfile.model_validate(d) for d in profiles_data]
+        platform = PLATFORMS["wggesucht"]
+        show_browser = "--visible" in sys.argv or "-v" in sys.argv
+
+        with sync_playwright() as p:
+            browser_profile = run.launch_profile()
+            browser = launch_browser(p, browser_profile, headless=not show_browser)
+            sessions = [
+                open_session(browser, profile, platform=platform, launch_profile=browser_profile)
+                for profile in profiles
+            ]
+            cycle = 0
+            while True:
+                cycle += 1
+                if use_schedule and cycle > 1:
+                    time.sleep(RUN_INTERVAL_MINUTES * 60)
+                stats = run.run_platform(
+                    platform, sessions, probe=probe, deadline=Deadline(run.cycle_budget(use_schedule))
+                )
+                events.put(("stats", index, dict(stats)))
+                if not use_schedule or "--quick" in sys.argv:
+                    break
+            for session in sessions:
+                close_session(session)
+            browser.close()
+    except Exception as e:
+        events.put(("error", index, str(e)))
+    finally:
+        events.put(("done", index, None))
+
+
+def run_sharded(
+    profiles: list[ScraperProfile],
+    n_workers: int,
+    use_schedule: bool,
+    console: Console,
+    probe: bool = False,
+) -> Counter:
+    """
+    Start workers for the shards, multiplex their output into console, return summed stats.
+    probe enables the change probe in every worker (scheduled runs).
+    """
+    shards = shard_profiles(profiles, n_workers)
+    if len(shards) < n_workers:
+        console.print(f"[dim]{len(shards)} Profil(e) – nur {len(shards)} Worker gestartet[/dim]")
+    ctx = mp.get_context("spawn")
+    events = ctx.Queue()
+    processes = []
+    for index, shard in enumerate(shards, 1):
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(index, [pr.model_dump() for pr in shard], events, use_schedule, probe),
+            daemon=True,
+        )
+        proc.start()
+        processes.append(proc)
+        urls = sum(len(pr.search_urls) for pr in shard) or "Standard"
+        console.print(f"[dim]Worker {index}: {', '.join(pr.name for pr in shard)} ({urls} URLs)[/dim]")
+
+    started = time.monotonic()
+    totals: Counter = Counter()
+    per_worker: dict[int, Counter] = {i: Counter() for i in range(1, len(shards) + 1)}
+    done: set[int] = set()
+    while len(done) < len(processes):
+        try:
+            kind, index, payload = events.get(timeout=1.0)
+        except queue.Empty:
+            for i, proc in enumerate(processes, 1):
+                if i not in done and not proc.is_alive():
+                    done.add(i)
+            continue
+        if kind == "log":
+            console.print(Text(f"[w{index}] ", style="dim") + Text(payload))
+        elif kind == "stats":
+            per_worker[index].update(payload)
+            totals.update(payload)
+        elif kind == "error":
+            console.print(f"[red]Worker {index} fehlgeschlagen: {payload}[/red]")
+        elif kind == "done":
+            done.add(index)
+
+    for proc in processes:
+        proc.join(timeout=5)
+
+    elapsed_min = max(time.monotonic() - started, 1e-6) / 60
+    table = Table(title="Worker-Statistik")
+    for col in ("Worker", "Gefunden", "Gesendet", "Generiert", "Übersprungen", "Fehler"):
+        table.add_column(col, justify="right")
+    for index, stats in list(per_worker.items()) + [("Σ", totals)]:
+        table.add_row(
+            str(index),
+            *(str(stats.get(k, 0)) for k in ("found", "sent", "generated", "skipped", "failed")),
+        )
+    console.print(table)
+    processed = sum(totals.get(k, 0) for k in ("sent", "generated", "skipped", "failed"))
+    console.print(f"[dim]{processed} Anzeigen in {elapsed_min:.1f} Min. ({processed / elapsed_min:.1f}/Min.)[/dim]")
+    return totals